@@ -1,32 +1,57 @@
 """
 Execution entrypoint for the project.
 
-Sets up a `Flask` server with three endpoints: "/", "/github/events" and "/slack/commands".
+Sets up a `Flask` server with four endpoints: "/", "/github/events", "/slack/commands" and "/slack/events".
 
 "/" is used for testing and status checks.
+"/status" reports the depth of the event queue and the state of the Slack outbox.
 
 "/github/events" is provided to GitHub Webhooks to POST event info at.
 Triggers `manage_github_events` which uses `GitHubApp.parse` and `SlackBot.inform`.
+If `WEBHOOK_WORKERS` is set, parsed events are queued and `SlackBot.inform` runs on a worker pool instead.
+Redeliveries of an already handled "X-GitHub-Delivery" id are dropped before parsing.
+If `PUSH_COALESCE_WINDOW` is set, pushes to the same branch within the window are merged into one event first.
 
 "/slack/commands" is provided to Slack to POST slash command info at.
 Triggers `manage_slack_commands` which uses `SlackBot.run`.
+If `COMMAND_WORKERS` is set, commands are acknowledged right away and run on a worker pool, see `SlackBot.run_deferred`.
+
+"/slack/events" is provided to Slack's Events API, subscribed to "member_joined_channel" and "member_left_channel".
+Triggers `manage_slack_events` which uses `SlackBot.handle_event` to keep the bot's channel memberships cached.
 """
 
+import atexit
+import logging
 import os
 from pathlib import Path
 from typing import Any, Optional, Union
 
 import sentry_sdk
 from dotenv import load_dotenv
-from flask import Flask, make_response, request
+from flask import Flask, Response, make_response, request
 from sentry_sdk.integrations.flask import FlaskIntegration
 
 from bot import views
 from bot.github import GitHubApp
+from bot.github.coalescer import PushCoalescer
+from bot.github.webhook import WebhookRequest
+from bot.models.github import EventType
 from bot.models.github.event import GitHubEvent
 from bot.slack import SlackBot
+from bot.slack.rate_limit import RateLimiter
+from bot.slack.renderers import load_templates
 from bot.slack.templates import error_message
+from bot.storage.deliveries import DeliveryStorage
+from bot.storage.engine import release_connections
+from bot.utils.json import select_decoder
 from bot.utils.log import Logger
+from bot.utils.structured_log import (
+    configure_logging,
+    log_event,
+    logging_stats,
+    parse_sample_rates,
+)
+from bot.utils.workers import WorkerPool
 
 load_dotenv(Path(".") / ".env")
 
@@ -38,46 +63,226 @@ if (not debug) and ("SENTRY_DSN" in os.environ):
         integrations=[FlaskIntegration()],
     )
 
+configure_logging(
+    level=os.environ.get("LOG_LEVEL", "INFO"),
+    sample_rates=parse_sample_rates(os.environ.get("LOG_SAMPLE_RATES", "")),
+    max_field_length=int(os.environ.get("LOG_MAX_FIELD_LENGTH", 200)),
+)
+
+requested_decoder = os.environ.get("JSON_DECODER", "orjson")
+json_decoder = select_decoder(requested_decoder)
+log_event(
+    logging.INFO if json_decoder == requested_decoder else logging.WARNING,
+    "json_decoder_selected",
+    requested=requested_decoder,
+    backend=json_decoder,
+)
+
+if os.environ.get("MESSAGE_TEMPLATES"):
+    # Fails startup on invalid templates, instead of failing on every event
+    load_templates(os.environ["MESSAGE_TEMPLATES"])
+
 slack_bot = SlackBot(
     token=os.environ["SLACK_OAUTH_TOKEN"],
     logger=Logger(int(os.environ.get("LOG_LAST_N_COMMANDS", 100))),
     base_url=os.environ["BASE_URL"],
     secret=os.environ["SLACK_SIGNING_SECRET"],
     bot_id=os.environ["SLACK_BOT_ID"],
+    outbox_workers=int(os.environ.get("OUTBOX_WORKERS", 0)),
+    rate_limiter=RateLimiter(
+        channel_rate=float(os.environ.get("SLACK_CHANNEL_RATE", 1)),
+        global_rate=float(os.environ.get("SLACK_GLOBAL_RATE", 10)),
+        global_burst=float(os.environ.get("SLACK_GLOBAL_BURST", 20)),
+    ),
+    fanout_workers=int(os.environ.get("FANOUT_WORKERS", 8)),
+    membership_ttl=float(os.environ.get("SLACK_MEMBERSHIP_TTL", 60 * 60)),
 )
 
+max_push_commits = int(os.environ.get("MAX_PUSH_COMMITS", 20))
+
 github_app = GitHubApp(
     base_url=os.environ["BASE_URL"],
     client_id=os.environ["GITHUB_APP_CLIENT_ID"],
     client_secret=os.environ["GITHUB_APP_CLIENT_SECRET"],
+    max_push_commits=max_push_commits,
 )
 
+webhook_workers = int(os.environ.get("WEBHOOK_WORKERS", 0))
+event_queue: Optional[WorkerPool] = None
+if webhook_workers > 0:
+    # Acknowledge-first mode: deliveries are answered as soon as the event is queued
+    event_queue = WorkerPool(
+        handler=slack_bot.inform,
+        workers=webhook_workers,
+        max_size=int(os.environ.get("WEBHOOK_QUEUE_SIZE", 1000)),
+        block_timeout=float(os.environ.get("WEBHOOK_QUEUE_TIMEOUT", 0)),
+        name="inform",
+    )
+
+
+def deliver_coalesced_push(event: GitHubEvent):
+    """
+    Passes a merged push event on to Slack, the same way `manage_github_events` would.
+    :param event: Push event, combining every push to its branch within the coalescing window.
+    """
+    if event_queue is None or not event_queue.submit(event):
+        # The push was acknowledged when it was held, so a full queue must not drop it:
+        # inform Slack inline, on the coalescer thread, instead
+        slack_bot.inform(event)
+
+
+def flush_held_pushes():
+    """
+    Informs Slack about the held pushes on shutdown, inline, as the event queue's daemon workers stop with the process.
+    """
+    push_coalescer.forward = slack_bot.inform
+    # The fan-out executor is already shut down by then
+    slack_bot.fanout_executor = None
+    push_coalescer.flush()
+
+
+delivery_storage: Optional[DeliveryStorage] = None
+if float(os.environ.get("WEBHOOK_DEDUP_TTL", 24 * 60 * 60)) > 0:
+    # Redeliveries (timeouts, or manual ones from GitHub's UI) are dropped before parsing
+    delivery_storage = DeliveryStorage(
+        ttl=float(os.environ.get("WEBHOOK_DEDUP_TTL", 24 * 60 * 60)),
+        max_cached=int(os.environ.get("WEBHOOK_DEDUP_CACHE", 10000)),
+    )
+
+push_window = float(os.environ.get("PUSH_COALESCE_WINDOW", 0))
+push_coalescer: Optional[PushCoalescer] = None
+if push_window > 0:
+    # Opt-in: pushes to the same branch within the window become one event
+    push_coalescer = PushCoalescer(
+        forward=deliver_coalesced_push,
+        window=push_window,
+        max_pending=int(os.environ.get("PUSH_COALESCE_MAX_PENDING", 1000)),
+        max_commits=max_push_commits,
+    )
+    atexit.register(flush_held_pushes)
+
+command_workers = int(os.environ.get("COMMAND_WORKERS", 4))
+command_queue: Optional[WorkerPool] = None
+if command_workers > 0:
+    command_queue = WorkerPool(
+        handler=slack_bot.run_deferred,
+        workers=command_workers,
+        max_size=int(os.environ.get("COMMAND_QUEUE_SIZE", 100)),
+        name="command",
+    )
+
 app = Flask(__name__)
 
 app.add_url_rule("/", view_func=views.test_get)
 
 
+@app.teardown_request
+def release_storage_connections(_: Optional[BaseException]):
+    """
+    Returns the database connections used by the request's thread to their pools.
+    Worker threads keep theirs, as they outlive requests.
+    """
+    release_connections()
+
+
 @app.route("/github/events", methods=['POST'])
 def manage_github_events():
     """
     Uses `GitHubApp` to verify, parse and cast the payload into a `GitHubEvent`.
     Then uses an instance of `SlackBot` to send appropriate messages to appropriate channels.
+
+    In acknowledge-first mode the event is only queued, and "202 Accepted" is returned right away.
+    If the queue stays full, the delivery is rejected with "503 Service Unavailable".
     """
 
-    is_valid_request, message = github_app.verify(request)
+    # The body is read and decoded only once, and shared by verification and parsing
+    webhook = WebhookRequest.from_flask(request)
+
+    is_valid_request, message = github_app.verify(webhook)
     if not is_valid_request:
         return make_response(message, 400)
 
+    # Only set if duplicate deliveries are being suppressed
+    delivery_id = webhook.delivery_id if delivery_storage is not None else None
+    if ((delivery_id is not None)
+            and not delivery_storage.record_delivery(delivery_id)):
+        return "Duplicate delivery ignored"
+
+    try:
+        return dispatch_github_event(webhook, delivery_id)
+    except Exception:
+        if delivery_id is not None:
+            # GitHub's redelivery is the only way to recover the event, so it must not be dropped as a duplicate
+            delivery_storage.forget_delivery(delivery_id)
+        raise
+
+
+def dispatch_github_event(webhook: WebhookRequest, delivery_id: Optional[str]):
+    """
+    Parses a verified delivery, and informs Slack about it, queues it or holds it for coalescing.
+    :param webhook: Verified webhook delivery.
+    :param delivery_id: Delivery id recorded for deduplication, if any.
+    :return: Response to GitHub.
+    """
+
     event: Optional[GitHubEvent] = github_app.parse(
-        event_type=request.headers["X-GitHub-Event"],
-        raw_json=request.json,
+        event_type=webhook.event_type,
+        raw_json=webhook.json,
     )
 
-    if event is not None:
+    if event is None:
+        return "Unrecognized Event"
+
+    if push_coalescer is not None and event.type == EventType.PUSH:
+        push_coalescer.add(event)
+        return make_response("Held for coalescing", 202)
+
+    if event_queue is None:
         slack_bot.inform(event)
         return "Informed appropriate channels"
 
-    return "Unrecognized Event"
+    if not event_queue.submit(event):
+        if delivery_id is not None:
+            # Let GitHub's redelivery of the rejected event through
+            delivery_storage.forget_delivery(delivery_id)
+        stats = event_queue.stats()
+        sentry_sdk.capture_message(
+            f"Event queue is full\n"
+            f"Depth: {stats['depth']}/{stats['capacity']}\n"
+            f"Rejected so far: {stats['rejected']}")
+        response = make_response(
+            f"Event queue is full ({stats['depth']}/{stats['capacity']})",
+            503,
+        )
+        response.headers["Retry-After"] = "10"
+        return response
+
+    return make_response("Queued for delivery", 202)
+
+
+@app.route("/status")
+def report_status() -> dict[str, Any]:
+    """
+    Reports the state of the delivery pipeline, for monitoring.
+    :return: Stats of the event queue, the outbox, the push coalescer and the command queue where enabled, command timings, the logging queue and the JSON decoder in use.
+    """
+
+    return {
+        "event_queue":
+        None if event_queue is None else event_queue.stats(),
+        "outbox":
+        None if slack_bot.outbox is None else slack_bot.outbox.stats(),
+        "push_coalescer":
+        None if push_coalescer is None else push_coalescer.stats(),
+        "command_queue":
+        None if command_queue is None else command_queue.stats(),
+        "commands":
+        slack_bot.command_stats(),
+        "logging":
+        logging_stats(),
+        "json_decoder":
+        json_decoder,
+    }
 
 
 @app.route("/slack/commands", methods=['POST'])
@@ -97,8 +302,41 @@ def manage_slack_commands() -> Union[dict, str, None]:
 
     # Unlike GitHub webhooks, Slack does not send the data in `requests.json`.
     # Instead, the data is passed in `request.form`.
-    response: dict[str, Any] | None = slack_bot.run(raw_json=request.form)
-    return response
+    if command_queue is None or request.form.get("command") == "/sel-help":
+        response: dict[str, Any] | None = slack_bot.run(raw_json=request.form)
+        return response
+
+    # Slack expects a reply within 3 seconds, so slow commands are answered later, through their `response_url`
+    if not command_queue.submit(request.form):
+        return error_message("⚠️ Too many commands are being run right now. "
+                             "Please try again in a moment.")
+    return {
+        "response_type": "ephemeral",
+        "text": "Working on it…",
+    }
+
+
+@app.route("/slack/events", methods=['POST'])
+def manage_slack_events() -> Union[dict, Response, str]:
+    """
+    Uses a `SlackBot` instance to handle events sent by Slack's Events API.
+    :return: The challenge, for URL verification requests. An empty response otherwise.
+    """
+
+    is_valid_request, message = slack_bot.verify(
+        body=request.get_data(),
+        headers=request.headers,
+    )
+    if not is_valid_request:
+        return make_response(message, 400)
+
+    payload: dict[str, Any] = request.get_json(silent=True) or {}
+    if payload.get("type") == "url_verification":
+        return {"challenge": payload.get("challenge")}
+
+    if payload.get("type") == "event_callback":
+        slack_bot.handle_event(payload)
+    return ""
 
 
 @app.route("/github/auth")
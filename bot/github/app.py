@@ -9,7 +9,7 @@ Important methods—
 """
 
 from .authenticator import Authenticator
-from .parser import Parser
+from .parser import MAX_PUSH_COMMITS, Parser
 
 
 class GitHubApp(Authenticator, Parser):
@@ -25,6 +25,7 @@ class GitHubApp(Authenticator, Parser):
         base_url: str,
         client_id: str,
         client_secret: str,
+        max_push_commits: int = MAX_PUSH_COMMITS,
     ):
         Authenticator.__init__(self, base_url, client_id, client_secret)
-        Parser.__init__(self)
+        Parser.__init__(self, max_push_commits)
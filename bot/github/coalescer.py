@@ -0,0 +1,137 @@
+"""
+Contains the `PushCoalescer` class, which merges bursts of pushes to the same branch into one event.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import replace
+from typing import Any, Callable
+
+import sentry_sdk
+
+from ..models.github.event import GitHubEvent, count_commits
+
+
+class PushCoalescer:
+    """
+    Holds push events for a short window, merging later pushes to the same repo and branch into them.
+    Force-push storms and rebase loops then result in one set of Slack posts instead of one per push.
+
+    A background thread forwards each merged event once its window has passed.
+    When `max_pending` branches are already waiting, the oldest one is forwarded early to make room.
+
+    :param forward: Function called with every merged event, e.g. `Messenger.inform`.
+    :param window: Number of seconds a push waits for more pushes to the same branch.
+    :param max_pending: Maximum number of branches with pushes waiting at once.
+    :param max_commits: Maximum number of commits kept in a merged event. The total count is always kept.
+    """
+
+    def __init__(
+        self,
+        forward: Callable[[GitHubEvent], Any],
+        window: float,
+        max_pending: int = 1000,
+        max_commits: int = 20,
+    ):
+        self.forward = forward
+        self.window = window
+        self.max_pending = max_pending
+        self.max_commits = max_commits
+
+        self.pending: OrderedDict[tuple[str, str],
+                                  tuple[float, GitHubEvent]] = OrderedDict()
+        # ^ Deadline and merged event per (repo, branch), in order of deadline
+        self.merged = 0
+        self.forwarded = 0
+        self.evicted = 0
+        self._condition = threading.Condition()
+
+        self.thread = threading.Thread(
+            target=self._forward_due,
+            name="push-coalescer",
+            daemon=True,
+        )
+        self.thread.start()
+
+    def add(self, event: GitHubEvent):
+        """
+        Holds a push event, or merges it into a held push to the same branch.
+        :param event: `GitHubEvent` of type `EventType.PUSH`.
+        """
+        key = (event.repo.name, event.ref.name)
+        evicted = None
+        with self._condition:
+            entry = self.pending.get(key)
+            if entry is not None:
+                deadline, held = entry
+                self.pending[key] = (deadline, self.merge(held, event))
+                self.merged += 1
+                return
+
+            if len(self.pending) >= self.max_pending:
+                _, (_, evicted) = self.pending.popitem(last=False)
+                self.evicted += 1
+            # Windows have the same length, so insertion order is also deadline order
+            self.pending[key] = (time.monotonic() + self.window, event)
+            self._condition.notify()
+
+        if evicted is not None:
+            self._forward(evicted)
+
+    def merge(self, held: GitHubEvent, later: GitHubEvent) -> GitHubEvent:
+        """
+        Combines two pushes to the same branch, keeping the pusher of the later one.
+        :param held: Push that arrived first.
+        :param later: Push that arrived afterwards.
+        :return: Push with the commits of both, in order.
+        """
+        return replace(
+            later,
+            commits=(held.commits + later.commits)[:self.max_commits],
+            commit_count=count_commits(held) + count_commits(later),
+        )
+
+    def flush(self):
+        """
+        Forwards every held event right away, e.g. before shutting down.
+        """
+        with self._condition:
+            events = [event for (_, event) in self.pending.values()]
+            self.pending.clear()
+        for event in events:
+            self._forward(event)
+
+    def stats(self) -> dict[str, int]:
+        """
+        Snapshot of the coalescer's state.
+        :return: `dict` containing the number of held branches, and counts of merged, forwarded and evicted events.
+        """
+        with self._condition:
+            return {
+                "pending": len(self.pending),
+                "merged": self.merged,
+                "forwarded": self.forwarded,
+                "evicted": self.evicted,
+            }
+
+    def _forward_due(self):
+        while True:
+            with self._condition:
+                while len(self.pending) == 0:
+                    self._condition.wait()
+                deadline, _ = next(iter(self.pending.values()))
+                delay = deadline - time.monotonic()
+                if delay > 0:
+                    self._condition.wait(delay)
+                    continue
+                _, (_, event) = self.pending.popitem(last=False)
+            self._forward(event)
+
+    def _forward(self, event: GitHubEvent):
+        try:
+            self.forward(event)
+        except Exception as e:
+            sentry_sdk.capture_exception(e)
+        with self._condition:
+            self.forwarded += 1
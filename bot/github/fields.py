@@ -0,0 +1,199 @@
+"""
+Contains helpers to declare the fields of `EventParser` subclasses as compiled extractors.
+
+An extractor is a function of `(data, extraction)`, where `data` is the (sub-)object being read
+and `extraction` holds the whole payload along with the values shared within it.
+
+Models and whole events are compiled into closures (built once, at import),
+that call their field extractors directly.
+"""
+
+from itertools import islice
+from typing import Any, Callable, Optional
+
+from ..utils.json import Path, path
+
+Extractor = Callable[[Any, "Extraction"], Any]
+EventExtractor = Callable[[dict], Any]
+
+
+class Extraction:
+    """
+    State of one payload's extraction. Values of `shared` extractors are computed once and memoized here.
+
+    :param root: The whole decoded payload.
+    """
+
+    __slots__ = ("root", "memo")
+
+    def __init__(self, root: dict):
+        self.root = root
+        self.memo: dict[int, Any] = {}
+
+
+def field(spec: str, *transforms: Callable[[Any], Any]) -> Extractor:
+    """
+    Extracts a value from the current object.
+    :param spec: Path of the value, as accepted by `bot.utils.json.path`.
+    :param transforms: Functions applied to the extracted value, in order.
+    :return: Compiled extractor.
+    """
+    accessor = path(spec)
+
+    if len(transforms) == 0:
+        extract = lambda data, _: accessor(data)
+        # Lets compiled callers skip this wrapper
+        extract.accessor = accessor
+        return extract
+
+    def extract(data: Any, _: Extraction) -> Any:
+        value = accessor(data)
+        for transform in transforms:
+            value = transform(value)
+        return value
+
+    return extract
+
+
+def const(value: Any) -> Extractor:
+    """
+    Always yields the passed value.
+    :param value: Constant value.
+    :return: Compiled extractor.
+    """
+    return lambda *_: value
+
+
+def combine(function: Callable[..., Any], *extractors: Extractor) -> Extractor:
+    """
+    Yields the result of a function of several extracted values.
+    :param function: Function to call with the extracted values.
+    :param extractors: Extractors for the arguments of `function`.
+    :return: Compiled extractor.
+    """
+
+    def extract(data: Any, extraction: Extraction) -> Any:
+        return function(*(extractor(data, extraction)
+                          for extractor in extractors))
+
+    return extract
+
+
+def model(cls: type, **fields: Extractor) -> Extractor:
+    """
+    Yields an instance of a model, with keyword arguments taken from the passed extractors.
+    :param cls: Model class.
+    :param fields: Extractors for the keyword arguments of `cls`.
+    :return: Compiled extractor.
+    """
+    return _specialize(cls, fields)
+
+
+def one(extractor: Extractor) -> Extractor:
+    """
+    Yields a single-element tuple of the extracted value.
+    :param extractor: Extractor for the only element.
+    :return: Compiled extractor.
+    """
+    return lambda data, extraction: (extractor(data, extraction), )
+
+
+def each(spec: str,
+         extractor: Extractor,
+         limit: Optional[int] = None) -> Extractor:
+    """
+    Yields a tuple built by running an extractor on every element of an array in the payload.
+    Missing or malformed arrays yield an empty tuple.
+    :param spec: Path of the array, as accepted by `bot.utils.json.path`.
+    :param extractor: Extractor run on every element of the array.
+    :param limit: Maximum number of elements to extract, from the start of the array. `None` extracts all of them.
+    :return: Compiled extractor.
+    """
+    accessor = path(spec)
+
+    def extract(data: Any, extraction: Extraction) -> tuple:
+        items = accessor(data)
+        if not isinstance(items, list):
+            return ()
+        if limit is not None:
+            items = islice(items, limit)
+        return tuple(extractor(item, extraction) for item in items)
+
+    return extract
+
+
+def count(spec: str) -> Extractor:
+    """
+    Yields the length of an array in the payload, without extracting its elements.
+    Missing or malformed arrays yield zero.
+    :param spec: Path of the array, as accepted by `bot.utils.json.path`.
+    :return: Compiled extractor.
+    """
+    accessor = path(spec)
+
+    def extract(data: Any, _: Extraction) -> int:
+        items = accessor(data)
+        return len(items) if isinstance(items, list) else 0
+
+    return extract
+
+
+def shared(extractor: Extractor) -> Extractor:
+    """
+    Evaluates an extractor against the whole payload at most once per payload, however many fields use it.
+    :param extractor: Extractor relative to the payload's root.
+    :return: Compiled extractor.
+    """
+    key = id(extractor)
+
+    def extract(_: Any, extraction: Extraction) -> Any:
+        memo = extraction.memo
+        if key not in memo:
+            memo[key] = extractor(extraction.root, extraction)
+        return memo[key]
+
+    return extract
+
+
+def compile_event(
+    cls: type,
+    fields: dict[str, Extractor],
+    **constants: Any,
+) -> EventExtractor:
+    """
+    Compiles a parser's field declarations into a single function of the payload.
+    :param cls: Class of the objects to be created, i.e. `GitHubEvent`.
+    :param fields: Mapping of keyword arguments of `cls` to extractors.
+    :param constants: Keyword arguments of `cls` that are the same for every payload.
+    :return: Function that creates a `cls` object from a payload.
+    """
+    extract = _specialize(cls, fields, constants)
+    return lambda payload: extract(payload, Extraction(payload))
+
+
+def _specialize(
+    cls: type,
+    fields: dict[str, Extractor],
+    constants: dict[str, Any] = None,
+) -> Extractor:
+    """
+    Builds an extractor that calls `cls` with every field's extracted value as a keyword argument.
+    Plain path fields are read through their accessor directly, skipping the extractor wrapper.
+    """
+    constants = dict(constants or {})
+    accessors: list[tuple[str, Path]] = []
+    extractors: list[tuple[str, Extractor]] = []
+    for name, extractor in fields.items():
+        accessor = getattr(extractor, "accessor", None)
+        if isinstance(accessor, Path):
+            accessors.append((name, accessor))
+        else:
+            extractors.append((name, extractor))
+
+    def extract(data: Any, extraction: Extraction) -> Any:
+        kwargs = {name: accessor(data) for name, accessor in accessors}
+        for name, extractor in extractors:
+            kwargs[name] = extractor(data, extraction)
+        return cls(**kwargs, **constants)
+
+    return extract
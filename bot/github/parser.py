@@ -3,65 +3,74 @@ Contains the `Parser` and `*EventParser` classes, to handle validating and parsi
 
 Exposed API is only the `Parser` class, to validate and serialize the raw event data.
 """
+import functools
 import hashlib
 import hmac
+import logging
 import re
 from abc import ABC, abstractmethod
-from typing import Type
+from typing import Optional, Type
 
 import sentry_sdk
-from flask.wrappers import Request
 
 from ..models.github import Commit, EventType, Issue, PullRequest, Ref, Repository, User
 from ..models.github.event import GitHubEvent
 from ..models.link import Link
-from ..utils.json import JSON
+from ..utils.json import path
+from ..utils.structured_log import log_event
 from .base import GitHubBase
+from .fields import (
+    EventExtractor,
+    Extractor,
+    combine,
+    compile_event,
+    const,
+    count,
+    each,
+    field,
+    model,
+    one,
+    shared,
+)
+from .webhook import WebhookRequest
+
+MAX_PUSH_COMMITS = 20
+# ^ Default number of commits extracted from each push
 
 
 class Parser(GitHubBase):
     """
     Contains methods dealing with validating and parsing incoming GitHub events.
+
+    :param max_push_commits: Maximum number of commits extracted from each push event.
     """
 
-    def __init__(self):
+    def __init__(self, max_push_commits: int = MAX_PUSH_COMMITS):
         GitHubBase.__init__(self)
+        self.max_push_commits = max_push_commits
 
-    def parse(self, event_type, raw_json) -> GitHubEvent | None:
+    def parse(self, event_type: str, raw_json: dict) -> GitHubEvent | None:
         """
-        Checks the data against all parsers, then returns a `GitHubEvent` using the matching parser.
+        Checks the data against the parsers registered for its event type and action,
+        then returns a `GitHubEvent` using the matching parser.
         :param event_type: Event type header received from GitHub.
         :param raw_json: Event data body received from GitHub.
         :return: `GitHubEvent` object containing all the relevant data about the event.
         """
-        json: JSON = JSON(raw_json)
-        event_parsers: list[Type[EventParser]] = [
-            BranchCreateEventParser,
-            BranchDeleteEventParser,
-            CommitCommentEventParser,
-            ForkEventParser,
-            IssueOpenEventParser,
-            IssueCloseEventParser,
-            IssueCommentEventParser,
-            PullCloseEventParser,
-            PullMergeEventParser,
-            PullOpenEventParser,
-            PullReadyEventParser,
-            PushEventParser,
-            ReleaseEventParser,
-            ReviewEventParser,
-            ReviewCommentEventParser,
-            StarAddEventParser,
-            StarRemoveEventParser,
-            TagCreateEventParser,
-            TagDeleteEventParser,
-        ]
-        for event_parser in event_parsers:
-            if event_parser.verify_payload(event_type=event_type, json=json):
-                return event_parser.cast_payload_to_event(
-                    event_type=event_type,
-                    json=json,
-                )
+        parsers_by_action = EVENT_PARSERS.get(event_type, {})
+        action = raw_json.get("action")
+        for candidates in (
+                parsers_by_action.get(action, ()),
+                parsers_by_action.get(None, ()),
+        ):
+            for event_parser in candidates:
+                if event_parser.verify_payload(event_type=event_type,
+                                               json=raw_json):
+                    return event_parser.cast_payload_to_event(
+                        event_type=event_type,
+                        json=raw_json,
+                        max_commits=self.max_push_commits,
+                    )
 
         sentry_sdk.capture_message(f"Undefined event received\n"
                                    f"Type: {event_type}\n"
@@ -69,32 +78,38 @@ class Parser(GitHubBase):
 
         return None
 
-    def verify(self, request: Request) -> tuple[bool, str]:
+    def verify(self, webhook: WebhookRequest) -> tuple[bool, str]:
         """
-        Verifies incoming GitHub event.
+        Verifies incoming GitHub event. The raw body of the delivery is released once it has been checked.
 
-        :param request: The entire HTTP request
+        :param webhook: The delivery, as extracted from the HTTP request
 
         :return: A tuple of the form (V, E) — where V indicates the validity, and E is the reason for the verdict.
         """
 
-        headers = request.headers
-        if "X-Hub-Signature-256" not in headers:
+        if webhook.signature is None:
             return False, "Request headers are imperfect"
 
-        repository = request.json["repository"]["full_name"]
-        secret = self.storage.get_secret(repository)
+        try:
+            repository = webhook.json.get("repository", {}).get("full_name")
+        except (ValueError, AttributeError):
+            return False, "Payload is not a valid JSON object"
+
+        secret = None
+        if repository is not None:
+            secret = self.storage.get_secret(repository)
 
         if secret is None:
             return False, "Webhook hasn't been registered correctly"
 
-        expected_digest = headers["X-Hub-Signature-256"].split('=', 1)[-1]
+        expected_digest = webhook.signature.split('=', 1)[-1]
         digest = hmac.new(
             secret.encode(),
-            request.get_data(),
+            webhook.body,
             hashlib.sha256,
         ).hexdigest()
         is_valid = hmac.compare_digest(expected_digest, digest)
+        webhook.release_body()
 
         if not is_valid:
             return False, "Payload data is imperfect"
@@ -102,15 +117,161 @@ class Parser(GitHubBase):
         return True, "Request is secure and valid"
 
 
+# Helper functions:
+MAX_COMMENT_LENGTH = 2000
+# ^ Number of characters of formatted comment text shown on Slack.
+#   Leaves room for the rest of the message within Slack's limit of 3000 characters per section.
+
+MARKDOWN_PATTERN = re.compile(
+    r"""
+    (?P<ticks>`+)(?P<code>[^`]+)(?P=ticks)                  # Code span
+    | (?P<image>!?)\[(?P<text>[^\[\]\n]*)\]\((?P<url>[^()\s]+)\)  # Link or image
+    | <(?P<autolink>https?://[^\s<>]+)>                     # Autolink
+    | (?P<special>[&<>])                                    # Characters reserved by Slack
+    """,
+    re.VERBOSE,
+)
+SLACK_ESCAPES = {"&": "&amp;", "<": "&lt;", ">": "&gt;"}
+
+
+def find_ref(x: str) -> str:
+    """
+    Helper function to extract branch name
+    :param x: Full version of ref id.
+    :return: Extracted ref name.
+    """
+    return x[x.find("/", x.find("/") + 1) + 1:]
+
+
+def first_line(x: str) -> str:
+    """
+    Helper function to shorten commit messages to their summary
+    :param x: Full commit message.
+    :return: First line of the message.
+    """
+    return x.partition("\n")[0]
+
+
+def short_sha(x: str) -> str:
+    """
+    Helper function to abbreviate commit ids
+    :param x: Full commit SHA.
+    :return: First 8 characters of the SHA.
+    """
+    return x[:8]
+
+
+def convert_links(x: str) -> str:
+    """
+    Helper function to format text from GitHub markdown to Slack mrkdwn, in a single pass.
+    Converts links and images to Slack links, keeps code spans and autolinks intact,
+    and escapes the characters that Slack would otherwise treat as markup.
+    :param x: Raw GitHub text.
+    :return: Formatted text.
+    """
+    return MARKDOWN_PATTERN.sub(_convert_markdown, x)
+
+
+def preview_comment(body: Optional[str], link: str) -> str:
+    """
+    Helper function to format the beginning of a (possibly huge) comment, as Slack only shows a preview anyway
+    :param body: Raw GitHub text of the comment.
+    :param link: URL of the comment on GitHub.
+    :return: Formatted text, followed by a "read more" link if the comment was cut short.
+    """
+    if body is None:
+        return ""
+    if len(body) <= MAX_COMMENT_LENGTH:
+        text = convert_links(body)
+        if len(text) <= MAX_COMMENT_LENGTH:
+            return text
+
+    # Escapes make the formatted text longer than the raw one, so the raw text is cut until its formatted text fits
+    length = MAX_COMMENT_LENGTH
+    while True:
+        preview = body[:length]
+        # Prefer cutting between words, unless that would drop too much
+        space = preview.rfind(" ", max(length - 100, 0))
+        if space != -1:
+            preview = preview[:space]
+        text = convert_links(preview)
+        if len(text) <= MAX_COMMENT_LENGTH:
+            return f"{text}… <{link}|read more>"
+        length = length * MAX_COMMENT_LENGTH // len(text) - 1
+
+
+def _convert_markdown(match: re.Match) -> str:
+    if match["special"] is not None:
+        return SLACK_ESCAPES[match["special"]]
+    if match["autolink"] is not None:
+        return f"<{match['autolink']}>"
+    if match["code"] is not None:
+        return f"`{_escape(match['code'])}`"
+
+    url = match["url"].strip()
+    text = _escape(match["text"].strip()).replace("|", "/")
+    if text == "":
+        text = "image" if match["image"] else url
+    return f"<{url}|{text}>"
+
+
+def _escape(x: str) -> str:
+    return x.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
 # Helper classes:
+ParsersByAction = dict[Optional[str], tuple[Type["EventParser"], ...]]
+
+EVENT_PARSERS: dict[str, ParsersByAction] = {}
+# ^ Registry of parsers, keyed by "X-GitHub-Event" header and then by payload action (`None` matches any action)
+
+# Accessors used by the payload checks, compiled once at import
+ACTION = path("action")
+PULL_MERGED = path("pull_request.merged")
+PUSHER_TYPE = path("pusher_type")
+REF_TYPE = path("ref_type")
+REVIEW_STATE = path("review.state")
+
+
 class EventParser(ABC):
     """
-    Abstract base class for all parsers, to enforce them to implement check and cast methods.
+    Abstract base class for all parsers, to enforce them to implement the check method and declare their fields.
+
+    Subclasses register themselves in `EVENT_PARSERS` by declaring the event header and actions they handle.
+    Their `fields` are compiled once, into a single function that extracts all of them from a payload.
+
+    :cvar event_header: Value of the "X-GitHub-Event" header handled by the parser.
+    :cvar actions: Values of the payload's "action" field handled by the parser. Empty if the action doesn't matter.
+    :cvar event: Type of the events produced by the parser.
+    :cvar fields: Mapping of `GitHubEvent` keyword arguments to extractors from `bot.github.fields`.
     """
 
+    event_header: str
+    actions: tuple[str, ...] = ()
+    event: EventType
+    fields: dict[str, Extractor] = {}
+    extract_event: EventExtractor
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        parsers_by_action = EVENT_PARSERS.setdefault(cls.event_header, {})
+        for action in cls.actions or (None, ):
+            parsers_by_action[action] = parsers_by_action.get(action,
+                                                              ()) + (cls, )
+        if hasattr(cls, "event"):
+            cls.compile_fields()
+
+    @classmethod
+    def compile_fields(cls):
+        """
+        Compiles the parser's `fields` into `extract_event`. Needs to be called again whenever `fields` change.
+        """
+        cls.extract_event = staticmethod(
+            compile_event(GitHubEvent, cls.fields, type=cls.event))
+
     @staticmethod
     @abstractmethod
-    def verify_payload(event_type: str, json: JSON) -> bool:
+    def verify_payload(event_type: str, json: dict) -> bool:
         """
         Verifies whether the passed event data is of the parser's type.
         :param event_type: Event type header received from GitHub.
@@ -118,15 +279,73 @@ class EventParser(ABC):
         :return: Whether the event is of the parser's type.
         """
 
-    @staticmethod
-    @abstractmethod
-    def cast_payload_to_event(event_type: str, json: JSON) -> GitHubEvent:
+    @classmethod
+    def cast_payload_to_event(
+        cls,
+        event_type: str,
+        json: dict,
+        max_commits: int = MAX_PUSH_COMMITS,
+    ) -> GitHubEvent:
         """
         Extracts all the important data from the passed raw data, and returns it in a `GitHubEvent`.
         :param event_type: Event type header received from GitHub.
         :param json: Event data body received from GitHub.
+        :param max_commits: Maximum number of commits extracted, for events that carry commits.
         :return: `GitHubEvent` object containing all the relevant data about the event.
         """
+        return cls.extract_event(json)
+
+
+# Fields shared by several parsers
+REPOSITORY_LINK = shared(field("repository.html_url"))
+REPOSITORY = shared(
+    model(
+        Repository,
+        name=field("repository.full_name"),
+        link=REPOSITORY_LINK,
+    ))
+SENDER = model(User, name=field("sender.login"))
+SENDER_OR_NAME = model(User, name=field("sender.name|login"))
+BRANCH = model(Ref, name=field("ref", find_ref))
+TAG = model(Ref, name=field("ref", find_ref), type=const("tag"))
+ISSUE = model(
+    Issue,
+    number=field("issue.number"),
+    title=field("issue.title"),
+    link=field("issue.html_url"),
+)
+PULL_REQUEST = model(
+    PullRequest,
+    number=field("pull_request.number"),
+    title=field("pull_request.title"),
+    link=field("pull_request.html_url"),
+)
+PULL_REQUEST_AUTHOR = model(User, name=field("pull_request.user.login"))
+COMMENT = one(
+    combine(preview_comment, field("comment.body"), field("comment.html_url")))
+COMMENT_LINK = one(model(Link, url=field("comment.html_url")))
+
+
+def push_commits(limit: int) -> Extractor:
+    """
+    Helper function to declare the commits of a push, keeping only the first `limit` of them
+    :param limit: Maximum number of commits to extract.
+    :return: Compiled extractor.
+    """
+    return each(
+        "commits",
+        model(
+            Commit,
+            message=field("message", first_line),
+            sha=field("id", short_sha),
+            link=combine(
+                lambda base_url, sha: f"{base_url}/commit/{sha}",
+                REPOSITORY_LINK,
+                field("id"),
+            ),
+        ),
+        limit=limit,
+    )
 
 
 class BranchCreateEventParser(EventParser):
@@ -134,22 +353,14 @@ class BranchCreateEventParser(EventParser):
     Parser for branch creation events.
     """
 
-    @staticmethod
-    def verify_payload(event_type: str, json: JSON) -> bool:
-        return (event_type == "create" and json["ref_type"] == "branch"
-                and json["pusher_type"] == "user")
+    event_header = "create"
+    event = EventType.BRANCH_CREATED
+    fields = dict(repo=REPOSITORY, user=SENDER_OR_NAME, ref=BRANCH)
 
     @staticmethod
-    def cast_payload_to_event(event_type: str, json: JSON) -> GitHubEvent:
-        return GitHubEvent(
-            event_type=EventType.BRANCH_CREATED,
-            repo=Repository(
-                name=json["repository"]["full_name"],
-                link=json["repository"]["html_url"],
-            ),
-            user=User(name=json["sender"][("name", "login")]),
-            ref=Ref(name=find_ref(json["ref"])),
-        )
+    def verify_payload(event_type: str, json: dict) -> bool:
+        return (event_type == "create" and REF_TYPE(json) == "branch"
+                and PUSHER_TYPE(json) == "user")
 
 
 class BranchDeleteEventParser(EventParser):
@@ -157,22 +368,14 @@ class BranchDeleteEventParser(EventParser):
     Parser for branch deletion events.
     """
 
-    @staticmethod
-    def verify_payload(event_type: str, json: JSON) -> bool:
-        return (event_type == "delete" and json["ref_type"] == "branch"
-                and json["pusher_type"] == "user")
+    event_header = "delete"
+    event = EventType.BRANCH_DELETED
+    fields = dict(repo=REPOSITORY, user=SENDER_OR_NAME, ref=BRANCH)
 
     @staticmethod
-    def cast_payload_to_event(event_type: str, json: JSON) -> GitHubEvent:
-        return GitHubEvent(
-            event_type=EventType.BRANCH_DELETED,
-            repo=Repository(
-                name=json["repository"]["full_name"],
-                link=json["repository"]["html_url"],
-            ),
-            user=User(name=json["sender"][("name", "login")]),
-            ref=Ref(name=find_ref(json["ref"])),
-        )
+    def verify_payload(event_type: str, json: dict) -> bool:
+        return (event_type == "delete" and REF_TYPE(json) == "branch"
+                and PUSHER_TYPE(json) == "user")
 
 
 class CommitCommentEventParser(EventParser):
@@ -180,30 +383,30 @@ class CommitCommentEventParser(EventParser):
     Parser for comments on commits.
     """
 
-    @staticmethod
-    def verify_payload(event_type: str, json: JSON) -> bool:
-        return event_type == "commit_comment" and json["action"] == "created"
-
-    @staticmethod
-    def cast_payload_to_event(event_type: str, json: JSON) -> GitHubEvent:
-        return GitHubEvent(
-            event_type=EventType.COMMIT_COMMENT,
-            repo=Repository(
-                name=json["repository"]["full_name"],
-                link=json["repository"]["html_url"],
-            ),
-            user=User(name=json["comment"]["user"]["login"]),
-            comments=[convert_links(json["comment"]["body"])],
-            commits=[
-                Commit(
-                    sha=json["comment"]["commit_id"][:8],
-                    link=json["repository"]["html_url"] + "/commit/" +
-                    json["comment"]["commit_id"][:8],
-                    message="",
-                )
-            ],
-            links=[Link(url=json["comment"]["html_url"])],
-        )
+    event_header = "commit_comment"
+    actions = ("created", )
+    event = EventType.COMMIT_COMMENT
+    fields = dict(
+        repo=REPOSITORY,
+        user=model(User, name=field("comment.user.login")),
+        comments=COMMENT,
+        commits=one(
+            model(
+                Commit,
+                sha=field("comment.commit_id", short_sha),
+                link=combine(
+                    lambda base_url, sha: f"{base_url}/commit/{sha}",
+                    REPOSITORY_LINK,
+                    field("comment.commit_id", short_sha),
+                ),
+                message=const(""),
+            )),
+        links=COMMENT_LINK,
+    )
+
+    @staticmethod
+    def verify_payload(event_type: str, json: dict) -> bool:
+        return event_type == "commit_comment" and ACTION(json) == "created"
 
 
 class ForkEventParser(EventParser):
@@ -211,21 +414,17 @@ class ForkEventParser(EventParser):
     Parser for repository fork events.
     """
 
-    @staticmethod
-    def verify_payload(event_type: str, json: JSON) -> bool:
-        return event_type == "fork"
+    event_header = "fork"
+    event = EventType.FORK
+    fields = dict(
+        repo=REPOSITORY,
+        user=model(User, name=field("forkee.owner.login")),
+        links=one(model(Link, url=field("forkee.html_url"))),
+    )
 
     @staticmethod
-    def cast_payload_to_event(event_type: str, json: JSON) -> GitHubEvent:
-        return GitHubEvent(
-            event_type=EventType.FORK,
-            repo=Repository(
-                name=json["repository"]["full_name"],
-                link=json["repository"]["html_url"],
-            ),
-            user=User(name=json["forkee"]["owner"]["login"]),
-            links=[Link(url=json["forkee"]["html_url"])],
-        )
+    def verify_payload(event_type: str, json: dict) -> bool:
+        return event_type == "fork"
 
 
 class IssueOpenEventParser(EventParser):
@@ -233,25 +432,18 @@ class IssueOpenEventParser(EventParser):
     Parser for issue creation events.
     """
 
-    @staticmethod
-    def verify_payload(event_type: str, json: JSON) -> bool:
-        return (event_type == "issues") and (json["action"] == "opened")
+    event_header = "issues"
+    actions = ("opened", )
+    event = EventType.ISSUE_OPENED
+    fields = dict(
+        repo=REPOSITORY,
+        user=model(User, name=field("issue.user.login")),
+        issue=ISSUE,
+    )
 
     @staticmethod
-    def cast_payload_to_event(event_type: str, json: JSON) -> GitHubEvent:
-        return GitHubEvent(
-            event_type=EventType.ISSUE_OPENED,
-            repo=Repository(
-                name=json["repository"]["full_name"],
-                link=json["repository"]["html_url"],
-            ),
-            user=User(name=json["issue"]["user"]["login"]),
-            issue=Issue(
-                number=json["issue"]["number"],
-                title=json["issue"]["title"],
-                link=json["issue"]["html_url"],
-            ),
-        )
+    def verify_payload(event_type: str, json: dict) -> bool:
+        return (event_type == "issues") and (ACTION(json) == "opened")
 
 
 class IssueCloseEventParser(EventParser):
@@ -259,25 +451,18 @@ class IssueCloseEventParser(EventParser):
     Parser for issue closing events.
     """
 
-    @staticmethod
-    def verify_payload(event_type: str, json: JSON) -> bool:
-        return (event_type == "issues") and (json["action"] == "closed")
+    event_header = "issues"
+    actions = ("closed", )
+    event = EventType.ISSUE_CLOSED
+    fields = dict(
+        repo=REPOSITORY,
+        user=model(User, name=field("issue.user.login")),
+        issue=ISSUE,
+    )
 
     @staticmethod
-    def cast_payload_to_event(event_type: str, json: JSON) -> GitHubEvent:
-        return GitHubEvent(
-            event_type=EventType.ISSUE_CLOSED,
-            repo=Repository(
-                name=json["repository"]["full_name"],
-                link=json["repository"]["html_url"],
-            ),
-            user=User(name=json["issue"]["user"]["login"]),
-            issue=Issue(
-                number=json["issue"]["number"],
-                title=json["issue"]["title"],
-                link=json["issue"]["html_url"],
-            ),
-        )
+    def verify_payload(event_type: str, json: dict) -> bool:
+        return (event_type == "issues") and (ACTION(json) == "closed")
 
 
 class IssueCommentEventParser(EventParser):
@@ -285,27 +470,20 @@ class IssueCommentEventParser(EventParser):
     Parser for comments on issues.
     """
 
-    @staticmethod
-    def verify_payload(event_type: str, json: JSON) -> bool:
-        return event_type == "issue_comment" and json["action"] == "created"
+    event_header = "issue_comment"
+    actions = ("created", )
+    event = EventType.ISSUE_COMMENT
+    fields = dict(
+        repo=REPOSITORY,
+        user=SENDER,
+        issue=ISSUE,
+        comments=COMMENT,
+        links=COMMENT_LINK,
+    )
 
     @staticmethod
-    def cast_payload_to_event(event_type: str, json: JSON) -> GitHubEvent:
-        return GitHubEvent(
-            event_type=EventType.ISSUE_COMMENT,
-            repo=Repository(
-                name=json["repository"]["full_name"],
-                link=json["repository"]["html_url"],
-            ),
-            user=User(name=json["sender"]["login"]),
-            issue=Issue(
-                number=json["issue"]["number"],
-                title=json["issue"]["title"],
-                link=json["issue"]["html_url"],
-            ),
-            comments=[convert_links(json["comment"]["body"])],
-            links=[Link(url=json["comment"]["html_url"])],
-        )
+    def verify_payload(event_type: str, json: dict) -> bool:
+        return event_type == "issue_comment" and ACTION(json) == "created"
 
 
 class PingEventParser(EventParser):
@@ -313,13 +491,20 @@ class PingEventParser(EventParser):
     Parser for GitHub's testing ping events.
     """
 
+    event_header = "ping"
+
     @staticmethod
-    def verify_payload(event_type: str, json: JSON) -> bool:
+    def verify_payload(event_type: str, json: dict) -> bool:
         return event_type == "ping"
 
-    @staticmethod
-    def cast_payload_to_event(event_type: str, json: JSON):
-        print("Ping event received!")
+    @classmethod
+    def cast_payload_to_event(
+        cls,
+        event_type: str,
+        json: dict,
+        max_commits: int = MAX_PUSH_COMMITS,
+    ):
+        log_event(logging.INFO, "ping_received")
 
 
 class PullCloseEventParser(EventParser):
@@ -327,26 +512,19 @@ class PullCloseEventParser(EventParser):
     Parser for PR closing events.
     """
 
-    @staticmethod
-    def verify_payload(event_type: str, json: JSON) -> bool:
-        return ((event_type == "pull_request") and (json["action"] == "closed")
-                and (not json["pull_request"]["merged"]))
+    event_header = "pull_request"
+    actions = ("closed", )
+    event = EventType.PULL_CLOSED
+    fields = dict(
+        repo=REPOSITORY,
+        user=PULL_REQUEST_AUTHOR,
+        pull_request=PULL_REQUEST,
+    )
 
     @staticmethod
-    def cast_payload_to_event(event_type: str, json: JSON) -> GitHubEvent:
-        return GitHubEvent(
-            event_type=EventType.PULL_CLOSED,
-            repo=Repository(
-                name=json["repository"]["full_name"],
-                link=json["repository"]["html_url"],
-            ),
-            user=User(name=json["pull_request"]["user"]["login"]),
-            pull_request=PullRequest(
-                number=json["pull_request"]["number"],
-                title=json["pull_request"]["title"],
-                link=json["pull_request"]["html_url"],
-            ),
-        )
+    def verify_payload(event_type: str, json: dict) -> bool:
+        return ((event_type == "pull_request") and (ACTION(json) == "closed")
+                and (not PULL_MERGED(json)))
 
 
 class PullMergeEventParser(EventParser):
@@ -354,26 +532,19 @@ class PullMergeEventParser(EventParser):
     Parser for PR merging events.
     """
 
-    @staticmethod
-    def verify_payload(event_type: str, json: JSON) -> bool:
-        return ((event_type == "pull_request") and (json["action"] == "closed")
-                and (json["pull_request"]["merged"]))
+    event_header = "pull_request"
+    actions = ("closed", )
+    event = EventType.PULL_MERGED
+    fields = dict(
+        repo=REPOSITORY,
+        user=PULL_REQUEST_AUTHOR,
+        pull_request=PULL_REQUEST,
+    )
 
     @staticmethod
-    def cast_payload_to_event(event_type: str, json: JSON) -> GitHubEvent:
-        return GitHubEvent(
-            event_type=EventType.PULL_MERGED,
-            repo=Repository(
-                name=json["repository"]["full_name"],
-                link=json["repository"]["html_url"],
-            ),
-            user=User(name=json["pull_request"]["user"]["login"]),
-            pull_request=PullRequest(
-                number=json["pull_request"]["number"],
-                title=json["pull_request"]["title"],
-                link=json["pull_request"]["html_url"],
-            ),
-        )
+    def verify_payload(event_type: str, json: dict) -> bool:
+        return ((event_type == "pull_request") and (ACTION(json) == "closed")
+                and (PULL_MERGED(json)))
 
 
 class PullOpenEventParser(EventParser):
@@ -381,25 +552,18 @@ class PullOpenEventParser(EventParser):
     Parser for PR creation events.
     """
 
-    @staticmethod
-    def verify_payload(event_type: str, json: JSON) -> bool:
-        return (event_type == "pull_request") and (json["action"] == "opened")
+    event_header = "pull_request"
+    actions = ("opened", )
+    event = EventType.PULL_OPENED
+    fields = dict(
+        repo=REPOSITORY,
+        user=PULL_REQUEST_AUTHOR,
+        pull_request=PULL_REQUEST,
+    )
 
     @staticmethod
-    def cast_payload_to_event(event_type: str, json: JSON) -> GitHubEvent:
-        return GitHubEvent(
-            event_type=EventType.PULL_OPENED,
-            repo=Repository(
-                name=json["repository"]["full_name"],
-                link=json["repository"]["html_url"],
-            ),
-            user=User(name=json["pull_request"]["user"]["login"]),
-            pull_request=PullRequest(
-                number=json["pull_request"]["number"],
-                title=json["pull_request"]["title"],
-                link=json["pull_request"]["html_url"],
-            ),
-        )
+    def verify_payload(event_type: str, json: dict) -> bool:
+        return (event_type == "pull_request") and (ACTION(json) == "opened")
 
 
 class PullReadyEventParser(EventParser):
@@ -407,29 +571,22 @@ class PullReadyEventParser(EventParser):
     Parser for PR review request events.
     """
 
-    @staticmethod
-    def verify_payload(event_type: str, json: JSON) -> bool:
-        return (event_type == "pull_request"
-                and json["action"] == "review_requested")
+    event_header = "pull_request"
+    actions = ("review_requested", )
+    event = EventType.PULL_READY
+    fields = dict(
+        repo=REPOSITORY,
+        pull_request=PULL_REQUEST,
+        reviewers=each(
+            "pull_request.requested_reviewers",
+            model(User, name=field("login")),
+        ),
+    )
 
     @staticmethod
-    def cast_payload_to_event(event_type: str, json: JSON) -> GitHubEvent:
-        return GitHubEvent(
-            event_type=EventType.PULL_READY,
-            repo=Repository(
-                name=json["repository"]["full_name"],
-                link=json["repository"]["html_url"],
-            ),
-            pull_request=PullRequest(
-                number=json["pull_request"]["number"],
-                title=json["pull_request"]["title"],
-                link=json["pull_request"]["html_url"],
-            ),
-            reviewers=[
-                User(name=user["login"])
-                for user in json["pull_request"]["requested_reviewers"]
-            ],
-        )
+    def verify_payload(event_type: str, json: dict) -> bool:
+        return (event_type == "pull_request"
+                and ACTION(json) == "review_requested")
 
 
 class PushEventParser(EventParser):
@@ -437,32 +594,45 @@ class PushEventParser(EventParser):
     Parser for code push events.
     """
 
-    @staticmethod
-    def verify_payload(event_type: str, json: JSON) -> bool:
-        return (event_type == "push") and (len(json["commits"]) > 0)
+    event_header = "push"
+    event = EventType.PUSH
+    fields = dict(
+        repo=REPOSITORY,
+        ref=BRANCH,
+        user=model(User, name=field("pusher|sender.name|login")),
+        commits=push_commits(MAX_PUSH_COMMITS),
+        commit_count=count("commits"),
+    )
+
+    @classmethod
+    def cast_payload_to_event(
+        cls,
+        event_type: str,
+        json: dict,
+        max_commits: int = MAX_PUSH_COMMITS,
+    ) -> GitHubEvent:
+        if max_commits == MAX_PUSH_COMMITS:
+            return cls.extract_event(json)
+        return cls.limited_extractor(max_commits)(json)
+
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def limited_extractor(cls, limit: int) -> EventExtractor:
+        """
+        Compiles the parser's fields with another number of commits per push, as huge pushes can carry thousands of them.
+        Extractors are cached per limit, and the class-level `fields` are left untouched.
+        :param limit: Maximum number of commits to extract. The total count is always kept.
+        :return: Compiled extractor.
+        """
+        return compile_event(
+            GitHubEvent,
+            dict(cls.fields, commits=push_commits(limit)),
+            type=cls.event,
+        )
 
     @staticmethod
-    def cast_payload_to_event(event_type: str, json: JSON) -> GitHubEvent:
-        base_url = json["repository"]["html_url"]
-        branch_name = find_ref(json["ref"])
-
-        # Commits
-        commits: list[Commit] = [
-            Commit(
-                message=commit["message"],
-                sha=commit["id"][:8],
-                link=base_url + f"/commit/{commit['id']}",
-            ) for commit in json["commits"]
-        ]
-
-        return GitHubEvent(
-            event_type=EventType.PUSH,
-            repo=Repository(name=json["repository"]["full_name"],
-                            link=base_url),
-            ref=Ref(name=branch_name),
-            user=User(name=json[("pusher", "sender")][("name", "login")]),
-            commits=commits,
-        )
+    def verify_payload(event_type: str, json: dict) -> bool:
+        return (event_type == "push") and (len(json.get("commits") or ()) > 0)
 
 
 class ReleaseEventParser(EventParser):
@@ -470,25 +640,20 @@ class ReleaseEventParser(EventParser):
     Parser for release creation events.
     """
 
-    @staticmethod
-    def verify_payload(event_type: str, json: JSON) -> bool:
-        return (event_type == "release") and (json["action"] == "released")
+    event_header = "release"
+    actions = ("released", )
+    event = EventType.RELEASE
+    fields = dict(
+        repo=REPOSITORY,
+        status=field("action", lambda action: "created"
+                     if action == "released" else ""),
+        ref=model(Ref, name=field("release.tag_name"), type=const("tag")),
+        user=SENDER,
+    )
 
     @staticmethod
-    def cast_payload_to_event(event_type: str, json: JSON) -> GitHubEvent:
-        return GitHubEvent(
-            event_type=EventType.RELEASE,
-            repo=Repository(
-                name=json["repository"]["full_name"],
-                link=json["repository"]["html_url"],
-            ),
-            status="created" if json["action"] == "released" else "",
-            ref=Ref(
-                name=json["release"]["tag_name"],
-                ref_type="tag",
-            ),
-            user=User(name=json["sender"]["login"]),
-        )
+    def verify_payload(event_type: str, json: dict) -> bool:
+        return (event_type == "release") and (ACTION(json) == "released")
 
 
 class ReviewEventParser(EventParser):
@@ -496,58 +661,43 @@ class ReviewEventParser(EventParser):
     Parser for PR review events.
     """
 
+    event_header = "pull_request_review"
+    actions = ("submitted", )
+    event = EventType.REVIEW
+    fields = dict(
+        repo=REPOSITORY,
+        pull_request=PULL_REQUEST,
+        status=field("review.state", str.lower),
+        reviewers=one(SENDER),
+    )
+
     @staticmethod
-    def verify_payload(event_type: str, json: JSON) -> bool:
+    def verify_payload(event_type: str, json: dict) -> bool:
         return (event_type == "pull_request_review"
-                and json["action"] == "submitted"
-                and json["review"]["state"].lower()
+                and ACTION(json) == "submitted" and REVIEW_STATE(json).lower()
                 in ["approved", "changes_requested"])
 
-    @staticmethod
-    def cast_payload_to_event(event_type: str, json: JSON) -> GitHubEvent:
-        return GitHubEvent(
-            event_type=EventType.REVIEW,
-            repo=Repository(
-                name=json["repository"]["full_name"],
-                link=json["repository"]["html_url"],
-            ),
-            pull_request=PullRequest(
-                number=json["pull_request"]["number"],
-                title=json["pull_request"]["title"],
-                link=json["pull_request"]["html_url"],
-            ),
-            status=json["review"]["state"].lower(),
-            reviewers=[User(name=json["sender"]["login"])],
-        )
-
 
 class ReviewCommentEventParser(EventParser):
     """
     Parser for comments added to PR review.
     """
 
-    @staticmethod
-    def verify_payload(event_type: str, json: JSON) -> bool:
-        return (event_type == "pull_request_review_comment"
-                and json["action"] == "created")
+    event_header = "pull_request_review_comment"
+    actions = ("created", )
+    event = EventType.REVIEW_COMMENT
+    fields = dict(
+        repo=REPOSITORY,
+        user=SENDER,
+        pull_request=PULL_REQUEST,
+        comments=COMMENT,
+        links=COMMENT_LINK,
+    )
 
     @staticmethod
-    def cast_payload_to_event(event_type: str, json: JSON) -> GitHubEvent:
-        return GitHubEvent(
-            event_type=EventType.REVIEW_COMMENT,
-            repo=Repository(
-                name=json["repository"]["full_name"],
-                link=json["repository"]["html_url"],
-            ),
-            user=User(name=json["sender"]["login"]),
-            pull_request=PullRequest(
-                number=json["pull_request"]["number"],
-                title=json["pull_request"]["title"],
-                link=json["pull_request"]["html_url"],
-            ),
-            comments=[convert_links(json["comment"]["body"])],
-            links=[Link(url=json["comment"]["html_url"])],
-        )
+    def verify_payload(event_type: str, json: dict) -> bool:
+        return (event_type == "pull_request_review_comment"
+                and ACTION(json) == "created")
 
 
 class StarAddEventParser(EventParser):
@@ -555,20 +705,14 @@ class StarAddEventParser(EventParser):
     Parser for repository starring events.
     """
 
-    @staticmethod
-    def verify_payload(event_type: str, json: JSON) -> bool:
-        return (event_type == "star") and (json["action"] == "created")
+    event_header = "star"
+    actions = ("created", )
+    event = EventType.STAR_ADDED
+    fields = dict(repo=REPOSITORY, user=SENDER)
 
     @staticmethod
-    def cast_payload_to_event(event_type: str, json: JSON) -> GitHubEvent:
-        return GitHubEvent(
-            event_type=EventType.STAR_ADDED,
-            repo=Repository(
-                name=json["repository"]["full_name"],
-                link=json["repository"]["html_url"],
-            ),
-            user=User(name=json["sender"]["login"]),
-        )
+    def verify_payload(event_type: str, json: dict) -> bool:
+        return (event_type == "star") and (ACTION(json) == "created")
 
 
 class StarRemoveEventParser(EventParser):
@@ -576,20 +720,14 @@ class StarRemoveEventParser(EventParser):
     Parser for repository unstarring events.
     """
 
-    @staticmethod
-    def verify_payload(event_type: str, json: JSON) -> bool:
-        return (event_type == "star") and (json["action"] == "deleted")
+    event_header = "star"
+    actions = ("deleted", )
+    event = EventType.STAR_REMOVED
+    fields = dict(repo=REPOSITORY, user=SENDER)
 
     @staticmethod
-    def cast_payload_to_event(event_type: str, json: JSON) -> GitHubEvent:
-        return GitHubEvent(
-            event_type=EventType.STAR_REMOVED,
-            repo=Repository(
-                name=json["repository"]["full_name"],
-                link=json["repository"]["html_url"],
-            ),
-            user=User(name=json["sender"]["login"]),
-        )
+    def verify_payload(event_type: str, json: dict) -> bool:
+        return (event_type == "star") and (ACTION(json) == "deleted")
 
 
 class TagCreateEventParser(EventParser):
@@ -597,22 +735,14 @@ class TagCreateEventParser(EventParser):
     Parser for tag creation events.
     """
 
-    @staticmethod
-    def verify_payload(event_type: str, json: JSON) -> bool:
-        return (event_type == "create" and json["ref_type"] == "tag"
-                and json["pusher_type"] == "user")
+    event_header = "create"
+    event = EventType.TAG_CREATED
+    fields = dict(repo=REPOSITORY, user=SENDER_OR_NAME, ref=TAG)
 
     @staticmethod
-    def cast_payload_to_event(event_type: str, json: JSON) -> GitHubEvent:
-        return GitHubEvent(
-            event_type=EventType.TAG_CREATED,
-            repo=Repository(
-                name=json["repository"]["full_name"],
-                link=json["repository"]["html_url"],
-            ),
-            user=User(name=json["sender"][("name", "login")]),
-            ref=Ref(name=find_ref(json["ref"]), ref_type="tag"),
-        )
+    def verify_payload(event_type: str, json: dict) -> bool:
+        return (event_type == "create" and REF_TYPE(json) == "tag"
+                and PUSHER_TYPE(json) == "user")
 
 
 class TagDeleteEventParser(EventParser):
@@ -620,49 +750,11 @@ class TagDeleteEventParser(EventParser):
     Parser for tag deletion events.
     """
 
-    @staticmethod
-    def verify_payload(event_type: str, json: JSON) -> bool:
-        return (event_type == "delete" and json["ref_type"] == "tag"
-                and json["pusher_type"] == "user")
+    event_header = "delete"
+    event = EventType.TAG_DELETED
+    fields = dict(repo=REPOSITORY, user=SENDER_OR_NAME, ref=TAG)
 
     @staticmethod
-    def cast_payload_to_event(event_type: str, json: JSON) -> GitHubEvent:
-        return GitHubEvent(
-            event_type=EventType.TAG_DELETED,
-            repo=Repository(
-                name=json["repository"]["full_name"],
-                link=json["repository"]["html_url"],
-            ),
-            user=User(name=json["sender"][("name", "login")]),
-            ref=Ref(
-                name=find_ref(json["ref"]),
-                ref_type="tag",
-            ),
-        )
-
-
-# Helper functions:
-def find_ref(x: str) -> str:
-    """
-    Helper function to extract branch name
-    :param x: Full version of ref id.
-    :return: Extracted ref name.
-    """
-    return x[x.find("/", x.find("/") + 1) + 1:]
-
-
-def convert_links(x: str) -> str:
-    """
-    Helper function to format links from GitHub format to Slack format
-    :param x: Raw GitHub text.
-    :return: Formatted text.
-    """
-    reg: str = r'\[([a-zA-Z0-9!@#$%^&*,./?\'";:_=~` ]+)\]\(([(http(s)?):\/\/(www\.)?a-zA-Z0-9@:%._\+~#=]{2,256}\.[a-z]{2,6}\b[-a-zA-Z0-9@:%_\+.~#?&//=]*)\)'
-    gh_links: list[tuple[str, str]] = re.findall(reg, x)
-    for (txt, link) in gh_links:
-        old: str = f"[{txt}]({link})"
-        txt = str(txt).strip()
-        link = str(link).strip()
-        new: str = f"<{link}|{txt}>"
-        x = x.replace(old, new)
-    return x
+    def verify_payload(event_type: str, json: dict) -> bool:
+        return (event_type == "delete" and REF_TYPE(json) == "tag"
+                and PUSHER_TYPE(json) == "user")
@@ -0,0 +1,72 @@
+"""
+Contains the `WebhookRequest` class, which carries one GitHub webhook delivery through verification and parsing.
+"""
+
+from typing import Any, Optional
+
+from flask.wrappers import Request
+
+from ..utils.json import decode
+
+
+class WebhookRequest:
+    """
+    Holds the parts of a webhook delivery that the bot needs, decoding the body at most once.
+
+    The raw body is only kept until the signature has been checked,
+    after which only the decoded payload is held.
+
+    :param event_type: Value of the "X-GitHub-Event" header.
+    :param delivery_id: Value of the "X-GitHub-Delivery" header.
+    :param signature: Value of the "X-Hub-Signature-256" header.
+    :param body: Raw body of the HTTP request.
+    """
+
+    def __init__(
+        self,
+        event_type: str,
+        delivery_id: Optional[str],
+        signature: Optional[str],
+        body: bytes,
+    ):
+        self.event_type = event_type
+        self.delivery_id = delivery_id
+        self.signature = signature
+        self.body: Optional[bytes] = body
+        self._json: Any = None
+        self._decoded = False
+
+    @property
+    def json(self) -> dict[str, Any]:
+        """
+        Decoded payload. Decoded on first access, and reused afterwards.
+        :raises ValueError: If the body isn't valid JSON.
+        """
+        if not self._decoded:
+            self._json = decode(self.body)
+            self._decoded = True
+        return self._json
+
+    def release_body(self):
+        """
+        Drops the raw body, once it is no longer needed for verification.
+        """
+        if not self._decoded:
+            # Decode before dropping, so the payload stays available
+            _ = self.json
+        self.body = None
+
+    @staticmethod
+    def from_flask(request: Request) -> "WebhookRequest":
+        """
+        Extracts a `WebhookRequest` from an incoming Flask request, without caching the body on the request itself.
+        :param request: The entire HTTP request.
+        :return: `WebhookRequest` containing the headers and body of the delivery.
+        """
+        headers = request.headers
+        return WebhookRequest(
+            event_type=headers.get("X-GitHub-Event", ""),
+            delivery_id=headers.get("X-GitHub-Delivery"),
+            signature=headers.get("X-Hub-Signature-256"),
+            body=request.get_data(cache=False),
+        )
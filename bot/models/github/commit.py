@@ -2,7 +2,10 @@
 Model for a Git commit.
 """
 
+from dataclasses import dataclass
 
+
+@dataclass(frozen=True, slots=True)
 class Commit:
     """
     Model for a Git commit.
@@ -12,15 +15,9 @@ class Commit:
     :param link: The commit's link on GitHub.
     """
 
-    def __init__(
-        self,
-        message: str,
-        sha: str,
-        link: str,
-    ):
-        self.message = message
-        self.sha = sha
-        self.link = link
+    message: str
+    sha: str
+    link: str
 
     def __str__(self) -> str:
         return f"<{self.message}|{self.link}>"
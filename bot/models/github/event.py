@@ -1,73 +1,69 @@
 """
 Model class that can store all relevant info about all events that the project handles.
 """
+from dataclasses import dataclass, fields
 from typing import Optional
 
 from ..link import Link
 from . import Commit, EventType, Issue, PullRequest, Ref, Repository, User
 
 
+@dataclass(frozen=True, slots=True)
 class GitHubEvent:
     """
     Model class that can store all relevant info about all events that the project handles.
+    Fields that don't apply to the event's type are left as `None`.
 
-    :param event_type: Enum-ized type of the event in question.
+    :param type: Enum-ized type of the event in question.
     :param repo: Repository where the event originated.
     :keyword user: GitHub user who triggered the event.
     :keyword ref: Branch or tag ref related to the event.
 
-    :keyword number: Number of the PR/Issue related to the event.
-    :keyword title: Title of the PR/Issue related to the event.
+    :keyword issue: Issue related to the event.
+    :keyword pull_request: PR related to the event.
 
     :keyword status: Status of the review where the event originated.
-    :keyword commits: List of commits send with the event.
-    :keyword comments: List of comments related to the event.
-    :keyword reviewers: List of reviewers mentioned in the event.
-    :keyword links: List of miscellaneous links.
+    :keyword commits: Commits sent with the event. May be cut short, see `commit_count`.
+    :keyword commit_count: Total number of commits sent with the event.
+    :keyword comments: Comments related to the event.
+    :keyword reviewers: Reviewers mentioned in the event.
+    :keyword links: Miscellaneous links.
     """
 
     type: EventType
     repo: Repository
-    status: Optional[str]
-    issue: Optional[Issue]
-    pull_request: Optional[PullRequest]
-    ref: Optional[Ref]
-    user: Optional[User]
-    comments: Optional[list[str]]
-    commits: Optional[list[Commit]]
-    links: Optional[list[Link]]
-    reviewers: Optional[list[User]]
-
-    def __init__(self, event_type: EventType, repo: Repository, **kwargs):
-        self.type = event_type
-        self.repo = repo
-
-        if "status" in kwargs:
-            self.status = kwargs["status"]
-        if "issue" in kwargs:
-            self.issue = kwargs["issue"]
-        if "pull_request" in kwargs:
-            self.pull_request = kwargs["pull_request"]
-        if "ref" in kwargs:
-            self.ref = kwargs["ref"]
-        if "user" in kwargs:
-            self.user = kwargs["user"]
-        if "comments" in kwargs:
-            self.comments = kwargs["comments"]
-        if "commits" in kwargs:
-            self.commits = kwargs["commits"]
-        if "links" in kwargs:
-            self.links = kwargs["links"]
-        if "reviewers" in kwargs:
-            self.reviewers = kwargs["reviewers"]
+    status: Optional[str] = None
+    issue: Optional[Issue] = None
+    pull_request: Optional[PullRequest] = None
+    ref: Optional[Ref] = None
+    user: Optional[User] = None
+    comments: Optional[tuple[str, ...]] = None
+    commits: Optional[tuple[Commit, ...]] = None
+    commit_count: Optional[int] = None
+    links: Optional[tuple[Link, ...]] = None
+    reviewers: Optional[tuple[User, ...]] = None
 
     def __str__(self):
         string = ""
-        for var, value in vars(self).items():
-            string += var + "="
+        for field in fields(self):
+            value = getattr(self, field.name)
+            if value is None:
+                continue
+            string += field.name + "="
             if isinstance(value, (list, tuple, set)):
                 string += str([str(v) for v in value])
             else:
                 string += str(value)
             string += ", "
         return "(" + string[:-2] + ")"
+
+
+def count_commits(event: GitHubEvent) -> int:
+    """
+    Counts the commits of a push, including the ones that weren't extracted.
+    :param event: Push event.
+    :return: Total number of commits.
+    """
+    if event.commit_count is None:
+        return len(event.commits)
+    return event.commit_count
@@ -3,45 +3,50 @@ Enum for easy access to all types of GitHub events handled by the project.
 """
 
 from enum import Enum
+from typing import Iterable
 
 
 class EventType(Enum):
     """
     Enum for easy access to all types of GitHub events handled by the project.
+
+    Each member has a fixed bit, used to store sets of events as integer bitmasks.
+    Bits are persisted in the database, so they must never be reused or reassigned.
     """
 
     # Ref
-    BRANCH_CREATED = ("bc", "A Branch was created")
-    BRANCH_DELETED = ("bd", "A Branch was deleted")
-    TAG_CREATED = ("tc", "A Tag was created")
-    TAG_DELETED = ("td", "A Tag was deleted")
+    BRANCH_CREATED = ("bc", "A Branch was created", 0)
+    BRANCH_DELETED = ("bd", "A Branch was deleted", 1)
+    TAG_CREATED = ("tc", "A Tag was created", 2)
+    TAG_DELETED = ("td", "A Tag was deleted", 3)
 
     # PR/Issue
-    PULL_CLOSED = ("prc", "A Pull Request was closed")
-    PULL_MERGED = ("prm", "A Pull Request was merged")
-    PULL_OPENED = ("pro", "A Pull Request was opened")
-    PULL_READY = ("prr", "A Pull Request is ready")
-    ISSUE_OPENED = ("iso", "An Issue was opened")
-    ISSUE_CLOSED = ("isc", "An Issue was closed")
+    PULL_CLOSED = ("prc", "A Pull Request was closed", 4)
+    PULL_MERGED = ("prm", "A Pull Request was merged", 5)
+    PULL_OPENED = ("pro", "A Pull Request was opened", 6)
+    PULL_READY = ("prr", "A Pull Request is ready", 7)
+    ISSUE_OPENED = ("iso", "An Issue was opened", 8)
+    ISSUE_CLOSED = ("isc", "An Issue was closed", 9)
 
     # Review
-    REVIEW = ("rv", "A Review was given on a Pull Request")
-    REVIEW_COMMENT = ("rc", "A Comment was added to a Review")
+    REVIEW = ("rv", "A Review was given on a Pull Request", 10)
+    REVIEW_COMMENT = ("rc", "A Comment was added to a Review", 11)
 
     # Discussion
-    COMMIT_COMMENT = ("cc", "A Comment was made on a Commit")
-    ISSUE_COMMENT = ("ic", "A Comment was made on an Issue")
+    COMMIT_COMMENT = ("cc", "A Comment was made on a Commit", 12)
+    ISSUE_COMMENT = ("ic", "A Comment was made on an Issue", 13)
 
     # Misc.
-    FORK = ("fk", "Repository was forked by a user")
-    PUSH = ("p", "One or more Commits were pushed")
-    RELEASE = ("rl", "A new release was published")
-    STAR_ADDED = ("sa", "A star was added to repository")
-    STAR_REMOVED = ("sr", "A star was removed from repository")
+    FORK = ("fk", "Repository was forked by a user", 14)
+    PUSH = ("p", "One or more Commits were pushed", 15)
+    RELEASE = ("rl", "A new release was published", 16)
+    STAR_ADDED = ("sa", "A star was added to repository", 17)
+    STAR_REMOVED = ("sr", "A star was removed from repository", 18)
 
-    def __init__(self, keyword, docs):
+    def __init__(self, keyword, docs, bit):
         self.keyword = keyword
         self.docs = docs
+        self.bit = 1 << bit
 
 
 def convert_keywords_to_events(keywords: list[str]) -> set[EventType]:
@@ -70,3 +75,24 @@ def convert_keywords_to_events(keywords: list[str]) -> set[EventType]:
         for event_type in EventType for keyword in keywords
         if event_type.keyword == keyword
     }
+
+
+def convert_events_to_bitmask(events: Iterable[EventType]) -> int:
+    """
+    Packs `EventType` members into an integer bitmask.
+    :param events: Iterable of `EventType` members.
+    :return: Bitwise OR of the bits of the passed events.
+    """
+    bitmask = 0
+    for event in events:
+        bitmask |= event.bit
+    return bitmask
+
+
+def convert_bitmask_to_events(bitmask: int) -> list[EventType]:
+    """
+    Unpacks an integer bitmask into `EventType` members.
+    :param bitmask: Bitwise OR of the bits of some events.
+    :return: List of `EventType` members whose bits are set, in declaration order.
+    """
+    return [event_type for event_type in EventType if bitmask & event_type.bit]
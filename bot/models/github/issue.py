@@ -2,7 +2,10 @@
 Model for a GitHub issue.
 """
 
+from dataclasses import dataclass
 
+
+@dataclass(frozen=True, slots=True)
 class Issue:
     """
     Model for a GitHub issue.
@@ -12,10 +15,9 @@ class Issue:
     :param link: Link to the issue.
     """
 
-    def __init__(self, title: str, number: int, link: str):
-        self.title = title
-        self.number = number
-        self.link = link
+    title: str
+    number: int
+    link: str
 
     def __str__(self):
         return f"<{self.link}|#{self.number} {self.title}>"
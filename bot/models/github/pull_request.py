@@ -2,7 +2,10 @@
 Model for a GitHub PR.
 """
 
+from dataclasses import dataclass
 
+
+@dataclass(frozen=True, slots=True)
 class PullRequest:
     """
     Model for a GitHub PR.
@@ -12,10 +15,9 @@ class PullRequest:
     :param link: Link to the PR.
     """
 
-    def __init__(self, title: str, number: int, link: str):
-        self.title = title
-        self.number = number
-        self.link = link
+    title: str
+    number: int
+    link: str
 
     def __str__(self):
         return f"<{self.link}|#{self.number} {self.title}>"
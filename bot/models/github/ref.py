@@ -2,24 +2,21 @@
 Model for a Git ref (branch/tag).
 """
 
+from dataclasses import dataclass
 from typing import Literal
 
 
+@dataclass(frozen=True, slots=True)
 class Ref:
     """
     Model for a Git ref (branch/tag).
 
     :param name: Name of the ref.
-    :param ref_type: "branch" or "tag".
+    :param type: "branch" or "tag".
     """
 
-    def __init__(
-        self,
-        name: str,
-        ref_type: Literal["branch", "tag"] = "branch",
-    ):
-        self.name = name
-        self.type = ref_type
+    name: str
+    type: Literal["branch", "tag"] = "branch"
 
     def __str__(self):
         return self.name
@@ -2,7 +2,10 @@
 Model for a GitHub repository.
 """
 
+from dataclasses import dataclass
 
+
+@dataclass(frozen=True, slots=True)
 class Repository:
     """
     Model for a GitHub repository.
@@ -11,9 +14,8 @@ class Repository:
     :param link: Link to the repo on GitHub.
     """
 
-    def __init__(self, name: str, link: str):
-        self.name = name
-        self.link = link
+    name: str
+    link: str
 
     def __str__(self):
         return f"<{self.link}|{self.name}>"
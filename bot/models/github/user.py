@@ -2,18 +2,26 @@
 Model for a GitHub user.
 """
 
+from dataclasses import dataclass
+from typing import Optional
 
+
+@dataclass(frozen=True, slots=True)
 class User:
     """
     Model for a GitHub user.
 
     :param name: Username/id of the user.
-    :keyword link: Link to the user's GitHub profile.
+    :keyword link: Link to the user's GitHub profile. Derived from `name` by default.
     """
 
-    def __init__(self, name: str, **kwargs):
-        self.name = name
-        self.link = kwargs.get("link", f"https://github.com/{name}")
+    name: str
+    link: Optional[str] = None
+
+    def __post_init__(self):
+        if self.link is None:
+            # Frozen dataclasses can only be filled in through `object`
+            object.__setattr__(self, "link", f"https://github.com/{self.name}")
 
     def __str__(self):
         return f"<{self.link}|{self.name}>"
@@ -4,7 +4,10 @@ Contains the `Link` model.
 This was separated from "slack.py" To prevent circular-import error.
 """
 
+from dataclasses import dataclass
 
+
+@dataclass(frozen=True, slots=True)
 class Link:
     """
     Holds a text string and a URL.
@@ -14,9 +17,8 @@ class Link:
     :param text: Text that should be displayed instead of the link.
     """
 
-    def __init__(self, url: str | None = None, text: str | None = None):
-        self.url = url
-        self.text = text
+    url: str | None = None
+    text: str | None = None
 
     def __str__(self) -> str:
         """
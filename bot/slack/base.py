@@ -11,3 +11,10 @@ class SlackBotBase:
     def __init__(self, token: str):
         self.storage = SubscriptionStorage()
         self.client: WebClient = WebClient(token)
+
+    def discard_digest(self, channel: str, repository: str):
+        """
+        Drops the events of a repository buffered for a channel's digest. Digests are run by `Messenger`.
+        :param channel: Name of the channel, including the team id prefix.
+        :param repository: Name of the repository.
+        """
@@ -6,8 +6,11 @@ Important methods—
 * `.run` to execute slash commands.
 """
 
+from typing import Optional
+
 from ..utils.log import Logger
 from .messenger import Messenger
+from .rate_limit import RateLimiter
 from .runner import Runner
 
 
@@ -26,6 +29,26 @@ class SlackBot(Messenger, Runner):
         base_url: str,
         secret: str,
         bot_id: str,
+        outbox_workers: int = 0,
+        rate_limiter: Optional[RateLimiter] = None,
+        fanout_workers: int = 1,
+        digests: bool = True,
+        membership_ttl: float = 60 * 60,
     ):
-        Messenger.__init__(self, token)
-        Runner.__init__(self, logger, base_url, secret, token, bot_id)
+        # The common attributes (storage, client) are set up once, by `Messenger.__init__`
+        Messenger.__init__(
+            self,
+            token,
+            outbox_workers,
+            rate_limiter,
+            fanout_workers,
+            digests,
+        )
+        Runner._init_runner(
+            self,
+            logger,
+            base_url,
+            secret,
+            bot_id,
+            membership_ttl,
+        )
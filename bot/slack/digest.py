@@ -0,0 +1,131 @@
+"""
+Contains the `Digest` class, which collects events for channels subscribed in digest mode and posts periodic summaries.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Optional
+
+import sentry_sdk
+
+from ..models.github.event import GitHubEvent
+from ..storage.digests import DigestEntry, DigestStorage
+from .renderers import MAX_DETAILS_LENGTH
+
+DIGEST_PERIODS: dict[str, int] = {
+    "hourly": 60 * 60,
+    "daily": 24 * 60 * 60,
+}
+# ^ Length of each digest period, in seconds. Periods start at multiples of their length, in UTC
+
+MAX_SUMMARY_LENGTH = 300
+# ^ Number of characters of an event's message kept in a digest
+
+
+class Digest:
+    """
+    Buffers one-line summaries of events in `DigestStorage`, so that they survive restarts.
+    A scheduler thread posts one message per channel, listing the events of the period that just ended.
+
+    :param send: Function that posts one (channel, message, details) delivery, raising on failure.
+    """
+
+    POLL_INTERVAL = 60
+
+    def __init__(self, send: Callable[[str, str, Optional[str]], Any]):
+        self.storage = DigestStorage()
+        self.send = send
+
+        self.thread = threading.Thread(
+            target=self._run,
+            name="digest",
+            daemon=True,
+        )
+        self.thread.start()
+
+    def add(
+        self,
+        event: GitHubEvent,
+        message: str,
+        channels: tuple[tuple[str, str], ...],
+    ):
+        """
+        Buffers an event for the digests of the passed channels.
+        :param event: `GitHubEvent` to be summarized.
+        :param message: Main message rendered for the event.
+        :param channels: (channel, digest period) pairs that the event should be included for.
+        """
+        summary = summarize_event(event, message)
+        self.storage.add_entries([(channel, period, event.repo.name, summary)
+                                  for (channel, period) in channels])
+
+    def discard(self, channel: str, repository: str):
+        """
+        Drops the buffered events of a repository, so they don't show up in the channel's next digest.
+        :param channel: Channel that no longer receives digests of the repository.
+        :param repository: Name of the repository.
+        """
+        self.storage.remove_pending_entries(channel, repository)
+
+    def send_due(self, now: float):
+        """
+        Posts the digests of every period that has ended, and clears their buffers.
+        Buffers are only cleared after their digest was handed over, so a failed post is retried on the next run.
+        :param now: Current epoch time.
+        """
+        for period, length in DIGEST_PERIODS.items():
+            period_start = now - now % length
+            due_entries = self.storage.get_due_entries(period, period_start)
+            for channel, entries in due_entries.items():
+                try:
+                    self.send(channel, render_digest(period, entries), None)
+                except Exception as e:
+                    sentry_sdk.capture_exception(e)
+                    continue
+                self.storage.remove_entries([entry.id for entry in entries])
+
+    def _run(self):
+        while True:
+            try:
+                self.send_due(time.time())
+            except Exception as e:
+                sentry_sdk.capture_exception(e)
+            time.sleep(Digest.POLL_INTERVAL)
+
+
+def summarize_event(event: GitHubEvent, message: str) -> str:
+    """
+    Squeezes a rendered message into a single line, prefixed with the event's repository.
+    :param event: `GitHubEvent` that the message was rendered for.
+    :param message: Main message rendered for the event.
+    :return: One-line summary.
+    """
+    summary = " ".join(message.replace("\n>", " ").split())
+    if len(summary) > MAX_SUMMARY_LENGTH:
+        summary = summary[:MAX_SUMMARY_LENGTH - 1] + "…"
+    return f"`{event.repo.name}` {summary}"
+
+
+def render_digest(period: str, entries: list[DigestEntry]) -> str:
+    """
+    Lists buffered summaries in one message, stopping before it gets too long for a single Slack block.
+    :param period: Digest period, e.g. "hourly".
+    :param entries: Buffered summaries, oldest first.
+    :return: Digest message.
+    """
+    header = f"*{period.capitalize()} digest*: {len(entries)} event{'s' if len(entries) != 1 else ''}"
+
+    # Leave room for the header and the summary line
+    budget = MAX_DETAILS_LENGTH - len(header) - 40
+    lines: list[str] = [header]
+    for entry in entries:
+        line = f"• {entry.summary}"
+        budget -= len(line) + 1
+        if budget < 0:
+            break
+        lines.append(line)
+
+    listed = len(lines) - 1
+    if listed < len(entries):
+        lines.append(f"…and {len(entries) - listed} more")
+    return "\n".join(lines)
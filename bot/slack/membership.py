@@ -0,0 +1,82 @@
+"""
+Contains the `MembershipCache` class, which remembers the channels that the bot is a member of.
+"""
+
+from typing import Optional
+
+from slack.web.client import WebClient
+
+from ..utils.ttl_cache import MISSING, TTLCache
+
+
+class MembershipCache:
+    """
+    Caches whether the bot is a member of each channel, for `ttl` seconds.
+    Misses are filled by paging through `conversations.members`, and entries are kept fresh by Slack events.
+
+    :param client: Slack client used to look up channel members.
+    :param bot_id: Member id of the bot.
+    :param ttl: Number of seconds for which a looked-up membership is reused.
+    :param max_channels: Maximum number of channels kept in the cache.
+    """
+
+    PAGE_SIZE = 200
+
+    def __init__(
+        self,
+        client: Optional[WebClient],
+        bot_id: str,
+        ttl: float = 60 * 60,
+        max_channels: int = 10000,
+    ):
+        self.client = client
+        self.bot_id = bot_id
+        self.fetches = 0
+        # channel id → whether the bot is a member
+        self._channels = TTLCache(ttl, max_channels)
+
+    def is_member(self, channel: str) -> bool:
+        """
+        Checks whether the bot is a member of the passed channel, using the cache when possible.
+        :param channel: Id of the channel, without the team id prefix.
+        :return: Whether the bot is a member.
+        :raises SlackApiError: If the members of the channel couldn't be fetched.
+        """
+        is_member = self._channels.get(channel)
+        if is_member is not MISSING:
+            return is_member
+        # Events received while fetching are more recent than the fetched members
+        generation = self._channels.generation
+
+        is_member = self._fetch(channel)
+        self._channels.set(channel, is_member, generation)
+        return is_member
+
+    def set_member(self, channel: str, is_member: bool):
+        """
+        Records the bot's membership of a channel, e.g. after it was invited to or removed from it.
+        :param channel: Id of the channel, without the team id prefix.
+        :param is_member: Whether the bot is a member.
+        """
+        # Popping first keeps fetches that started before the event from overwriting it
+        self._channels.pop(channel)
+        self._channels.set(channel, is_member)
+
+    def _fetch(self, channel: str) -> bool:
+        """
+        Pages through the members of a channel, stopping as soon as the bot is found.
+        """
+        self.fetches += 1
+        cursor = None
+        while True:
+            response = self.client.conversations_members(
+                channel=channel,
+                cursor=cursor,
+                limit=MembershipCache.PAGE_SIZE,
+            )
+            if self.bot_id in response["members"]:
+                return True
+            cursor = (response.get("response_metadata")
+                      or {}).get("next_cursor")
+            if not cursor:
+                return False
@@ -2,119 +2,208 @@
 Contains the `Messenger` class, which sends Slack messages according to GitHub events.
 """
 
-from slack.web.client import WebClient
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
+
+import sentry_sdk
+from slack.errors import SlackApiError
+from slack.web.slack_response import SlackResponse
 
 from ..models.github import EventType
 from ..models.github.event import GitHubEvent
+from ..utils.structured_log import log_event
 from .base import SlackBotBase
+from .digest import Digest
+from .outbox import Outbox
+from .payload import SlackPayload
+from .rate_limit import RateLimiter
+from .renderers import render
 
 
 class Messenger(SlackBotBase):
     """
     Sends Slack messages according to received GitHub events.
+
+    :param token: Slack bot token.
+    :param outbox_workers: Number of threads draining the durable outbox. If 0, messages are sent directly.
+    :param rate_limiter: Scheduler keeping posts within Slack's rate limits.
+    :param fanout_workers: Maximum number of channels that are sent to concurrently.
+    :param digests: Whether to run the scheduler of digest subscriptions.
     """
 
-    def __init__(self, token):
+    MAX_RATE_LIMITED_RETRIES = 3
+
+    outbox: Optional[Outbox]
+    digest: Optional[Digest]
+    rate_limiter: RateLimiter
+    fanout_executor: Optional[ThreadPoolExecutor]
+
+    def __init__(
+        self,
+        token,
+        outbox_workers: int = 0,
+        rate_limiter: Optional[RateLimiter] = None,
+        fanout_workers: int = 1,
+        digests: bool = True,
+    ):
         SlackBotBase.__init__(self, token)
+        self._init_messenger(outbox_workers, rate_limiter, fanout_workers,
+                             digests)
+
+    def _init_messenger(
+        self,
+        outbox_workers: int,
+        rate_limiter: Optional[RateLimiter],
+        fanout_workers: int,
+        digests: bool,
+    ):
+        """
+        Sets the attributes specific to `Messenger`, on a bot whose `SlackBotBase` attributes are already set.
+        """
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.fanout_executor = None
+        if fanout_workers > 1:
+            self.fanout_executor = ThreadPoolExecutor(
+                max_workers=fanout_workers,
+                thread_name_prefix="fanout",
+            )
+        self.outbox = None
+        if outbox_workers > 0:
+            self.outbox = Outbox(
+                send_message=self.send_main_message,
+                send_reply=self.send_thread_reply,
+                workers=outbox_workers,
+            )
+        self.digest = None
+        if digests:
+            self.digest = Digest(send=self.deliver)
 
     def inform(self, event: GitHubEvent):
         """
         Notify the subscribed channels about the passed event.
+        Channels subscribed in digest mode only get the event buffered for their next digest.
+        If the outbox is enabled, the messages are only saved here and posted by its sender threads.
+        Otherwise, channels are sent to concurrently, but each channel still gets its main message before the details.
         :param event: `GitHubEvent` containing all relevant data about the event.
         """
         message, details = Messenger.compose_message(event)
-        correct_channels: list[str] = self.calculate_channels(
+        correct_channels: tuple[str, ...] = self.calculate_channels(
             repository=event.repo.name,
             event_type=event.type,
         )
-        for channel in correct_channels:
-            self.send_message(channel, message, details)
+        digest_channels = self.storage.get_digest_channels(
+            repository=event.repo.name,
+            event_type=event.type,
+        )
+        if self.digest is not None and len(digest_channels) != 0:
+            self.digest.add(event, message, digest_channels)
+
+        log_event(
+            logging.INFO,
+            "event_received",
+            sample_key=event.type.name,
+            type=event.type.name,
+            repo=event.repo.name,
+            channels=len(correct_channels),
+            digest_channels=len(digest_channels),
+        )
+
+        if self.outbox is not None:
+            self.outbox.add([(channel, message, details)
+                             for channel in correct_channels])
+            return
+
+        payload = SlackPayload.render(message, details)
+        if self.fanout_executor is None or len(correct_channels) < 2:
+            self.send_sequentially(correct_channels, payload)
+            return
+
+        futures = []
+        for index, channel in enumerate(correct_channels):
+            try:
+                futures.append(
+                    self.fanout_executor.submit(
+                        self.send_payload,
+                        channel,
+                        payload,
+                    ))
+            except RuntimeError:
+                # The executor was shut down, e.g. while held pushes are flushed at exit
+                self.send_sequentially(correct_channels[index:], payload)
+                break
+        for future in futures:
+            try:
+                future.result()
+            except SlackApiError as e:
+                sentry_sdk.capture_exception(e)
+
+    def send_sequentially(
+        self,
+        channels: tuple[str, ...],
+        payload: SlackPayload,
+    ):
+        """
+        Sends a rendered message to the passed channels one after the other, on the calling thread.
+        Failures are reported to Sentry, without stopping the remaining channels.
+        :param channels: Channels to send the message to.
+        :param payload: Rendered message and optionally, details.
+        """
+        for channel in channels:
+            try:
+                self.send_payload(channel, payload)
+            except SlackApiError as e:
+                sentry_sdk.capture_exception(e)
+
+    def discard_digest(self, channel: str, repository: str):
+        """
+        Drops the events of a repository buffered for a channel's digest.
+        :param channel: Name of the channel, including the team id prefix.
+        :param repository: Name of the repository.
+        """
+        if self.digest is not None:
+            self.digest.discard(channel, repository)
 
     def calculate_channels(
         self,
         repository: str,
         event_type: EventType,
-    ) -> list[str]:
+    ) -> tuple[str, ...]:
         """
         Determines the Slack channels that need to be notified about the passed event.
 
         :param repository: Name of the repository that the event was triggered in.
         :param event_type: Enum-ized type of event.
 
-        :return: List of names of channels that are subscribed to the repo+event_type.
+        :return: Names of channels that are subscribed to the repo+event_type, and receive events right away.
         """
 
-        correct_channels: list[str] = [
-            subscription.channel
-            for subscription in self.storage.get_subscriptions(
-                repository=repository) if event_type in subscription.events
-        ]
-        return correct_channels
+        return self.storage.get_channels(
+            repository=repository,
+            event_type=event_type,
+        )
 
     @staticmethod
     def compose_message(event: GitHubEvent) -> tuple[str, str | None]:
         """
         Create message and details strings according to the type of event triggered.
+        The renderer is looked up in `bot.slack.renderers.RENDERERS`, which operators may override.
         :param event: `GitHubEvent` containing all relevant data about the event.
         :return: `tuple` containing the main message and optionally, extra details.
         """
-        message: str = ""
-        details: str | None = None
-
-        if event.type == EventType.BRANCH_CREATED:
-            message = f"Branch created by {event.user}: `{event.ref}`"
-        elif event.type == EventType.BRANCH_DELETED:
-            message = f"Branch deleted by {event.user}: `{event.ref}`"
-        elif event.type == EventType.COMMIT_COMMENT:
-            message = f"<{event.links[0].url}|Comment on `{event.commits[0].sha}`> by {event.user}\n>{event.comments[0]}"
-        elif event.type == EventType.FORK:
-            message = f"<{event.links[0].url}|Repository forked> by {event.user}"
-        elif event.type == EventType.ISSUE_OPENED:
-            message = f"Issue opened by {event.user}:\n>{event.issue}"
-        elif event.type == EventType.ISSUE_CLOSED:
-            message = f"Issue closed by {event.user}:\n>{event.issue}"
-        elif event.type == EventType.ISSUE_COMMENT:
-            type_of_discussion = "Issue" if "issue" in event.issue.link else "PR"
-            message = f"<{event.links[0].url}|Comment on {type_of_discussion} #{event.issue.number}> by {event.user}\n>{event.comments[0]}"
-        elif event.type == EventType.PULL_CLOSED:
-            message = f"PR closed by {event.user}:\n>{event.pull_request}"
-        elif event.type == EventType.PULL_MERGED:
-            message = f"PR merged by {event.user}:\n>{event.pull_request}"
-        elif event.type == EventType.PULL_OPENED:
-            message = f"PR opened by {event.user}:\n>{event.pull_request}"
-        elif event.type == EventType.PULL_READY:
-            message = (
-                f"Review requested on {event.pull_request}\n"
-                f">Reviewers: {', '.join(str(reviewer) for reviewer in event.reviewers)}"
-            )
-        elif event.type == EventType.PUSH:
-            message = f"{event.user} pushed to `{event.ref}`, "
-            if len(event.commits) == 1:
-                message += "1 new commit."
-            else:
-                message += f"{len(event.commits)} new commits."
-            details = "\n".join(f"• {commit.message}"
-                                for commit in event.commits)
-        elif event.type == EventType.RELEASE:
-            message = f"Release {event.status} by {event.user}: `{event.ref}`"
-        elif event.type == EventType.REVIEW:
-            message = (
-                f"Review on <{event.pull_request.link}|#{event.pull_request.number}> "
-                f"by {event.reviewers[0]}:\n>Status: "
-                f"{'Approved' if event.status == 'approved' else 'Changed requested'}"
-            )
-        elif event.type == EventType.REVIEW_COMMENT:
-            message = f"<{event.links[0].url}|Comment on PR #{event.pull_request.number}> by {event.user}\n>{event.comments[0]}"
-        elif event.type == EventType.STAR_ADDED:
-            message = f"`{event.repo.name}` received a star from `{event.user}`."
-        elif event.type == EventType.STAR_REMOVED:
-            message = f"`{event.repo.name}` lost a star from `{event.user}`."
-        elif event.type == EventType.TAG_CREATED:
-            message = f"Tag created by {event.user}: `{event.ref}`"
-        elif event.type == EventType.TAG_DELETED:
-            message = f"Tag deleted by {event.user}: `{event.ref}`"
-
-        return message, details
+        return render(event)
+
+    def deliver(self, channel: str, message: str, details: str | None):
+        """
+        Hands one message over to the outbox if it is enabled, or sends it right away otherwise.
+        :param channel: Channel to send the message to.
+        :param message: Main message text.
+        :param details: Text to be sent as a reply to the main message, if any.
+        """
+        if self.outbox is not None:
+            self.outbox.add([(channel, message, details)])
+        else:
+            self.send_message(channel, message, details)
 
     def send_message(self, channel: str, message: str, details: str | None):
         """
@@ -124,50 +213,74 @@ class Messenger(SlackBotBase):
         :param message: Main message, briefly summarizing the event.
         :param details: Text to be sent as a reply to the main message. Verbose stuff goes here.
         """
-        print(
-            f"\n\nSENDING:\n{message}\n\nWITH DETAILS:\n{details}\n\nTO: {channel}"
+        self.send_payload(channel, SlackPayload.render(message, details))
+
+    def send_payload(self, channel: str, payload: SlackPayload):
+        """
+        Sends an already rendered message to the passed channel.
+        Only the channel and thread fields are added per call, the serialized blocks are shared.
+        :param channel: Channel to send the message to.
+        :param payload: Rendered message and optionally, details.
+        """
+        log_event(
+            logging.DEBUG,
+            "sending_message",
+            channel=channel,
+            message=payload.message,
+            details=payload.details,
         )
 
-        # Strip the team id prefix
-        channel = channel[channel.index('#') + 1:]
-
-        if details is None:
-            self.client.chat_postMessage(
-                channel=channel,
-                blocks=[{
-                    "type": "section",
-                    "text": {
-                        "type": "mrkdwn",
-                        "text": message,
-                    },
-                }],
-                unfurl_links=False,
-                unfurl_media=False,
-            )
-        else:
-            response = self.client.chat_postMessage(
-                channel=channel,
-                blocks=[{
-                    "type": "section",
-                    "text": {
-                        "type": "mrkdwn",
-                        "text": message,
-                    },
-                }],
-                unfurl_links=False,
-                unfurl_media=False,
-            )
-            message_id = response.data["ts"]
-            self.client.chat_postMessage(
-                channel=channel,
-                blocks=[{
-                    "type": "section",
-                    "text": {
-                        "type": "mrkdwn",
-                        "text": details,
-                    },
-                }],
-                thread_ts=message_id,
-                unfurl_links=False,
-                unfurl_media=False,
-            )
+        message_ts = self.send_main_message(channel, payload.message_blocks)
+        if payload.details_blocks is not None:
+            self.send_thread_reply(channel, payload.details_blocks, message_ts)
+
+    def send_main_message(self, channel: str, blocks: str) -> str:
+        """
+        Posts a main message to the passed channel.
+        :param channel: Channel to send the message to, including the team id prefix.
+        :param blocks: Serialized blocks of the message.
+        :return: Timestamp ("ts") of the posted message, which identifies its thread.
+        """
+        response = self.post_message(
+            channel=channel[channel.index('#') + 1:],
+            blocks=blocks,
+            unfurl_links=False,
+            unfurl_media=False,
+        )
+        return response.data["ts"]
+
+    def send_thread_reply(self, channel: str, blocks: str, thread_ts: str):
+        """
+        Posts a reply in the thread of an already posted message.
+        :param channel: Channel of the message, including the team id prefix.
+        :param blocks: Serialized blocks of the reply.
+        :param thread_ts: Timestamp ("ts") of the message to reply to.
+        """
+        self.post_message(
+            channel=channel[channel.index('#') + 1:],
+            blocks=blocks,
+            thread_ts=thread_ts,
+            unfurl_links=False,
+            unfurl_media=False,
+        )
+
+    def post_message(self, channel: str, **kwargs: Any) -> SlackResponse:
+        """
+        Posts a message once the rate limiter allows it.
+        If Slack still rate-limits the post, the channel is paused for the `Retry-After` period and the post is retried.
+        :param channel: Id of the channel to post to.
+        :param kwargs: Arguments for `chat.postMessage`.
+        :return: Response from Slack.
+        """
+        for attempt in range(Messenger.MAX_RATE_LIMITED_RETRIES + 1):
+            self.rate_limiter.wait(channel)
+            try:
+                return self.client.chat_postMessage(channel=channel, **kwargs)
+            except SlackApiError as e:
+                if ((e.response.status_code != 429)
+                        or (attempt == Messenger.MAX_RATE_LIMITED_RETRIES)):
+                    raise
+                headers = e.response.headers
+                retry_after = headers.get("Retry-After",
+                                          headers.get("retry-after", 1))
+                self.rate_limiter.pause(channel, float(retry_after))
@@ -0,0 +1,178 @@
+"""
+Contains the `Outbox` class, which drains persisted Slack deliveries on background sender threads.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Callable
+
+import sentry_sdk
+
+from ..storage.outbox import OutboxStorage
+from ..utils.structured_log import log_event
+from .payload import serialize_blocks
+
+
+class Outbox:
+    """
+    Durable queue of Slack deliveries. Deliveries are saved to `OutboxStorage` first,
+    then posted by sender threads, so that nothing is lost across restarts or Slack outages.
+    Once a delivery's main message is posted, its timestamp is saved, so a retry only posts the details.
+
+    :param send_message: Function that posts a main message from (channel, blocks), returning its timestamp.
+    :param send_reply: Function that posts a thread reply from (channel, blocks, thread timestamp).
+    :param workers: Number of sender threads.
+    :param max_attempts: Number of failed attempts after which a delivery is given up on.
+    :param batch_size: Number of deliveries each sender claims at once.
+    """
+
+    LEASE = 60
+    POLL_INTERVAL = 1
+    RETRY_BASE = 2
+    RETRY_CAP = 15 * 60
+
+    def __init__(
+        self,
+        send_message: Callable[[str, str], str],
+        send_reply: Callable[[str, str, str], Any],
+        workers: int,
+        max_attempts: int = 10,
+        batch_size: int = 10,
+    ):
+        self.storage = OutboxStorage()
+        self.send_message = send_message
+        self.send_reply = send_reply
+        self.max_attempts = max_attempts
+        self.batch_size = batch_size
+
+        self.sent = 0
+        self.retried = 0
+        self.given_up = 0
+        self._recent_sends: deque[float] = deque()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+
+        self.threads = [
+            threading.Thread(
+                target=self._drain,
+                name=f"outbox-{i}",
+                daemon=True,
+            ) for i in range(workers)
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    def add(self, deliveries: list[tuple[str, str, str | None]]):
+        """
+        Persists deliveries and wakes up the sender threads.
+        :param deliveries: `list` of (channel, message, details) tuples.
+        """
+        self.storage.add_deliveries(deliveries)
+        self._wake.set()
+
+    def stats(self) -> dict[str, float | int]:
+        """
+        Snapshot of the outbox's state.
+        :return: `dict` containing stored-delivery stats, send/retry counters and the drain rate over the last minute.
+        """
+        stats = self.storage.get_stats()
+        with self._lock:
+            self._forget_old_sends(time.time())
+            stats.update({
+                "sent": self.sent,
+                "retried": self.retried,
+                "given_up": self.given_up,
+                "drain_rate_per_minute": len(self._recent_sends),
+            })
+        return stats
+
+    def _drain(self):
+        while True:
+            try:
+                deliveries = self.storage.claim_deliveries(
+                    limit=self.batch_size,
+                    lease=Outbox.LEASE,
+                )
+            except Exception as e:
+                sentry_sdk.capture_exception(e)
+                deliveries = ()
+
+            if len(deliveries) == 0:
+                self._wake.wait(Outbox.POLL_INTERVAL)
+                self._wake.clear()
+                continue
+
+            for delivery in deliveries:
+                try:
+                    self._attempt(delivery)
+                except Exception as e:
+                    # Storage failures leave the delivery leased, so it is retried once the lease runs out
+                    sentry_sdk.capture_exception(e)
+
+    def _attempt(self, delivery):
+        log_event(
+            logging.DEBUG,
+            "sending_message",
+            channel=delivery.channel,
+            message=delivery.message,
+            details=delivery.details,
+            attempts=delivery.attempts,
+        )
+        try:
+            thread_ts = delivery.thread_ts
+            if thread_ts is None:
+                thread_ts = self.send_message(
+                    delivery.channel,
+                    serialize_blocks(delivery.message),
+                )
+                if delivery.details is not None:
+                    # Saved before posting the details, so that a retry doesn't post the main message again
+                    self.storage.set_thread_ts(delivery.id, thread_ts)
+            if delivery.details is not None:
+                self.send_reply(
+                    delivery.channel,
+                    serialize_blocks(delivery.details),
+                    thread_ts,
+                )
+        except Exception as e:
+            self._reschedule(delivery, e)
+            return
+
+        self.storage.remove_delivery(delivery.id)
+        now = time.time()
+        with self._lock:
+            self.sent += 1
+            self._recent_sends.append(now)
+            self._forget_old_sends(now)
+
+    def _reschedule(self, delivery, error: Exception):
+        attempts = delivery.attempts + 1
+        retry_at = None
+        if attempts < self.max_attempts:
+            retry_at = time.time() + min(
+                Outbox.RETRY_BASE**attempts,
+                Outbox.RETRY_CAP,
+            )
+        else:
+            sentry_sdk.capture_message(f"Gave up on Slack delivery\n"
+                                       f"Channel: {delivery.channel}\n"
+                                       f"Attempts: {attempts}\n"
+                                       f"Error: {error}")
+
+        self.storage.reschedule_delivery(
+            delivery_id=delivery.id,
+            attempts=attempts,
+            retry_at=retry_at,
+            error=repr(error),
+        )
+        with self._lock:
+            if retry_at is None:
+                self.given_up += 1
+            else:
+                self.retried += 1
+
+    def _forget_old_sends(self, now: float):
+        while self._recent_sends and self._recent_sends[0] < now - 60:
+            self._recent_sends.popleft()
@@ -0,0 +1,56 @@
+"""
+Contains the `SlackPayload` class, which holds a rendered message ready to be posted to any number of channels.
+"""
+
+import json
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True, slots=True)
+class SlackPayload:
+    """
+    Rendered message and details, with their Slack blocks serialized once, to be reused for every channel.
+    Slack accepts `blocks` as a JSON-encoded string, so the client doesn't re-serialize them per post.
+
+    :param message: Main message text.
+    :param details: Text to be sent as a reply to the main message, if any.
+    :param message_blocks: Serialized blocks of the main message.
+    :param details_blocks: Serialized blocks of the details, if any.
+    """
+
+    message: str
+    details: Optional[str]
+    message_blocks: str
+    details_blocks: Optional[str]
+
+    @staticmethod
+    def render(message: str, details: Optional[str]) -> "SlackPayload":
+        """
+        Serializes the blocks of a message and its details.
+        :param message: Main message text.
+        :param details: Text to be sent as a reply to the main message, if any.
+        :return: `SlackPayload` that can be posted to any channel.
+        """
+        return SlackPayload(
+            message=message,
+            details=details,
+            message_blocks=serialize_blocks(message),
+            details_blocks=None
+            if details is None else serialize_blocks(details),
+        )
+
+
+def serialize_blocks(text: str) -> str:
+    """
+    Helper function to wrap text in a single mrkdwn section block
+    :param text: Slack mrkdwn text.
+    :return: JSON-encoded list of blocks.
+    """
+    return json.dumps([{
+        "type": "section",
+        "text": {
+            "type": "mrkdwn",
+            "text": text,
+        },
+    }])
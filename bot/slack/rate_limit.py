@@ -0,0 +1,121 @@
+"""
+Contains the `RateLimiter` and `TokenBucket` classes, to keep message posting within Slack's rate limits.
+"""
+
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Token bucket that hands out reservations instead of refusing requests.
+    Tokens may go negative, in which case the returned delay is how long the caller has to wait for its turn.
+
+    :param rate: Number of tokens added per second.
+    :param capacity: Maximum number of tokens, i.e. the allowed burst.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def reserve(self, now: float) -> float:
+        """
+        Takes one token.
+        :param now: Current `time.monotonic()` value.
+        :return: Number of seconds to wait before the reserved token is actually available.
+        """
+        self.refill(now)
+        self.tokens -= 1
+        if self.tokens >= 0:
+            return 0
+        return -self.tokens / self.rate
+
+    def pause(self, now: float, seconds: float):
+        """
+        Holds back the next reservation for `seconds`. Later ones follow at the bucket's rate, instead of all at once.
+        :param now: Current `time.monotonic()` value.
+        :param seconds: Number of seconds to wait before handing out the next token.
+        """
+        self.refill(now)
+        # The next reservation leaves the bucket at `-seconds * rate` tokens, i.e. waits for `seconds`
+        self.tokens = min(self.tokens, 1 - seconds * self.rate)
+
+    def refill(self, now: float):
+        """
+        Adds the tokens accumulated since the last update.
+        :param now: Current `time.monotonic()` value.
+        """
+        self.tokens = min(
+            self.capacity,
+            self.tokens + max(now - self.updated, 0) * self.rate,
+        )
+        self.updated = max(now, self.updated)
+
+
+class RateLimiter:
+    """
+    Schedules Slack posts using a token bucket per channel plus a global, workspace-wide bucket.
+    Channels that were rate-limited by Slack are paused for the duration of the `Retry-After` header,
+    after which their queued posts resume at `channel_rate`.
+
+    :param channel_rate: Messages allowed per second in each channel.
+    :param global_rate: Messages allowed per second in the whole workspace.
+    :param global_burst: Number of messages that may be sent at once across the workspace.
+    """
+
+    def __init__(
+        self,
+        channel_rate: float = 1,
+        global_rate: float = 10,
+        global_burst: float = 20,
+    ):
+        self.channel_rate = channel_rate
+        self.channel_buckets: dict[str, TokenBucket] = {}
+        self.global_bucket = TokenBucket(global_rate, global_burst)
+        self._lock = threading.Lock()
+
+    def delay(self, channel: str) -> float:
+        """
+        Reserves a slot for posting one message to the passed channel.
+        :param channel: Channel that the message will be posted to.
+        :return: Number of seconds to wait before posting.
+        """
+        with self._lock:
+            now = time.monotonic()
+            return max(
+                self.channel_bucket(channel).reserve(now),
+                self.global_bucket.reserve(now),
+            )
+
+    def channel_bucket(self, channel: str) -> TokenBucket:
+        """
+        Looks up the bucket of the passed channel, creating it on first use. Must be called with the lock held.
+        :param channel: Channel that messages are posted to.
+        :return: The channel's `TokenBucket`.
+        """
+        bucket = self.channel_buckets.get(channel)
+        if bucket is None:
+            bucket = self.channel_buckets[channel] = TokenBucket(
+                self.channel_rate, 1)
+        return bucket
+
+    def wait(self, channel: str):
+        """
+        Blocks until a message may be posted to the passed channel.
+        :param channel: Channel that the message will be posted to.
+        """
+        delay = self.delay(channel)
+        if delay > 0:
+            time.sleep(delay)
+
+    def pause(self, channel: str, retry_after: float):
+        """
+        Stops posting to the passed channel, after Slack responded with "429 Too Many Requests".
+        :param channel: Channel that was rate-limited.
+        :param retry_after: Value of the `Retry-After` header, in seconds.
+        """
+        with self._lock:
+            self.channel_bucket(channel).pause(time.monotonic(), retry_after)
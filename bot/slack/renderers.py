@@ -0,0 +1,328 @@
+"""
+Contains the registry of message renderers, which turn each type of `GitHubEvent` into Slack message text.
+
+Renderers are looked up by `EventType`. The default ones can be overridden with operator-defined templates,
+which are validated and compiled once, by `load_templates`.
+"""
+
+import json
+from string import Formatter
+from typing import Any, Callable, Optional
+
+from ..models.github import Commit, EventType
+from ..models.github.event import GitHubEvent, count_commits
+
+Renderer = Callable[[GitHubEvent], tuple[str, Optional[str]]]
+
+RENDERERS: dict[EventType, Renderer] = {}
+# ^ Renderer used for each type of event
+
+MAX_DETAILS_LENGTH = 3000
+# ^ Slack rejects section blocks with longer text
+
+
+def renders(event_type: EventType) -> Callable[[Renderer], Renderer]:
+    """
+    Decorator that registers the default renderer of an event type.
+    :param event_type: Type of the events rendered by the decorated function.
+    """
+
+    def register(renderer: Renderer) -> Renderer:
+        RENDERERS[event_type] = renderer
+        return renderer
+
+    return register
+
+
+def render(event: GitHubEvent) -> tuple[str, Optional[str]]:
+    """
+    Create message and details strings according to the type of the passed event.
+    :param event: `GitHubEvent` containing all relevant data about the event.
+    :return: `tuple` containing the main message and optionally, extra details.
+    """
+    return RENDERERS[event.type](event)
+
+
+def summarize_commits(commits: tuple[Commit, ...], commit_count: int) -> str:
+    """
+    Lists the passed commits, stopping before the text gets too long for a single Slack block.
+    :param commits: Commits to list, possibly only the first ones of the push.
+    :param commit_count: Total number of commits in the push.
+    :return: One line per listed commit, followed by a count of the ones left out.
+    """
+    # Leave room for the summary line
+    budget = MAX_DETAILS_LENGTH - 40
+    lines: list[str] = []
+    for commit in commits:
+        line = f"• {commit.message}"
+        budget -= len(line) + 1
+        if budget < 0:
+            break
+        lines.append(line)
+
+    if len(lines) < commit_count:
+        lines.append(f"…and {commit_count - len(lines)} more")
+    return "\n".join(lines)
+
+
+# Default renderers:
+@renders(EventType.BRANCH_CREATED)
+def render_branch_created(event: GitHubEvent):
+    return f"Branch created by {event.user}: `{event.ref}`", None
+
+
+@renders(EventType.BRANCH_DELETED)
+def render_branch_deleted(event: GitHubEvent):
+    return f"Branch deleted by {event.user}: `{event.ref}`", None
+
+
+@renders(EventType.COMMIT_COMMENT)
+def render_commit_comment(event: GitHubEvent):
+    return f"<{event.links[0].url}|Comment on `{event.commits[0].sha}`> by {event.user}\n>{event.comments[0]}", None
+
+
+@renders(EventType.FORK)
+def render_fork(event: GitHubEvent):
+    return f"<{event.links[0].url}|Repository forked> by {event.user}", None
+
+
+@renders(EventType.ISSUE_OPENED)
+def render_issue_opened(event: GitHubEvent):
+    return f"Issue opened by {event.user}:\n>{event.issue}", None
+
+
+@renders(EventType.ISSUE_CLOSED)
+def render_issue_closed(event: GitHubEvent):
+    return f"Issue closed by {event.user}:\n>{event.issue}", None
+
+
+@renders(EventType.ISSUE_COMMENT)
+def render_issue_comment(event: GitHubEvent):
+    type_of_discussion = "Issue" if "issue" in event.issue.link else "PR"
+    return f"<{event.links[0].url}|Comment on {type_of_discussion} #{event.issue.number}> by {event.user}\n>{event.comments[0]}", None
+
+
+@renders(EventType.PULL_CLOSED)
+def render_pull_closed(event: GitHubEvent):
+    return f"PR closed by {event.user}:\n>{event.pull_request}", None
+
+
+@renders(EventType.PULL_MERGED)
+def render_pull_merged(event: GitHubEvent):
+    return f"PR merged by {event.user}:\n>{event.pull_request}", None
+
+
+@renders(EventType.PULL_OPENED)
+def render_pull_opened(event: GitHubEvent):
+    return f"PR opened by {event.user}:\n>{event.pull_request}", None
+
+
+@renders(EventType.PULL_READY)
+def render_pull_ready(event: GitHubEvent):
+    return (
+        f"Review requested on {event.pull_request}\n"
+        f">Reviewers: {', '.join(str(reviewer) for reviewer in event.reviewers)}"
+    ), None
+
+
+@renders(EventType.PUSH)
+def render_push(event: GitHubEvent):
+    commit_count = count_commits(event)
+    message = f"{event.user} pushed to `{event.ref}`, "
+    if commit_count == 1:
+        message += "1 new commit."
+    else:
+        message += f"{commit_count} new commits."
+    return message, summarize_commits(event.commits, commit_count)
+
+
+@renders(EventType.RELEASE)
+def render_release(event: GitHubEvent):
+    return f"Release {event.status} by {event.user}: `{event.ref}`", None
+
+
+@renders(EventType.REVIEW)
+def render_review(event: GitHubEvent):
+    return (
+        f"Review on <{event.pull_request.link}|#{event.pull_request.number}> "
+        f"by {event.reviewers[0]}:\n>Status: "
+        f"{'Approved' if event.status == 'approved' else 'Changed requested'}"
+    ), None
+
+
+@renders(EventType.REVIEW_COMMENT)
+def render_review_comment(event: GitHubEvent):
+    return f"<{event.links[0].url}|Comment on PR #{event.pull_request.number}> by {event.user}\n>{event.comments[0]}", None
+
+
+@renders(EventType.STAR_ADDED)
+def render_star_added(event: GitHubEvent):
+    return f"`{event.repo.name}` received a star from `{event.user}`.", None
+
+
+@renders(EventType.STAR_REMOVED)
+def render_star_removed(event: GitHubEvent):
+    return f"`{event.repo.name}` lost a star from `{event.user}`.", None
+
+
+@renders(EventType.TAG_CREATED)
+def render_tag_created(event: GitHubEvent):
+    return f"Tag created by {event.user}: `{event.ref}`", None
+
+
+@renders(EventType.TAG_DELETED)
+def render_tag_deleted(event: GitHubEvent):
+    return f"Tag deleted by {event.user}: `{event.ref}`", None
+
+
+# Template variables, available to operator-defined templates:
+def _first(values: Optional[tuple]) -> Any:
+    return values[0] if values else None
+
+
+def _number(event: GitHubEvent) -> Optional[int]:
+    item = event.issue or event.pull_request
+    return None if item is None else item.number
+
+
+def _title(event: GitHubEvent) -> Optional[str]:
+    item = event.issue or event.pull_request
+    return None if item is None else item.title
+
+
+def _link(event: GitHubEvent) -> Optional[str]:
+    link = _first(event.links)
+    return None if link is None else link.url
+
+
+def _sha(event: GitHubEvent) -> Optional[str]:
+    commit = _first(event.commits)
+    return None if commit is None else commit.sha
+
+
+def _reviewers(event: GitHubEvent) -> Optional[str]:
+    if event.reviewers is None:
+        return None
+    return ", ".join(str(reviewer) for reviewer in event.reviewers)
+
+
+def _commits(event: GitHubEvent) -> Optional[str]:
+    if event.commits is None:
+        return None
+    return summarize_commits(event.commits, count_commits(event))
+
+
+TEMPLATE_VARIABLES: dict[str, Callable[[GitHubEvent], Any]] = {
+    "user": lambda event: event.user,
+    "ref": lambda event: event.ref,
+    "repo": lambda event: event.repo,
+    "repo_name": lambda event: event.repo.name,
+    "issue": lambda event: event.issue,
+    "pull_request": lambda event: event.pull_request,
+    "number": _number,
+    "title": _title,
+    "status": lambda event: event.status,
+    "link": _link,
+    "comment": lambda event: _first(event.comments),
+    "sha": _sha,
+    "reviewers": _reviewers,
+    "commit_count": lambda event: event.commit_count,
+    "commits": _commits,
+}
+# ^ Variables that can be used in templates, e.g. "PR opened by {user}: {pull_request}"
+
+
+def compile_template(template: str) -> Callable[[GitHubEvent], str]:
+    """
+    Parses a `str.format`-style template once, into a function that renders it.
+    Variables that don't apply to an event are rendered as empty strings.
+    Values are formatted as text, so only string format specs (alignment, width, precision) are accepted.
+    :param template: Template text, using the names in `TEMPLATE_VARIABLES` as fields.
+    :return: Function that renders the template for the passed event.
+    :raises ValueError: If the template is malformed or uses an unknown variable.
+    """
+    segments: list[tuple[str, Optional[Callable[[GitHubEvent], Any]],
+                         str]] = []
+    for literal, name, format_spec, conversion in Formatter().parse(template):
+        if name is None:
+            segments.append((literal, None, ""))
+            continue
+        if name not in TEMPLATE_VARIABLES:
+            raise ValueError(f"Unknown template variable '{name}'")
+        if conversion is not None:
+            raise ValueError(
+                f"Conversions aren't supported: '{name}!{conversion}'")
+        if "{" in format_spec:
+            raise ValueError(
+                f"Nested fields aren't supported: '{name}:{format_spec}'")
+        try:
+            format("", format_spec)
+        except ValueError as e:
+            raise ValueError(
+                f"Invalid format spec '{name}:{format_spec}': {e}") from e
+        segments.append((literal, TEMPLATE_VARIABLES[name], format_spec))
+
+    def render_template(event: GitHubEvent) -> str:
+        parts: list[str] = []
+        for literal, variable, format_spec in segments:
+            parts.append(literal)
+            if variable is not None:
+                value = variable(event)
+                parts.append(
+                    format("" if value is None else str(value), format_spec))
+        return "".join(parts)
+
+    return render_template
+
+
+def compile_renderer(message: str, details: Optional[str] = None) -> Renderer:
+    """
+    Compiles an operator-defined template into a renderer.
+    :param message: Template of the main message.
+    :param details: Template of the text posted in a thread under the main message. `None` for no thread.
+    :return: Renderer that can be registered in `RENDERERS`.
+    :raises ValueError: If either template is invalid.
+    """
+    render_message = compile_template(message)
+    if details is None:
+        return lambda event: (render_message(event), None)
+
+    render_details = compile_template(details)
+    return lambda event: (render_message(event), render_details(event) or None)
+
+
+def load_templates(path: str):
+    """
+    Overrides the default renderers with the templates in a JSON file.
+    All templates are compiled before any of them is registered, so an invalid file changes nothing.
+
+    The file maps `EventType` names to templates, e.g.
+    `{"PULL_OPENED": {"message": "New PR by {user}: {pull_request}"}}`
+
+    :param path: Path to the JSON file.
+    :raises ValueError: If the file contains an unknown event type or an invalid template.
+    """
+    with open(path, encoding="utf-8") as file:
+        templates: dict[str, Any] = json.load(file)
+
+    if not isinstance(templates, dict):
+        raise ValueError("Message templates should be a JSON object")
+
+    renderers: dict[EventType, Renderer] = {}
+    for name, template in templates.items():
+        if name not in EventType.__members__:
+            raise ValueError(
+                f"Unknown event type '{name}' in message templates")
+        if not isinstance(template, dict) or not isinstance(
+                template.get("message"), str) or not isinstance(
+                    template.get("details", ""), str):
+            raise ValueError(
+                f"Template for {name} needs a 'message' string and optionally, a 'details' string"
+            )
+        try:
+            renderers[EventType[name]] = compile_renderer(
+                template["message"], template.get("details"))
+        except ValueError as e:
+            raise ValueError(f"Invalid template for {name}: {e}") from e
+
+    RENDERERS.update(renderers)
@@ -3,28 +3,44 @@ Contains the `Runner` class, which reacts to slash commands.
 """
 import hashlib
 import hmac
+import threading
 import time
 import urllib.parse
 from json import dumps as json_dumps
-from typing import Any
+from typing import Any, Optional
 
-from sentry_sdk import capture_message
+import requests
+from sentry_sdk import capture_exception, capture_message
 from slack.errors import SlackApiError
 from werkzeug.datastructures import Headers, ImmutableMultiDict
 
-from ..models.github import EventType, convert_keywords_to_events
+from ..models.github import (
+    EventType,
+    convert_bitmask_to_events,
+    convert_events_to_bitmask,
+    convert_keywords_to_events,
+)
 from ..utils.json import JSON
 from ..utils.list_manip import intersperse
 from ..utils.log import Logger
 from .base import SlackBotBase
+from .digest import DIGEST_PERIODS
+from .membership import MembershipCache
 from .templates import error_message
 
 
 class Runner(SlackBotBase):
     """
     Reacts to received slash commands.
+
+    Commands can also be run after they were acknowledged, with their response posted to the command's `response_url`.
+    The time taken by every command is recorded, per command name.
+    The bot's channel memberships are cached, and kept up to date by Slack events, see `handle_event`.
     """
 
+    RESPONSE_URL_PREFIX = "https://hooks.slack.com/"
+    RESPONSE_TIMEOUT = 10
+
     logger: Logger
 
     def __init__(
@@ -34,12 +50,30 @@ class Runner(SlackBotBase):
         secret: str,
         token: str,
         bot_id: str,
+        membership_ttl: float = 60 * 60,
+    ):
+        SlackBotBase.__init__(self, token)
+        self._init_runner(logger, base_url, secret, bot_id, membership_ttl)
+
+    def _init_runner(
+        self,
+        logger: Logger,
+        base_url: str,
+        secret: str,
+        bot_id: str,
+        membership_ttl: float,
     ):
-        super(self.__class__, self).__init__(token)
+        """
+        Sets the attributes specific to `Runner`, on a bot whose `SlackBotBase` attributes are already set.
+        """
         self.logger = logger
         self.base_url = base_url
         self.secret = secret.encode("utf-8")
         self.bot_id = bot_id
+        self.memberships = MembershipCache(self.client, bot_id, membership_ttl)
+        # command → [number of runs, total seconds, maximum seconds]
+        self._command_timings: dict[str, list[float]] = {}
+        self._timings_lock = threading.Lock()
 
     def verify(
         self,
@@ -81,6 +115,7 @@ class Runner(SlackBotBase):
         :param raw_json: Slash command data sent by Slack.
         :return: Response to the triggered command, in Slack block format.
         """
+        started_at = time.monotonic()
         json: JSON = JSON.from_multi_dict(raw_json)
         current_channel: str = f"{json['team_id']}#{json['channel_id']}"
         user_id: str = json["user_id"]
@@ -116,8 +151,69 @@ class Runner(SlackBotBase):
         elif command == "/sel-help":
             result = self.run_help_command(args)
 
+        self.record_timing(command, time.monotonic() - started_at)
         return result
 
+    def run_deferred(self, raw_json: ImmutableMultiDict):
+        """
+        Runs a slash command that was already acknowledged, and posts its response to the command's `response_url`.
+        Ephemeral responses replace the acknowledgement. If the command fails, an error is posted instead.
+        :param raw_json: Slash command data sent by Slack.
+        """
+        try:
+            response = self.run(raw_json)
+        except Exception as e:
+            capture_exception(e)
+            response = error_message(
+                "Something went wrong while running this command. "
+                "Please try again later.")
+        if response is None:
+            return
+
+        response_url = raw_json.get("response_url", "")
+        if not response_url.startswith(Runner.RESPONSE_URL_PREFIX):
+            capture_message(f"Unexpected response_url for slash command\n"
+                            f"URL: {response_url}")
+            return
+
+        requests.post(
+            response_url,
+            json={
+                **response,
+                "replace_original":
+                response.get("response_type") == "ephemeral",
+            },
+            timeout=Runner.RESPONSE_TIMEOUT,
+        )
+
+    def record_timing(self, command: str, seconds: float):
+        """
+        Adds one run of a command to its timing stats.
+        :param command: Name of the command, e.g. "/sel-subscribe".
+        :param seconds: Time taken by the run.
+        """
+        with self._timings_lock:
+            timing = self._command_timings.setdefault(command, [0, 0.0, 0.0])
+            timing[0] += 1
+            timing[1] += seconds
+            timing[2] = max(timing[2], seconds)
+
+    def command_stats(self) -> dict[str, dict[str, float]]:
+        """
+        Snapshot of the timing stats of every command run so far.
+        :return: `dict` containing the number of runs, and the mean and maximum time in milliseconds, per command.
+        """
+        with self._timings_lock:
+            return {
+                command: {
+                    "runs": runs,
+                    "mean_ms": total / runs * 1000,
+                    "max_ms": maximum * 1000,
+                }
+                for command, (runs, total,
+                              maximum) in self._command_timings.items()
+            }
+
     def run_subscribe_command(
         self,
         current_channel: str,
@@ -129,7 +225,7 @@ class Runner(SlackBotBase):
 
         :param current_channel: Name of the current channel.
         :param user_id: Slack User-id of the user who entered the command.
-        :param args: `list` of events to subscribe to.
+        :param args: `list` of events to subscribe to, optionally followed by "--digest <period>".
         """
 
         in_channel = self.check_bot_in_channel(current_channel=current_channel)
@@ -143,17 +239,37 @@ class Runner(SlackBotBase):
         if repository.find('/') == -1:
             return self.send_wrong_syntax_message()
 
-        new_events = convert_keywords_to_events(args[1:])
+        keywords = args[1:]
+        digest: Optional[str] = None
+        if "--digest" in keywords:
+            index = keywords.index("--digest")
+            digest = "".join(keywords[index + 1:index + 2]).lower()
+            keywords = keywords[:index] + keywords[index + 2:]
+            if (digest not in DIGEST_PERIODS) and (digest != "off"):
+                return error_message(
+                    f"Unknown digest period `{digest}`. Use one of "
+                    f"{', '.join(f'`{period}`' for period in DIGEST_PERIODS)} "
+                    f"or `off`.")
+
+        new_events = convert_events_to_bitmask(
+            convert_keywords_to_events(keywords))
 
         subscriptions = self.storage.get_subscriptions(channel=current_channel,
                                                        repository=repository)
         if len(subscriptions) == 1:
             new_events |= subscriptions[0].events
+            if digest is None:
+                # Keep the current delivery mode
+                digest = subscriptions[0].digest
+            elif digest == "off" and subscriptions[0].digest is not None:
+                # Events that were waiting for the digest won't be sent anymore
+                self.discard_digest(current_channel, repository)
 
         self.storage.update_subscription(
             channel=current_channel,
             repository=repository,
             events=new_events,
+            digest=None if digest == "off" else digest,
         )
 
         if len(subscriptions) == 0:
@@ -232,17 +348,22 @@ class Runner(SlackBotBase):
             }
 
         if len(subscriptions) == 1:
-            events = subscriptions[0].events
-            updated_events = set(events) - convert_keywords_to_events(
-                (args[1:]))
+            removed_events = convert_events_to_bitmask(
+                convert_keywords_to_events(args[1:]))
+            updated_events = subscriptions[0].events & ~removed_events
 
-            if len(updated_events) == 0:
+            if updated_events == 0:
                 self.storage.remove_subscription(channel=current_channel,
                                                  repository=repository)
+                if subscriptions[0].digest is not None:
+                    self.discard_digest(current_channel, repository)
             else:
-                self.storage.update_subscription(channel=current_channel,
-                                                 repository=repository,
-                                                 events=updated_events)
+                self.storage.update_subscription(
+                    channel=current_channel,
+                    repository=repository,
+                    events=updated_events,
+                    digest=subscriptions[0].digest,
+                )
 
         return self.run_list_command(current_channel, ephemeral=True)
 
@@ -282,13 +403,19 @@ class Runner(SlackBotBase):
         blocks: list[dict[str, Any]] = []
         subscriptions = self.storage.get_subscriptions(channel=current_channel)
         for subscription in subscriptions:
-            events_string = ", ".join(f"`{event.name.lower()}`"
-                                      for event in subscription.events)
+            events_string = ", ".join(
+                f"`{event.name.lower()}`"
+                for event in convert_bitmask_to_events(subscription.events))
+            digest_string = ""
+            if subscription.digest is not None:
+                digest_string = f" _({subscription.digest} digest)_"
             blocks.append({
                 "type": "section",
                 "text": {
-                    "type": "mrkdwn",
-                    "text": f"*{subscription.repository}*\n{events_string}",
+                    "type":
+                    "mrkdwn",
+                    "text":
+                    f"*{subscription.repository}*{digest_string}\n{events_string}",
                 },
             })
         if len(blocks) != 0:
@@ -323,14 +450,36 @@ class Runner(SlackBotBase):
         if len(subscriptions) != 0:
             return True
         try:
-            response = self.client.conversations_members(
-                channel=current_channel)
-            return self.bot_id in response["members"]
+            # Strip the team id prefix
+            channel_id = current_channel[current_channel.index("#") + 1:]
+            return self.memberships.is_member(channel_id)
 
         except SlackApiError as E:
             capture_message(
                 f"SlackApiError {E} Failed to fetch conversation member for {current_channel}"
             )
+            return False
+
+    def handle_event(self, raw_json: dict[str, Any]):
+        """
+        Keeps the membership cache up to date with Slack events about the bot joining or leaving channels.
+
+        :param raw_json: Event callback sent by Slack's Events API.
+        """
+
+        event: dict[str, Any] = raw_json.get("event") or {}
+        event_type = event.get("type")
+        channel = event.get("channel")
+
+        if event_type == "member_joined_channel" and event.get(
+                "user") == self.bot_id:
+            self.memberships.set_member(channel, True)
+        elif event_type == "member_left_channel" and event.get(
+                "user") == self.bot_id:
+            self.memberships.set_member(channel, False)
+        elif event_type == "channel_left":
+            # Sent to the bot itself, when it is removed from a channel
+            self.memberships.set_member(channel, False)
 
     @staticmethod
     def run_help_command(args: list[str]) -> dict[str, Any]:
@@ -367,7 +516,8 @@ class Runner(SlackBotBase):
                 return mini_help_response(
                     "*/sel-subscribe*\n"
                     "Subscribe to events in a GitHub repository\n\n"
-                    "Format: `/sel-subscribe <owner>/<repository> <event1> [<event2> <event3> ...]`"
+                    "Format: `/sel-subscribe <owner>/<repository> <event1> [<event2> <event3> ...] [--digest hourly|daily|off]`\n"
+                    "With `--digest`, events are collected and posted as one summary per hour or day."
                 )
             elif "list" in query:
                 return mini_help_response(
@@ -391,7 +541,7 @@ class Runner(SlackBotBase):
                         "mrkdwn",
                         "text":
                         ("*Commands*\n"
-                         "1. `/sel-subscribe <owner>/<repository> <event1> [<event2> <event3> ...]`\n"
+                         "1. `/sel-subscribe <owner>/<repository> <event1> [<event2> <event3> ...] [--digest hourly|daily|off]`\n"
                          "2. `/sel-unsubscribe <owner>/<repository> <event1> [<event2> <event3> ...]`\n"
                          "3. `/sel-list ['q' or 'quiet']`\n"
                          "4. `/sel-help [<event name or keyword or command>]`"
@@ -0,0 +1,112 @@
+"""
+Contains the `DeliveryStorage` class, to remember the ids of handled webhook deliveries using the peewee library.
+"""
+
+import threading
+import time
+
+from peewee import CharField, FloatField, Model
+
+from ..utils.ttl_cache import MISSING, TTLCache
+from .engine import create_database, open_database
+
+db = create_database()
+
+
+class DeliveryStorage:
+    """
+    Uses the `peewee` library to remember webhook delivery ids (GUIDs) for `ttl` seconds, in an SQL database.
+
+    Recently seen ids are also kept in an in-memory LRU cache, so that most redeliveries never touch the database.
+
+    :param ttl: Number of seconds for which a delivery id is remembered.
+    :param max_cached: Maximum number of delivery ids kept in memory.
+    """
+
+    PURGE_INTERVAL = 60
+
+    def __init__(self, ttl: float = 24 * 60 * 60, max_cached: int = 10000):
+        global db
+        open_database(db, "data/deliveries.db")
+        db.create_tables([WebhookDelivery])
+
+        self.ttl = ttl
+        # Delivery ids seen within the last `ttl` seconds
+        self._seen = TTLCache(ttl, max_cached)
+        self._lock = threading.Lock()
+        self._purged_at = 0.0
+
+    def record_delivery(self, delivery_id: str) -> bool:
+        """
+        Remembers a delivery id, unless it was already seen within the last `ttl` seconds.
+
+        :param delivery_id: Value of the "X-GitHub-Delivery" header
+
+        :return: `False` in case the delivery is a duplicate, `True` otherwise.
+        """
+
+        if self._seen.get(delivery_id) is not MISSING:
+            return False
+        # A concurrent `forget_delivery` keeps the id out of the cache
+        generation = self._seen.generation
+
+        now = time.time()
+        self._purge_expired(now)
+        # Expired rows are taken over. The primary key makes this atomic across processes too
+        is_new = WebhookDelivery\
+            .insert(delivery_id=delivery_id, received_at=now)\
+            .on_conflict(
+                conflict_target=[WebhookDelivery.delivery_id],
+                update={WebhookDelivery.received_at: now},
+                where=(WebhookDelivery.received_at < now - self.ttl),
+            )\
+            .as_rowcount()\
+            .execute() == 1
+
+        self._seen.set(delivery_id, True, generation)
+        return is_new
+
+    def forget_delivery(self, delivery_id: str):
+        """
+        Forgets a delivery id, so that a redelivery gets handled. Used when a delivery couldn't be accepted.
+
+        :param delivery_id: Value of the "X-GitHub-Delivery" header
+        """
+
+        self._seen.pop(delivery_id)
+        WebhookDelivery.delete().where(
+            WebhookDelivery.delivery_id == delivery_id).execute()
+
+    def _purge_expired(self, now: float):
+        """
+        Deletes expired delivery ids from the database, at most once every `PURGE_INTERVAL` seconds.
+
+        :param now: Current epoch time
+        """
+
+        with self._lock:
+            if now - self._purged_at < DeliveryStorage.PURGE_INTERVAL:
+                return
+            self._purged_at = now
+
+        WebhookDelivery.delete().where(
+            WebhookDelivery.received_at < now - self.ttl).execute()
+
+
+class WebhookDelivery(Model):
+    """
+    A peewee-friendly model that represents one handled webhook delivery.
+
+    :keyword delivery_id: Value of the "X-GitHub-Delivery" header
+    :keyword received_at: Epoch time when the delivery was first received
+    """
+
+    delivery_id = CharField(primary_key=True)
+    received_at = FloatField(index=True)
+
+    class Meta:
+        database = db
+        table_name = "WebhookDelivery"
+
+    def __str__(self):
+        return f"({self.delivery_id}) — {self.received_at}"
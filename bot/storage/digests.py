@@ -0,0 +1,129 @@
+"""
+Contains the `DigestStorage` class, to persist the events buffered for periodic digests using the peewee library.
+"""
+
+import time
+
+from peewee import CharField, FloatField, Model, TextField
+
+from .engine import create_database, open_database
+
+db = create_database()
+
+
+class DigestStorage:
+    """
+    Uses the `peewee` library to buffer one-line event summaries per channel until their digest is due.
+    """
+
+    def __init__(self):
+        global db
+        open_database(db, "data/digests.db")
+        migrate_repository_column()
+        db.create_tables([DigestEntry])
+
+    def add_entries(self, entries: list[tuple[str, str, str, str]]):
+        """
+        Appends summaries to the buffers of their channels, in a single transaction.
+
+        :param entries: `list` of (channel, digest period, repository, summary) tuples
+        """
+
+        if len(entries) == 0:
+            return
+
+        now = time.time()
+        with db.atomic():
+            DigestEntry.insert_many([{
+                "channel": channel,
+                "period": period,
+                "repository": repository,
+                "summary": summary,
+                "created_at": now,
+            } for (channel, period, repository, summary) in entries
+                                     ]).execute()
+
+    def get_due_entries(
+        self,
+        period: str,
+        before: float,
+    ) -> dict[str, list["DigestEntry"]]:
+        """
+        Fetches the buffered summaries of a digest period that were added before the passed time.
+
+        :param period: Digest period, e.g. "hourly"
+        :param before: Epoch time of the start of the current period
+
+        :return: `DigestEntry` objects grouped by channel, oldest first
+        """
+
+        entries: dict[str, list[DigestEntry]] = {}
+        for entry in DigestEntry\
+                .select()\
+                .where((DigestEntry.period == period) & (DigestEntry.created_at < before))\
+                .order_by(DigestEntry.id):
+            entries.setdefault(entry.channel, []).append(entry)
+        return entries
+
+    def remove_entries(self, entry_ids: list[int]):
+        """
+        Deletes summaries that have been sent in a digest.
+
+        :param entry_ids: Primary keys of the entries
+        """
+
+        DigestEntry.delete().where(DigestEntry.id.in_(entry_ids)).execute()
+
+    def remove_pending_entries(self, channel: str, repository: str):
+        """
+        Deletes the buffered summaries of a repository's events, e.g. after the channel unsubscribed from it.
+
+        :param channel: Name of the Slack channel, including the team id prefix
+        :param repository: Unique identifier of the GitHub repository, of the form "<owner-name>/<repo-name>"
+        """
+
+        DigestEntry\
+            .delete()\
+            .where((DigestEntry.channel == channel) & (DigestEntry.repository == repository))\
+            .execute()
+
+
+class DigestEntry(Model):
+    """
+    A peewee-friendly model that represents one event waiting to be sent in a digest.
+
+    :keyword channel: Name of the Slack channel, including the team id prefix
+    :keyword period: Digest period, e.g. "hourly"
+    :keyword repository: Repository that the event was triggered in
+    :keyword summary: One-line summary of the event
+    :keyword created_at: Epoch time when the event was buffered
+    """
+
+    channel = CharField()
+    period = CharField()
+    repository = CharField(null=True)
+    summary = TextField()
+    created_at = FloatField()
+
+    class Meta:
+        database = db
+        table_name = "DigestEntry"
+        indexes = ((("period", "created_at"), False), )
+
+    def __str__(self):
+        return f"({self.channel}, {self.period}) — {self.summary}"
+
+
+def migrate_repository_column():
+    """
+    Adds the `repository` column to databases created before it existed. Does nothing on migrated databases.
+    """
+
+    table_name = DigestEntry._meta.table_name
+    if not db.table_exists(table_name):
+        return
+
+    columns = {column.name for column in db.get_columns(table_name)}
+    if "repository" not in columns:
+        db.execute_sql(
+            f'ALTER TABLE "{table_name}" ADD COLUMN "repository" VARCHAR(255)')
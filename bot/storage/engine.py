@@ -0,0 +1,62 @@
+"""
+Contains the storage engine shared by the storage classes: pooled SQLite databases with tuned pragmas.
+
+Every thread gets its own connection, checked out of the database's pool on its first query.
+Long-lived threads (e.g. workers) keep theirs, while request threads return theirs through `release_connections`.
+"""
+
+from playhouse.pool import PooledSqliteDatabase
+
+PRAGMAS = {
+    "journal_mode": "wal",
+    "synchronous": "normal",
+    "mmap_size": 64 * 1024 * 1024,
+    "cache_size": -8 * 1024,
+    "busy_timeout": 5000,
+}
+# ^ Applied to every new connection. WAL lets readers run alongside the writer.
+#   With WAL, `synchronous=NORMAL` stays consistent, and can only lose the latest commits on power loss.
+
+CACHED_STATEMENTS = 256
+# ^ Number of prepared statements kept by each connection
+
+STALE_TIMEOUT = 5 * 60
+# ^ Idle connections older than this are closed instead of being reused
+
+_databases: list[PooledSqliteDatabase] = []
+
+
+def create_database() -> PooledSqliteDatabase:
+    """
+    Creates an uninitialized database, to be bound to models and opened later with `open_database`.
+    :return: Pooled database, without a limit on the number of connections.
+    """
+    db = PooledSqliteDatabase(None, max_connections=None)
+    _databases.append(db)
+    return db
+
+
+def open_database(db: PooledSqliteDatabase, path: str):
+    """
+    Points a database at its file, and connects the calling thread.
+    :param db: Database created by `create_database`.
+    :param path: Path of the SQLite file.
+    """
+    db.init(
+        path,
+        pragmas=PRAGMAS,
+        stale_timeout=STALE_TIMEOUT,
+        cached_statements=CACHED_STATEMENTS,
+        # Pooled connections move between threads, but are only used by one thread at a time
+        check_same_thread=False,
+    )
+    db.connect(reuse_if_open=True)
+
+
+def release_connections():
+    """
+    Returns the calling thread's connections to their pools, e.g. at the end of a request.
+    """
+    for db in _databases:
+        if not db.is_closed():
+            db.close()
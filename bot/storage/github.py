@@ -4,22 +4,36 @@ Contains the `GitHubStorage` class, to save and fetch secrets using the peewee l
 
 from typing import Optional
 
-from peewee import CharField, IntegrityError, Model, SqliteDatabase
+from peewee import CharField, IntegrityError, Model
 
-db = SqliteDatabase(None)
+from ..utils.ttl_cache import MISSING, TTLCache
+from .engine import create_database, open_database
+
+db = create_database()
 
 
 class GitHubStorage:
     """
     Uses the `peewee` library to save and fetch secrets from an SQL database.
+
+    Secrets (and their absence) are cached in memory for `secret_ttl` seconds.
+
+    :param secret_ttl: Number of seconds for which a looked-up secret is reused.
+    :param max_cached_secrets: Maximum number of repositories kept in the secret cache.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        secret_ttl: float = 300,
+        max_cached_secrets: int = 10000,
+    ):
         global db
-        db.init("data/github.db")
-        db.connect()
+        open_database(db, "data/github.db")
         db.create_tables([GitHubSecret, User])
 
+        # repository → secret or `None`
+        self._secrets = TTLCache(secret_ttl, max_cached_secrets)
+
     def add_secret(
         self,
         repository: str,
@@ -48,24 +62,39 @@ class GitHubStorage:
                     .on_conflict_replace()\
                     .execute()
             return False
+        finally:
+            self.invalidate_secret(repository)
 
     def get_secret(self, repository: str) -> Optional[str]:
         """
-        Queries the `secrets` database.
+        Queries the `secrets` database, unless the result of an earlier query is still cached.
 
         :param repository: Unique identifier for the GitHub repository, of the form "<owner-name>/<repo-name>"
 
         :return: Result of query, either a string secret or `None`.
         """
 
-        results = GitHubSecret\
-            .select()\
-            .where(GitHubSecret.repository == repository)
+        secret = self._secrets.get(repository)
+        if secret is not MISSING:
+            return secret
+        # Lookups racing with an invalidation don't cache what they read before it
+        generation = self._secrets.generation
 
-        if len(results) == 1:
-            return results[0].secret
+        result = GitHubSecret\
+            .get_or_none(GitHubSecret.repository == repository)
+        secret = None if result is None else result.secret
 
-        return None
+        self._secrets.set(repository, secret, generation)
+        return secret
+
+    def invalidate_secret(self, repository: str):
+        """
+        Drops the cached secret of a repository, so that the next lookup hits the database.
+
+        :param repository: Unique identifier for the GitHub repository, of the form "<owner-name>/<repo-name>"
+        """
+
+        self._secrets.pop(repository)
 
     def add_user(
         self,
@@ -0,0 +1,195 @@
+"""
+Contains the `OutboxStorage` class, to persist pending Slack deliveries using the peewee library.
+"""
+
+import time
+from typing import Optional
+
+from peewee import (
+    BooleanField,
+    CharField,
+    FloatField,
+    IntegerField,
+    Model,
+    TextField,
+    fn,
+)
+
+from .engine import create_database, open_database
+
+db = create_database()
+
+
+class OutboxStorage:
+    """
+    Uses the `peewee` library to save, claim and settle pending Slack deliveries in an SQL database.
+    """
+
+    def __init__(self):
+        global db
+        open_database(db, "data/outbox.db")
+        migrate_thread_ts_column()
+        db.create_tables([Delivery])
+
+    def add_deliveries(self, deliveries: list[tuple[str, str, str | None]]):
+        """
+        Saves a batch of deliveries in a single transaction.
+
+        :param deliveries: `list` of (channel, message, details) tuples
+        """
+
+        if len(deliveries) == 0:
+            return
+
+        now = time.time()
+        with db.atomic():
+            Delivery.insert_many([{
+                "channel": channel,
+                "message": message,
+                "details": details,
+                "created_at": now,
+                "next_attempt_at": now,
+            } for (channel, message, details) in deliveries]).execute()
+
+    def claim_deliveries(
+        self,
+        limit: int,
+        lease: float,
+    ) -> tuple["Delivery", ...]:
+        """
+        Reserves the oldest due deliveries, so that no other sender picks them up for `lease` seconds.
+        Deliveries that are never settled (e.g. because the process died) become due again after the lease.
+
+        :param limit: Maximum number of deliveries to claim
+        :param lease: Number of seconds for which the deliveries are reserved
+
+        :return: Claimed `Delivery` objects
+        """
+
+        now = time.time()
+        with db.atomic("IMMEDIATE"):
+            deliveries = tuple(Delivery\
+                .select()\
+                .where((Delivery.dead == False) & (Delivery.next_attempt_at <= now))\
+                .order_by(Delivery.id)\
+                .limit(limit))
+            if len(deliveries) != 0:
+                Delivery\
+                    .update(next_attempt_at=now + lease)\
+                    .where(Delivery.id.in_([d.id for d in deliveries]))\
+                    .execute()
+        return deliveries
+
+    def remove_delivery(self, delivery_id: int):
+        """
+        Deletes a delivery that has been sent successfully.
+
+        :param delivery_id: Primary key of the delivery
+        """
+
+        Delivery.delete().where(Delivery.id == delivery_id).execute()
+
+    def set_thread_ts(self, delivery_id: int, thread_ts: str):
+        """
+        Records that a delivery's main message was posted, so that only its details are left to post.
+
+        :param delivery_id: Primary key of the delivery
+        :param thread_ts: Timestamp of the posted main message
+        """
+
+        Delivery.update(thread_ts=thread_ts).where(
+            Delivery.id == delivery_id).execute()
+
+    def reschedule_delivery(
+        self,
+        delivery_id: int,
+        attempts: int,
+        retry_at: Optional[float],
+        error: str,
+    ):
+        """
+        Records a failed attempt at sending a delivery.
+
+        :param delivery_id: Primary key of the delivery
+        :param attempts: Total number of failed attempts so far
+        :param retry_at: Epoch time of the next attempt, or `None` to give up on the delivery
+        :param error: Description of the latest failure
+        """
+
+        Delivery\
+            .update(
+                attempts=attempts,
+                next_attempt_at=retry_at if retry_at is not None else time.time(),
+                dead=retry_at is None,
+                last_error=error,
+            )\
+            .where(Delivery.id == delivery_id)\
+            .execute()
+
+    def get_stats(self) -> dict[str, float | int]:
+        """
+        Summarizes the contents of the outbox.
+
+        :return: `dict` containing the number of pending, retrying and dead deliveries and the age of the oldest pending one
+        """
+
+        pending = Delivery.select().where(Delivery.dead == False)
+        oldest: Optional[float] = pending\
+            .select(fn.MIN(Delivery.created_at))\
+            .scalar()
+
+        return {
+            "pending": pending.count(),
+            "retrying": pending.where(Delivery.attempts > 0).count(),
+            "dead": Delivery.select().where(Delivery.dead == True).count(),
+            "oldest_pending_age":
+            0 if oldest is None else time.time() - oldest,
+        }
+
+
+class Delivery(Model):
+    """
+    A peewee-friendly model that represents one rendered message waiting to be posted on Slack.
+
+    :keyword channel: Name of the Slack channel, including the team id prefix
+    :keyword message: Main message text
+    :keyword details: Optional text to be posted in a thread under the main message
+    :keyword thread_ts: Timestamp of the main message, once it has been posted
+    :keyword attempts: Number of failed attempts at sending the delivery
+    :keyword created_at: Epoch time when the delivery was saved
+    :keyword next_attempt_at: Epoch time after which the delivery may be (re)tried
+    :keyword dead: Whether the delivery was given up on after too many failures
+    :keyword last_error: Description of the latest failure
+    """
+
+    channel = CharField()
+    message = TextField()
+    details = TextField(null=True)
+    thread_ts = CharField(null=True)
+    attempts = IntegerField(default=0)
+    created_at = FloatField()
+    next_attempt_at = FloatField(index=True)
+    dead = BooleanField(default=False)
+    last_error = TextField(null=True)
+
+    class Meta:
+        database = db
+        table_name = "Delivery"
+
+    def __str__(self):
+        return f"({self.channel}) — {self.message}"
+
+
+def migrate_thread_ts_column():
+    """
+    Adds the `thread_ts` column to databases created before it existed. Does nothing on migrated databases.
+    """
+
+    table_name = Delivery._meta.table_name
+    if not db.table_exists(table_name):
+        return
+
+    columns = {column.name for column in db.get_columns(table_name)}
+    if "thread_ts" not in columns:
+        db.execute_sql(
+            f'ALTER TABLE "{table_name}" ADD COLUMN "thread_ts" VARCHAR(255)')
@@ -1,32 +1,90 @@
 """
 Contains the `SubscriptionStorage` class, to save and fetch subscriptions using the peewee library.
 """
+import pickle
+import threading
 from typing import Optional
 
-from peewee import CharField, Model, SqliteDatabase
-from playhouse.fields import PickleField
+from peewee import CharField, IntegerField, Model
 
-from bot.models.github import EventType, convert_keywords_to_events
+from bot.models.github import (
+    EventType,
+    convert_events_to_bitmask,
+    convert_keywords_to_events,
+)
 
-db = SqliteDatabase(None)
+from .engine import create_database, open_database
+
+db = create_database()
 
 
 class SubscriptionStorage:
     """
     Uses the `peewee` library to save and fetch subscriptions from an SQL database.
+
+    Also keeps an in-memory routing index (repository → event type → channels),
+    so that routing an event never needs to touch the database.
+    Channels that receive digests are indexed separately, by period.
     """
 
+    routes: dict[str, dict[EventType, tuple[str, ...]]]
+    digest_routes: dict[str, dict[EventType, tuple[tuple[str, str], ...]]]
+
     def __init__(self):
         global db
-        db.init("data/subscriptions.db")
-        db.connect()
+        open_database(db, "data/subscriptions.db")
+        migrate_pickled_events()
+        migrate_digest_column()
         Subscription.create_table()
         Subscription.insert(
             channel="#selene",
             repository="BURG3R5/github-slack-bot",
-            events=list(EventType),
+            events=convert_events_to_bitmask(EventType),
         )
 
+        self._lock = threading.Lock()
+        self._subscribers: dict[str, dict[str, tuple[int, Optional[str]]]] = {}
+        # ^ Events bitmask and digest period of each channel, per repository
+        self.routes = {}
+        self.digest_routes = {}
+        for subscription in self.get_subscriptions():
+            self._subscribers\
+                .setdefault(subscription.repository, {})[subscription.channel] = (subscription.events, subscription.digest)
+        for repository in self._subscribers:
+            self._reindex(repository)
+
+    def get_channels(
+        self,
+        repository: str,
+        event_type: EventType,
+    ) -> tuple[str, ...]:
+        """
+        Looks up the routing index for channels subscribed to the passed event in the passed repository.
+
+        :param repository: Unique identifier for the GitHub repository, of the form "<owner-name>/<repo-name>"
+        :param event_type: Enum-ized type of event
+
+        :return: Names of the subscribed channels that receive events right away
+        """
+
+        return self.routes.get(repository, {}).get(event_type, ())
+
+    def get_digest_channels(
+        self,
+        repository: str,
+        event_type: EventType,
+    ) -> tuple[tuple[str, str], ...]:
+        """
+        Looks up the routing index for channels that receive the passed event in a periodic digest.
+
+        :param repository: Unique identifier for the GitHub repository, of the form "<owner-name>/<repo-name>"
+        :param event_type: Enum-ized type of event
+
+        :return: (channel, digest period) pairs of the subscribed channels
+        """
+
+        return self.digest_routes.get(repository, {}).get(event_type, ())
+
     def remove_subscription(self, channel: str, repository: str):
         """
         Deletes a given entry from the database.
@@ -40,36 +98,50 @@ class SubscriptionStorage:
             .where((Subscription.channel == channel) & (Subscription.repository == repository))\
             .execute()
 
+        with self._lock:
+            self._subscribers.get(repository, {}).pop(channel, None)
+            self._reindex(repository)
+
     def update_subscription(
         self,
         channel: str,
         repository: str,
-        events: set[EventType],
+        events: int,
+        digest: Optional[str] = None,
     ):
         """
         Creates or updates subscription object in the database.
 
         :param channel: Name of the Slack channel (including the "#")
         :param repository: Unique identifier of the GitHub repository, of the form "<owner-name>/<repo-name>"
-        :param events: Set of events to subscribe to
+        :param events: Bitmask of events to subscribe to
+        :param digest: Period of the digest that the events are collected in, or `None` to send them right away
         """
 
         Subscription.insert(
             channel=channel,
             repository=repository,
-            events=[e.keyword for e in events],
+            events=events,
+            digest=digest,
         ).on_conflict_replace().execute()
 
+        with self._lock:
+            self._subscribers.setdefault(repository,
+                                         {})[channel] = (events, digest)
+            self._reindex(repository)
+
     def get_subscriptions(
         self,
         channel: Optional[str] = None,
         repository: Optional[str] = None,
+        event_type: Optional[EventType] = None,
     ) -> tuple["Subscription", ...]:
         """
         Queries the subscriptions database. Filters are applied depending on arguments passed.
 
         :param channel: Name of the Slack channel (including the "#")
         :param repository: Unique identifier for the GitHub repository, of the form "<owner-name>/<repo-name>"
+        :param event_type: Enum-ized type of event that the subscriptions should include
 
         :return: Result of query, containing `Subscription` objects with relevant fields
         """
@@ -80,25 +152,53 @@ class SubscriptionStorage:
         elif channel is None:
             # Only repository filter is provided
             subscriptions = Subscription\
-                .select(Subscription.channel, Subscription.events)\
+                .select(Subscription.channel, Subscription.events, Subscription.digest)\
                 .where(Subscription.repository == repository)
         elif repository is None:
             # Only channel filter is provided
             subscriptions = Subscription\
-                .select(Subscription.repository, Subscription.events)\
+                .select(Subscription.repository, Subscription.events, Subscription.digest)\
                 .where(Subscription.channel == channel)
         else:
             # Both filters are provided
             subscriptions = Subscription\
-                .select(Subscription.events)\
+                .select(Subscription.events, Subscription.digest)\
                 .where((Subscription.channel == channel) & (Subscription.repository == repository))
 
-        return tuple(
-            Subscription(
-                channel=subscription.channel,
-                repository=subscription.repository,
-                events=convert_keywords_to_events(subscription.events),
-            ) for subscription in subscriptions)
+        if event_type is not None:
+            subscriptions = subscriptions\
+                .where(Subscription.events.bin_and(event_type.bit) != 0)
+
+        return tuple(subscriptions)
+
+    def _reindex(self, repository: str):
+        """
+        Rebuilds the routing index entry of a single repository.
+        The entry is replaced as a whole, so concurrent readers always see a consistent mapping.
+
+        :param repository: Unique identifier for the GitHub repository, of the form "<owner-name>/<repo-name>"
+        """
+
+        subscribers = self._subscribers.get(repository, {})
+        if len(subscribers) == 0:
+            self._subscribers.pop(repository, None)
+            self.routes.pop(repository, None)
+            self.digest_routes.pop(repository, None)
+            return
+
+        self.routes[repository] = {
+            event_type:
+            tuple(channel for channel, (events, digest) in subscribers.items()
+                  if (events & event_type.bit) and digest is None)
+            for event_type in EventType
+        }
+        self.digest_routes[repository] = {
+            event_type: tuple(
+                (channel, digest)
+                for channel, (events, digest) in subscribers.items()
+                if (events & event_type.bit) and digest is not None)
+            for event_type in EventType
+        }
 
 
 class Subscription(Model):
@@ -107,13 +207,14 @@ class Subscription(Model):
 
     :keyword channel: Name of the Slack channel, including the "#"
     :keyword repository: Unique identifier for the GitHub repository, of the form "<owner-name>/<repo-name>"
-    :keyword events: List of keyword-representations of EventType enum members
+    :keyword events: Bitmask of the bits of EventType enum members
+    :keyword digest: Period of the digest that events are collected in, or `None` if they are sent right away
     """
 
     channel = CharField()
     repository = CharField()
-    #        v A field that stores any Python object in a pickled string and un-pickles it automatically.
-    events = PickleField()
+    events = IntegerField()
+    digest = CharField(null=True)
 
     class Meta:
         database = db
@@ -122,3 +223,50 @@ class Subscription(Model):
 
     def __str__(self):
         return f"({self.channel},{self.repository}) — {self.events}"
+
+
+def migrate_pickled_events():
+    """
+    One-shot migration of databases that stored events as pickled lists of keywords.
+    Rewrites the `subscription` table with the events converted to bitmasks. Does nothing on migrated databases.
+    """
+
+    table_name = Subscription._meta.table_name
+    if not db.table_exists(table_name):
+        return
+
+    columns = {column.name: column for column in db.get_columns(table_name)}
+    if columns["events"].data_type.upper() != "BLOB":
+        return
+
+    rows = db.execute_sql(
+        f'SELECT "channel", "repository", "events" FROM "{table_name}"',
+    ).fetchall()
+    with db.atomic():
+        Subscription.drop_table()
+        Subscription.create_table()
+        if len(rows) != 0:
+            Subscription.insert_many([{
+                "channel":
+                channel,
+                "repository":
+                repository,
+                "events":
+                convert_events_to_bitmask(
+                    convert_keywords_to_events(pickle.loads(events))),
+            } for (channel, repository, events) in rows]).execute()
+
+
+def migrate_digest_column():
+    """
+    Adds the `digest` column to databases created before digests existed. Does nothing on migrated databases.
+    """
+
+    table_name = Subscription._meta.table_name
+    if not db.table_exists(table_name):
+        return
+
+    columns = {column.name for column in db.get_columns(table_name)}
+    if "digest" not in columns:
+        db.execute_sql(
+            f'ALTER TABLE "{table_name}" ADD COLUMN "digest" VARCHAR(255)')
@@ -1,8 +1,13 @@
 """
-Contains the `JSON` class, which wraps a `dict` to safely extract values using multiple keys.
+Contains the `JSON` class, which wraps a `dict` to safely extract values using multiple keys,
+the `path` function, which compiles allocation-free accessors with the same semantics,
+and the `decode` function, which decodes JSON documents using the configured backend.
 """
 
-from typing import Any
+import json as stdlib_json
+from functools import lru_cache
+from importlib import import_module
+from typing import Any, Callable, Optional
 
 from werkzeug.datastructures import ImmutableMultiDict
 
@@ -47,3 +52,93 @@ class JSON:
         :return: `JSON` object containing the data from the `ImmutableMultiDict`.
         """
         return JSON({key: multi_dict[key] for key in multi_dict.keys()})
+
+
+class Path:
+    """
+    Precompiled accessor for a nested value in a decoded JSON payload.
+    Walks the raw `dict`s directly, without allocating any wrappers.
+
+    Like `JSON`, a missing key yields the upper-cased (first alternative of the) key instead of raising.
+
+    :param spec: Dot-separated keys, where each key may list "|"-separated alternatives, e.g. "sender.name|login".
+    """
+
+    __slots__ = ("spec", "segments", "keys")
+
+    def __init__(self, spec: str):
+        self.spec = spec
+        self.segments: tuple[tuple[str, ...], ...] = tuple(
+            tuple(segment.split("|")) for segment in spec.split("."))
+        # Paths without alternatives can be walked by plain indexing
+        self.keys: Optional[tuple[str, ...]] = None
+        if all(len(alternatives) == 1 for alternatives in self.segments):
+            self.keys = tuple(alternatives[0]
+                              for alternatives in self.segments)
+
+    def __call__(self, data: Any) -> Any:
+        if self.keys is not None:
+            value = data
+            try:
+                for key in self.keys:
+                    value = value[key]
+            except (KeyError, TypeError):
+                return self._walk(data)
+            return value
+        return self._walk(data)
+
+    def _walk(self, data: Any) -> Any:
+        for alternatives in self.segments:
+            if not isinstance(data, dict):
+                return alternatives[0].upper()
+            for key in alternatives:
+                if key in data:
+                    data = data[key]
+                    break
+            else:
+                return alternatives[0].upper()
+        return data
+
+    def __repr__(self) -> str:
+        return f"path({self.spec!r})"
+
+
+@lru_cache(maxsize=None)
+def path(spec: str) -> Path:
+    """
+    Compiles a `Path` accessor. Accessors are cached, so equal specs share one compiled object.
+    :param spec: Dot-separated keys, where each key may list "|"-separated alternatives, e.g. "sender.name|login".
+    :return: Callable that extracts the value from a raw `dict`.
+    """
+    return Path(spec)
+
+
+_decoder: Callable[[bytes | str], Any] = stdlib_json.loads
+
+
+def decode(document: bytes | str) -> Any:
+    """
+    Decodes a JSON document, using the backend chosen by `select_decoder`.
+    :param document: Raw JSON text.
+    :return: Decoded Python object.
+    """
+    return _decoder(document)
+
+
+def select_decoder(backend: str) -> str:
+    """
+    Chooses the library used by `decode`. Falls back to the standard library if the backend isn't installed.
+    :param backend: One of "orjson", "ujson" or "json".
+    :return: Name of the backend actually in use.
+    """
+    global _decoder
+
+    if backend in ("orjson", "ujson"):
+        try:
+            _decoder = import_module(backend).loads
+            return backend
+        except ImportError:
+            pass
+
+    _decoder = stdlib_json.loads
+    return "json"
@@ -1,15 +1,49 @@
+"""
+Contains the `Logger` class, which keeps a bounded log of the latest slash commands.
+"""
+
+import fcntl
+import os
+import struct
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+MAGIC = b"SELLOG01"
+HEADER = struct.Struct("<8sIIQ")
+# ^ magic, record size, capacity, number of records ever appended
+LENGTH = struct.Struct("<H")
+# ^ prefix of every record, holding the length of its text
+
+
 class Logger:
     """
-    Logs the latest commands to `./data/logs`.
+    Logs the latest commands to `./data/command_log`.
+
+    The log is a preallocated ring of `N` fixed-size records, so appending a command writes one record
+    and the header, however long the log is. Writers are serialized by a lock within the process and
+    by `flock` across processes. Texts longer than a record are truncated.
+
     :param N: Number of latest commands to keep.
+    :param path: Path of the log file.
     """
 
-    def __init__(self, N: int):
+    RECORD_SIZE = 512
+
+    def __init__(self, N: int, path: str = "data/command_log"):
         self.N = N
+        self.path = path
+        self._lock = threading.Lock()
+        self._fd: Optional[int] = None
+
+        if self.N != 0:
+            self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+            with self._locked(exclusive=True):
+                self._prepare()
 
     def log_command(self, log_text: str):
         """
-        Logs the latest command to `./data/logs`.
+        Logs the latest command to `./data/command_log`, overwriting the oldest one if the log is full.
         :param log_text: Information about the latest command to be saved.
         """
 
@@ -17,16 +51,88 @@ class Logger:
             # Early exit
             return
 
-        # Read
-        with open('data/logs', 'a+') as file:
-            file.seek(0)
-            lines = file.readlines()
+        data = log_text.encode("utf-8")[:Logger.RECORD_SIZE - LENGTH.size]
+        # Don't keep half of a multibyte character
+        data = data.decode("utf-8", "ignore").encode("utf-8")
+        record = LENGTH.pack(len(data)) + data
+
+        with self._locked(exclusive=True):
+            # Re-read the count, as other processes may have appended since
+            count = self._read_count()
+            os.pwrite(self._fd, record, self._offset(count % self.N))
+            # The count is only bumped after the record is written, so a torn record is never read
+            self._write_header(count + 1)
+
+    def latest_commands(self, n: Optional[int] = None) -> list[str]:
+        """
+        Reads the latest logged commands.
+        :param n: Maximum number of commands to read. `None` reads all of them.
+        :return: Logged commands, oldest first.
+        """
+
+        if self.N == 0:
+            return []
+
+        with self._locked(exclusive=False):
+            return list(self._read_records(self._read_count(), self.N, n))
+
+    @contextmanager
+    def _locked(self, exclusive: bool) -> Iterator[None]:
+        with self._lock:
+            fcntl.flock(self._fd,
+                        fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _prepare(self):
+        """
+        Preallocates the log file, keeping the records of an existing log if it has a different capacity.
+        """
+
+        header = os.pread(self._fd, HEADER.size, 0)
+        if len(header) == HEADER.size:
+            magic, record_size, capacity, count = HEADER.unpack(header)
+            if magic == MAGIC and record_size == Logger.RECORD_SIZE:
+                if capacity == self.N:
+                    return
+                records = list(self._read_records(count, capacity, self.N))
+            else:
+                records = []
+        else:
+            records = []
+
+        os.ftruncate(self._fd, 0)
+        os.ftruncate(self._fd, self._offset(self.N))
+        for index, text in enumerate(records):
+            data = text.encode("utf-8")
+            os.pwrite(self._fd,
+                      LENGTH.pack(len(data)) + data, self._offset(index))
+        self._write_header(len(records))
+
+    def _read_records(
+        self,
+        count: int,
+        capacity: int,
+        n: Optional[int],
+    ) -> Iterator[str]:
+        available = min(count, capacity)
+        if n is not None:
+            available = min(available, n)
+
+        for sequence in range(count - available, count):
+            record = os.pread(self._fd, Logger.RECORD_SIZE,
+                              self._offset(sequence % capacity))
+            (length, ) = LENGTH.unpack_from(record)
+            yield record[LENGTH.size:LENGTH.size + length].decode("utf-8")
+
+    def _read_count(self) -> int:
+        return HEADER.unpack(os.pread(self._fd, HEADER.size, 0))[3]
 
-        # Update
-        lines.append(log_text + '\n')
-        if len(lines) > self.N:
-            lines.pop(0)
+    def _write_header(self, count: int):
+        os.pwrite(self._fd,
+                  HEADER.pack(MAGIC, Logger.RECORD_SIZE, self.N, count), 0)
 
-        # Write
-        with open('data/logs', 'w') as file:
-            file.writelines(lines)
+    def _offset(self, index: int) -> int:
+        return HEADER.size + index * Logger.RECORD_SIZE
@@ -0,0 +1,171 @@
+"""
+Contains the structured, leveled logger of the bot, whose records are written by a background thread.
+
+Callers only check the level, sample and enqueue the record. Formatting (JSON lines, with length-capped fields)
+and writing to stdout happen on the thread of a `QueueListener`, off the request and send paths.
+"""
+
+import atexit
+import json
+import logging
+import queue
+import random
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Optional
+
+LOGGER = logging.getLogger("selene")
+
+_sample_rates: dict[str, float] = {}
+# ^ Fraction of records kept, per sample key. Keys that aren't listed are always kept.
+_listener: Optional[QueueListener] = None
+
+
+class JSONFormatter(logging.Formatter):
+    """
+    Formats records as single-line JSON objects, holding the event name and its fields.
+
+    :param max_field_length: Maximum length of each field's text. Longer fields are cut off.
+    """
+
+    def __init__(self, max_field_length: int):
+        super().__init__()
+        self.max_field_length = max_field_length
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: dict[str, Any] = {
+            "time": round(record.created, 3),
+            "level": record.levelname,
+            "event": record.getMessage(),
+        }
+        for name, value in getattr(record, "fields", {}).items():
+            entry[name] = self.cap(value)
+        return json.dumps(entry, ensure_ascii=False)
+
+    def cap(self, value: Any) -> Any:
+        if value is None or isinstance(value, (bool, int, float)):
+            return value
+        text = value if isinstance(value, str) else str(value)
+        if len(text) > self.max_field_length:
+            return text[:self.max_field_length] + "…"
+        return text
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    Enqueues records without blocking. Records that don't fit in the full queue are counted and dropped.
+    """
+
+    def __init__(self, record_queue: queue.Queue):
+        super().__init__(record_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def configure_logging(
+    level: str = "INFO",
+    sample_rates: Optional[dict[str, float]] = None,
+    max_field_length: int = 200,
+    queue_size: int = 10000,
+):
+    """
+    Sets up the bot's logger, and starts the thread that writes its records.
+    :param level: Name of the minimum level that is logged, e.g. "DEBUG". "OFF" disables logging altogether.
+    :param sample_rates: Fraction of records to keep, per sample key, e.g. `{"PUSH": 0.1}`.
+    :param max_field_length: Maximum length of each logged field.
+    :param queue_size: Maximum number of records waiting to be written. Further records are dropped.
+    """
+    global _listener
+
+    _stop_listener()
+    LOGGER.handlers.clear()
+    LOGGER.propagate = False
+    _sample_rates.clear()
+    _sample_rates.update(sample_rates or {})
+
+    if level.upper() == "OFF":
+        LOGGER.disabled = True
+        return
+
+    LOGGER.disabled = False
+    LOGGER.setLevel(level.upper())
+
+    record_queue: queue.Queue = queue.Queue(queue_size)
+    LOGGER.addHandler(DroppingQueueHandler(record_queue))
+
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(JSONFormatter(max_field_length))
+    _listener = QueueListener(record_queue, output)
+    _listener.start()
+
+
+def _stop_listener():
+    """
+    Writes the records that are still queued, and stops the listener thread.
+    """
+    global _listener
+
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+# Flush the remaining records on shutdown
+atexit.register(_stop_listener)
+
+
+def parse_sample_rates(text: str) -> dict[str, float]:
+    """
+    Parses sample rates from text such as "PUSH=0.1,STAR_ADDED=0".
+    :param text: Comma-separated pairs of sample keys and rates.
+    :return: `dict` of sample rates.
+    :raises ValueError: If a pair is malformed.
+    """
+    rates: dict[str, float] = {}
+    for pair in text.split(","):
+        if pair.strip() == "":
+            continue
+        key, _, rate = pair.partition("=")
+        rates[key.strip()] = float(rate)
+    return rates
+
+
+def log_event(
+    level: int,
+    name: str,
+    sample_key: Optional[str] = None,
+    **fields: Any,
+):
+    """
+    Logs an event with its fields, unless it's below the configured level or sampled out.
+    :param level: Level of the record, e.g. `logging.INFO`.
+    :param name: Name of the event, e.g. "sending_message".
+    :param sample_key: Key of the sample rate that applies. Defaults to `name`.
+    :param fields: Fields of the event. Anything that isn't a number is logged as (capped) text.
+    """
+    if not LOGGER.isEnabledFor(level):
+        return
+
+    rate = _sample_rates.get(sample_key or name)
+    if rate is not None and random.random() >= rate:
+        return
+
+    LOGGER.log(level, name, extra={"fields": fields})
+
+
+def logging_stats() -> dict[str, int]:
+    """
+    Reports the state of the logging queue.
+    :return: `dict` containing the number of queued and dropped records.
+    """
+    dropped = queued = 0
+    for handler in LOGGER.handlers:
+        if isinstance(handler, DroppingQueueHandler):
+            dropped += handler.dropped
+            queued += handler.queue.qsize()
+    return {"queued": queued, "dropped": dropped}
@@ -0,0 +1,93 @@
+"""
+Contains the `TTLCache` class, a bounded in-memory cache whose entries expire.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+MISSING = object()
+# ^ Returned by `TTLCache.get` for absent or expired keys, as `None` can be a cached value
+
+
+class TTLCache:
+    """
+    Thread-safe cache that keeps every entry for `ttl` seconds, evicting the least recently used ones beyond `max_size`.
+
+    Removals bump a generation counter. A caller that computed a value from data read before a removal
+    can pass the generation it started at to `set`, so that the stale value isn't cached.
+
+    :param ttl: Number of seconds for which an entry is kept.
+    :param max_size: Maximum number of entries.
+    """
+
+    def __init__(self, ttl: float, max_size: int):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.generation = 0
+        # key → (value, expiry time)
+        self._entries: OrderedDict[Hashable, tuple[Any, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any:
+        """
+        Looks up an entry, marking it as the most recently used one.
+        :param key: Key of the entry.
+        :return: Cached value, or `MISSING` if there is none or it has expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISSING
+            if entry[1] <= time.monotonic():
+                del self._entries[key]
+                return MISSING
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        generation: Optional[int] = None,
+    ) -> bool:
+        """
+        Stores an entry, evicting the least recently used ones if the cache is full.
+        :param key: Key of the entry.
+        :param value: Value to cache.
+        :param generation: `generation` read before computing the value. If an entry was removed since, nothing is stored.
+        :return: Whether the entry was stored.
+        """
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return False
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+            return True
+
+    def pop(self, key: Hashable):
+        """
+        Removes an entry, if present.
+        :param key: Key of the entry.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+            self.generation += 1
+
+    def clear(self):
+        """
+        Removes every entry.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.generation += 1
+
+    def keys(self) -> list[Hashable]:
+        """
+        :return: Keys of the entries, least recently used first. Expired entries may still be included.
+        """
+        with self._lock:
+            return list(self._entries)
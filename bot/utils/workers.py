@@ -0,0 +1,111 @@
+"""
+Contains the `WorkerPool` class, a bounded in-process work queue drained by daemon threads.
+"""
+
+import queue
+import threading
+from typing import Any, Callable
+
+import sentry_sdk
+
+
+class WorkerPool:
+    """
+    Bounded in-process work queue, drained by a fixed pool of daemon worker threads.
+
+    When the queue is full, `submit` waits for at most `block_timeout` seconds for a free slot
+    and then rejects the item, so that callers can apply backpressure instead of piling up work.
+
+    :param handler: Function called with every submitted item, on one of the worker threads.
+    :param workers: Number of worker threads.
+    :param max_size: Maximum number of items allowed to wait in the queue.
+    :param block_timeout: Seconds `submit` may wait for a free slot before rejecting the item.
+    :param name: Prefix for the names of the worker threads.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[Any], Any],
+        workers: int,
+        max_size: int,
+        block_timeout: float = 0.0,
+        name: str = "worker",
+    ):
+        self.handler = handler
+        self.capacity = max_size
+        self.block_timeout = block_timeout
+        self.queue: queue.Queue = queue.Queue(maxsize=max_size)
+        self.processed = 0
+        self.failed = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+        self.threads = [
+            threading.Thread(
+                target=self._work,
+                name=f"{name}-{i}",
+                daemon=True,
+            ) for i in range(workers)
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    @property
+    def depth(self) -> int:
+        """
+        Approximate number of items waiting in the queue.
+        """
+        return self.queue.qsize()
+
+    def submit(self, item: Any) -> bool:
+        """
+        Adds an item to the queue.
+        :param item: Object to be passed to the handler.
+        :return: `False` in case the queue stayed full and the item was rejected, `True` otherwise.
+        """
+        try:
+            if self.block_timeout > 0:
+                self.queue.put(item, timeout=self.block_timeout)
+            else:
+                self.queue.put_nowait(item)
+        except queue.Full:
+            with self._lock:
+                self.rejected += 1
+            return False
+        return True
+
+    def join(self):
+        """
+        Blocks until every queued item has been handled.
+        """
+        self.queue.join()
+
+    def stats(self) -> dict[str, int]:
+        """
+        Snapshot of the pool's counters.
+        :return: `dict` containing queue depth and capacity, along with processed/failed/rejected counts.
+        """
+        with self._lock:
+            return {
+                "depth": self.depth,
+                "capacity": self.capacity,
+                "workers": len(self.threads),
+                "processed": self.processed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+            }
+
+    def _work(self):
+        while True:
+            item = self.queue.get()
+            try:
+                self.handler(item)
+            except Exception as e:
+                sentry_sdk.capture_exception(e)
+                with self._lock:
+                    self.failed += 1
+            else:
+                with self._lock:
+                    self.processed += 1
+            finally:
+                self.queue.task_done()
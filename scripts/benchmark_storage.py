@@ -0,0 +1,124 @@
+"""
+Compares the storage engine (`bot.storage.engine`) against plain `SqliteDatabase`s, under concurrent load.
+
+Each simulated request runs on a fresh thread, as with Flask's threaded server:
+* webhook deliveries record their "X-GitHub-Delivery" id and queue a message in the outbox,
+* slash commands update a subscription and read back the channel's subscriptions.
+
+Steps:
+1) Run `python -m scripts.benchmark_storage` from the root of the repository
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+import uuid
+from typing import Callable
+
+from peewee import SqliteDatabase
+
+from bot.storage.deliveries import WebhookDelivery
+from bot.storage.engine import create_database, open_database, release_connections
+from bot.storage.outbox import Delivery
+from bot.storage.subscriptions import Subscription
+
+MODELS = [WebhookDelivery, Delivery, Subscription]
+
+
+def handle_webhook(i: int):
+    now = time.time()
+    WebhookDelivery\
+        .insert(delivery_id=str(uuid.uuid4()), received_at=now)\
+        .on_conflict_ignore()\
+        .execute()
+    Delivery.insert(
+        channel="T0001#C0001",
+        message=f"Push #{i}",
+        created_at=now,
+        next_attempt_at=now,
+    ).execute()
+
+
+def handle_command(i: int):
+    channel = f"T0001#C{i % 50:04}"
+    Subscription.insert(
+        channel=channel,
+        repository=f"org/repo-{i % 200}",
+        events=i,
+    ).on_conflict_replace().execute()
+    tuple(Subscription.select().where(Subscription.channel == channel))
+
+
+def run_load(
+    requests: int,
+    concurrency: int,
+    handlers: list[Callable[[int], None]],
+    release: Callable[[], None],
+) -> float:
+    """
+    Runs `requests` requests, `concurrency` at a time, each on a new thread.
+    :return: Number of seconds taken.
+    """
+    counter = iter(range(requests))
+    lock = threading.Lock()
+
+    def client():
+        while True:
+            with lock:
+                i = next(counter, None)
+            if i is None:
+                return
+
+            def request():
+                try:
+                    handlers[i % len(handlers)](i)
+                finally:
+                    release()
+
+            thread = threading.Thread(target=request)
+            thread.start()
+            thread.join()
+
+    started_at = time.perf_counter()
+    clients = [threading.Thread(target=client) for _ in range(concurrency)]
+    for thread in clients:
+        thread.start()
+    for thread in clients:
+        thread.join()
+    return time.perf_counter() - started_at
+
+
+def benchmark(name: str, db, release: Callable[[], None], args):
+    with db.bind_ctx(MODELS):
+        db.create_tables(MODELS)
+        for label, handlers in (
+            ("webhooks", [handle_webhook]),
+            ("commands", [handle_command]),
+            ("mixed", [handle_webhook, handle_command]),
+        ):
+            seconds = run_load(args.requests, args.concurrency, handlers,
+                               release)
+            print(f"{name:>9} {label:>9}: "
+                  f"{args.requests / seconds:8.0f} requests/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        # Connections opened by request threads are only closed when the thread's state is collected
+        baseline = SqliteDatabase(os.path.join(directory, "baseline.db"))
+        benchmark("baseline", baseline, lambda: None, args)
+
+        engine = create_database()
+        open_database(engine, os.path.join(directory, "engine.db"))
+        benchmark("engine", engine, release_connections, args)
+
+
+if __name__ == "__main__":
+    main()
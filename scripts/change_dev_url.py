@@ -26,10 +26,12 @@ def update_app_manifest() -> tuple[int, bool]:
     if url.endswith('/'):
         url = url[:-1]
 
-    url += "/slack/commands"
-
     for i in range(4):
-        prev_manifest["features"]["slash_commands"][i].update({"url": url})
+        prev_manifest["features"]["slash_commands"][i].update(
+            {"url": url + "/slack/commands"})
+    if "event_subscriptions" in prev_manifest.get("settings", {}):
+        prev_manifest["settings"]["event_subscriptions"].update(
+            {"request_url": url + "/slack/events"})
 
     endpoint = "https://slack.com/api/apps.manifest.update/"
     response = requests.post(
@@ -0,0 +1,72 @@
+import threading
+import unittest
+
+from bot.github.coalescer import PushCoalescer
+from bot.models.github import Commit, EventType, Ref, Repository, User
+from bot.models.github.event import GitHubEvent
+
+
+def make_push(branch: str, user: str, *messages: str) -> GitHubEvent:
+    return GitHubEvent(
+        type=EventType.PUSH,
+        repo=Repository(name="org/repo", link="https://github.com/org/repo"),
+        ref=Ref(name=branch),
+        user=User(name=user),
+        commits=tuple(
+            Commit(message=message, sha=message, link=message)
+            for message in messages),
+        commit_count=len(messages),
+    )
+
+
+class PushCoalescerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.forwarded: list[GitHubEvent] = []
+
+    def test_merge_same_branch(self):
+        coalescer = PushCoalescer(self.forwarded.append, window=60)
+        coalescer.add(make_push("main", "first", "a", "b"))
+        coalescer.add(make_push("dev", "first", "c"))
+        coalescer.add(make_push("main", "second", "d"))
+        self.assertEqual([], self.forwarded)
+
+        coalescer.flush()
+        main, dev = self.forwarded
+        self.assertEqual(["a", "b", "d"],
+                         [commit.message for commit in main.commits])
+        self.assertEqual(3, main.commit_count)
+        self.assertEqual("second", main.user.name)
+        self.assertEqual(1, dev.commit_count)
+        self.assertEqual(1, coalescer.stats()["merged"])
+
+    def test_max_commits(self):
+        coalescer = PushCoalescer(self.forwarded.append,
+                                  window=60,
+                                  max_commits=2)
+        coalescer.add(make_push("main", "user", "a", "b"))
+        coalescer.add(make_push("main", "user", "c"))
+        coalescer.flush()
+        self.assertEqual(2, len(self.forwarded[0].commits))
+        self.assertEqual(3, self.forwarded[0].commit_count)
+
+    def test_max_pending(self):
+        coalescer = PushCoalescer(self.forwarded.append,
+                                  window=60,
+                                  max_pending=1)
+        coalescer.add(make_push("main", "user", "a"))
+        coalescer.add(make_push("dev", "user", "b"))
+        self.assertEqual(["main"],
+                         [str(event.ref) for event in self.forwarded])
+        self.assertEqual(1, coalescer.stats()["evicted"])
+
+    def test_window_expiry(self):
+        forwarded = threading.Event()
+        coalescer = PushCoalescer(lambda event: forwarded.set(), window=0.05)
+        coalescer.add(make_push("main", "user", "a"))
+        self.assertTrue(forwarded.wait(5))
+        self.assertEqual(0, coalescer.stats()["pending"])
+
+
+if __name__ == '__main__':
+    unittest.main()
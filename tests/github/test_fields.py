@@ -0,0 +1,100 @@
+import unittest
+
+from bot.github.fields import (
+    combine,
+    compile_event,
+    const,
+    count,
+    each,
+    field,
+    model,
+    one,
+    shared,
+)
+from bot.models.github import Repository
+
+
+class FieldsTest(unittest.TestCase):
+
+    def test_compile_fields(self):
+        extract = compile_event(
+            dict, {
+                "repo":
+                model(
+                    Repository,
+                    name=field("repository.full_name"),
+                    link=field("repository.html_url"),
+                ),
+                "names":
+                each("users", field("login", str.upper)),
+                "status":
+                const("created"),
+                "comments":
+                one(field("comment.body")),
+            })
+
+        fields = extract({
+            "repository": {
+                "full_name": "org/repo",
+                "html_url": "https://github.com/org/repo",
+            },
+            "users": [{
+                "login": "a"
+            }, {
+                "login": "b"
+            }],
+            "comment": {
+                "body": "text"
+            },
+        })
+
+        self.assertEqual("org/repo", fields["repo"].name)
+        self.assertEqual(("A", "B"), fields["names"])
+        self.assertEqual("created", fields["status"])
+        self.assertEqual(("text", ), fields["comments"])
+
+    def test_each_missing(self):
+        extract = compile_event(dict, {"items": each("items", field("id"))})
+        self.assertEqual((), extract({})["items"])
+
+    def test_each_limit(self):
+        extract = compile_event(
+            dict, {
+                "items": each("items", field("id"), limit=2),
+                "total": count("items"),
+            })
+        fields = extract({"items": [{"id": i} for i in range(5)]})
+        self.assertEqual((0, 1), fields["items"])
+        self.assertEqual(5, fields["total"])
+        self.assertEqual(0, extract({})["total"])
+
+    def test_shared_computed_once(self):
+        calls = []
+
+        def count(value):
+            calls.append(value)
+            return value
+
+        link = shared(field("repository.html_url", count))
+        extract = compile_event(
+            dict, {
+                "links":
+                each(
+                    "commits",
+                    combine(lambda base, sha: f"{base}/{sha}", link,
+                            field("id"))),
+            })
+
+        fields = extract({
+            "repository": {
+                "html_url": "url"
+            },
+            "commits": [{
+                "id": "1"
+            }, {
+                "id": "2"
+            }],
+        })
+
+        self.assertEqual(("url/1", "url/2"), fields["links"])
+        self.assertEqual(["url"], calls)
@@ -1,7 +1,15 @@
+import re
 import unittest
 from typing import Any
+from unittest.mock import patch
 
-from bot.github.parser import Parser, convert_links, find_ref
+from bot.github.parser import (
+    MAX_COMMENT_LENGTH,
+    Parser,
+    convert_links,
+    find_ref,
+    preview_comment,
+)
 
 from ..test_utils.deserializers import github_payload_deserializer
 from ..test_utils.load import load_test_data
@@ -68,6 +76,79 @@ class GitHubListenerTest(unittest.TestCase, metaclass=TestMetaClass):
             convert_links(
                 "Some comment text [Link text [Link inside link text](www.example.link.com)](www.xyz.com) text"
             ))
+        self.assertEqual(
+            "<https://x.com/a.png|diagram> and <https://x.com/b.png|image>",
+            convert_links(
+                "![diagram](https://x.com/a.png) and ![](https://x.com/b.png)")
+        )
+        self.assertEqual("Use `[text](url) &lt;b&gt;` here",
+                         convert_links("Use `[text](url) <b>` here"))
+        self.assertEqual(
+            "See <https://www.xyz.com/?a=1&b=2> &amp; 1 &lt; 2",
+            convert_links("See <https://www.xyz.com/?a=1&b=2> & 1 < 2"))
+
+    def test_push_commit_limit(self):
+        payload = {
+            "ref":
+            "refs/heads/main",
+            "repository": {
+                "full_name": "org/repo",
+                "html_url": "https://github.com/org/repo",
+            },
+            "pusher": {
+                "name": "user"
+            },
+            "commits": [{
+                "id": f"{i:040}",
+                "message": f"Summary {i}\n\nBody {i}",
+            } for i in range(5)],
+        }
+        event = Parser(max_push_commits=3).parse("push", payload)
+        # Other parsers keep their own limit
+        default_event = Parser().parse("push", payload)
+
+        self.assertEqual(5, event.commit_count)
+        self.assertEqual(["Summary 0", "Summary 1", "Summary 2"],
+                         [commit.message for commit in event.commits])
+        self.assertEqual(5, len(default_event.commits))
+
+    def test_ping(self):
+        payload = {
+            "zen": "Keep it logically awesome.",
+            "hook_id": 1,
+        }
+        with patch("bot.github.parser.log_event") as log_event:
+            with patch("bot.github.parser.sentry_sdk") as sentry:
+                self.assertIsNone(Parser().parse("ping", payload))
+
+        log_event.assert_called_once()
+        self.assertEqual("ping_received", log_event.call_args.args[1])
+        sentry.capture_message.assert_not_called()
+
+    def test_preview_comment(self):
+        self.assertEqual(
+            "<www.xyz.com|Link text>",
+            preview_comment("[Link text](www.xyz.com)", "https://c.om"))
+        self.assertEqual("", preview_comment(None, "https://c.om"))
+
+        preview = preview_comment("word " * MAX_COMMENT_LENGTH, "https://c.om")
+        self.assertTrue(preview.endswith("word… <https://c.om|read more>"))
+        self.assertLessEqual(len(preview), MAX_COMMENT_LENGTH + 30)
+
+    def test_preview_comment_escapes(self):
+        read_more = "… <https://c.om|read more>"
+        for body in (
+                "List<Map<K, V>> & more " * 80,
+                "<b>" * 1000,
+        ):
+            preview = preview_comment(body, "https://c.om")
+            self.assertTrue(preview.endswith(read_more))
+            self.assertLessEqual(len(preview),
+                                 MAX_COMMENT_LENGTH + len(read_more))
+            text = preview[:-len(read_more)]
+            self.assertNotIn("<", text)
+            # No escape was cut in half
+            self.assertNotIn("&", re.sub("&(amp|lt|gt);", "", text))
 
 
 if __name__ == '__main__':
@@ -0,0 +1,103 @@
+import hashlib
+import hmac
+import unittest
+from unittest.mock import patch
+
+from flask import Flask
+
+from bot.github.parser import Parser
+from bot.github.webhook import WebhookRequest
+from bot.utils.json import decode
+
+SECRET = "secret"
+BODY = b'{"repository": {"full_name": "org/repo"}, "zen": "Keep it simple."}'
+
+
+def sign(body: bytes, secret: str = SECRET) -> str:
+    return "sha256=" + hmac.new(secret.encode(), body,
+                                hashlib.sha256).hexdigest()
+
+
+class WebhookRequestTest(unittest.TestCase):
+
+    def setUp(self):
+        with patch("bot.github.base.GitHubStorage") as storage:
+            storage.return_value.get_secret.return_value = SECRET
+            self.parser = Parser()
+
+    def test_from_flask(self):
+        context = Flask(__name__).test_request_context(
+            method="POST",
+            data=BODY,
+            headers={
+                "X-GitHub-Event": "ping",
+                "X-GitHub-Delivery": "delivery-1",
+                "X-Hub-Signature-256": sign(BODY),
+            },
+        )
+        with context as ctx:
+            webhook = WebhookRequest.from_flask(ctx.request)
+
+        self.assertEqual("ping", webhook.event_type)
+        self.assertEqual("delivery-1", webhook.delivery_id)
+        self.assertEqual(sign(BODY), webhook.signature)
+        self.assertEqual(BODY, webhook.body)
+
+    def test_decoded_once(self):
+        webhook = WebhookRequest("ping", "delivery-1", sign(BODY), BODY)
+
+        with patch("bot.github.webhook.decode", wraps=decode) as mock_decode:
+            self.assertEqual((True, "Request is secure and valid"),
+                             self.parser.verify(webhook))
+            self.assertEqual("Keep it simple.", webhook.json["zen"])
+            self.assertEqual("org/repo",
+                             webhook.json["repository"]["full_name"])
+
+        mock_decode.assert_called_once()
+
+    def test_release_body(self):
+        webhook = WebhookRequest("ping", "delivery-1", sign(BODY), BODY)
+
+        self.parser.verify(webhook)
+
+        self.assertIsNone(webhook.body)
+        self.assertEqual("Keep it simple.", webhook.json["zen"])
+
+    def test_release_body_before_decoding(self):
+        webhook = WebhookRequest("ping", "delivery-1", sign(BODY), BODY)
+
+        webhook.release_body()
+
+        self.assertIsNone(webhook.body)
+        self.assertEqual("Keep it simple.", webhook.json["zen"])
+
+    def test_invalid_body(self):
+        for body in (b"{not json", b"[1, 2]", b"null", b'"text"'):
+            webhook = WebhookRequest("push", "delivery-1", sign(body), body)
+            with patch("bot.github.webhook.decode",
+                       wraps=decode) as mock_decode:
+                self.assertEqual(
+                    (False, "Payload is not a valid JSON object"),
+                    self.parser.verify(webhook),
+                )
+                self.assertLessEqual(mock_decode.call_count, 1)
+
+    def test_missing_signature(self):
+        webhook = WebhookRequest("push", "delivery-1", None, BODY)
+
+        self.assertEqual((False, "Request headers are imperfect"),
+                         self.parser.verify(webhook))
+        # Nothing was decoded for a request that can't be verified
+        self.assertEqual(BODY, webhook.body)
+
+    def test_wrong_signature(self):
+        webhook = WebhookRequest("push", "delivery-1",
+                                 sign(BODY, "other-secret"), BODY)
+
+        self.assertEqual((False, "Payload data is imperfect"),
+                         self.parser.verify(webhook))
+        self.assertIsNone(webhook.body)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -9,3 +9,7 @@ class MockSlackBotBase:
     def __init__(self, _: str):
         self.storage = MockSubscriptionStorage()
         self.client = None
+        self.discarded_digests: list[tuple[str, str]] = []
+
+    def discard_digest(self, channel: str, repository: str):
+        self.discarded_digests.append((channel, repository))
@@ -0,0 +1,25 @@
+from bot.slack.messenger import Messenger
+
+from .base import MockSlackBotBase
+
+
+def _init_testable_messenger(
+    self,
+    token,
+    outbox_workers=0,
+    rate_limiter=None,
+    fanout_workers=1,
+    digests=False,
+):
+    MockSlackBotBase.__init__(self, token)
+    self._init_messenger(outbox_workers, rate_limiter, fanout_workers, digests)
+
+
+TestableMessenger = type(
+    'TestableMessenger',
+    (MockSlackBotBase, ),
+    {
+        **Messenger.__dict__,
+        "__init__": _init_testable_messenger,
+    },
+)
@@ -2,8 +2,25 @@ from bot.slack.runner import Runner
 
 from .base import MockSlackBotBase
 
+
+def _init_testable_runner(
+    self,
+    logger,
+    base_url,
+    secret,
+    token,
+    bot_id,
+    membership_ttl=60 * 60,
+):
+    MockSlackBotBase.__init__(self, token)
+    self._init_runner(logger, base_url, secret, bot_id, membership_ttl)
+
+
 TestableRunner = type(
     'TestableRunner',
     (MockSlackBotBase, ),
-    dict(Runner.__dict__),
+    {
+        **Runner.__dict__,
+        "__init__": _init_testable_runner,
+    },
 )
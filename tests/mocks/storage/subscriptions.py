@@ -1,12 +1,13 @@
 from typing import NamedTuple, Optional
 
-from bot.models.github import EventType
+from bot.models.github import EventType, convert_events_to_bitmask
 
 
 class Subscription(NamedTuple):
     channel: str
     repository: str
-    events: set[EventType]
+    events: int
+    digest: Optional[str] = None
 
 
 class MockSubscriptionStorage:
@@ -17,7 +18,7 @@ class MockSubscriptionStorage:
                 Subscription(
                     "workspace#selene",
                     "BURG3R5/github-slack-bot",
-                    set(EventType),
+                    convert_events_to_bitmask(EventType),
                 )
             ]
         else:
@@ -36,3 +37,39 @@ class MockSubscriptionStorage:
             shortlist = (sub for sub in self.subscriptions
                          if sub.repository == repository)
         return tuple(shortlist)
+
+    def get_channels(
+        self,
+        repository: str,
+        event_type: EventType,
+    ) -> tuple[str, ...]:
+        return tuple(sub.channel for sub in self.subscriptions
+                     if sub.repository == repository and sub.digest is None
+                     and sub.events & event_type.bit)
+
+    def get_digest_channels(
+        self,
+        repository: str,
+        event_type: EventType,
+    ) -> tuple[tuple[str, str], ...]:
+        return tuple((sub.channel, sub.digest) for sub in self.subscriptions
+                     if sub.repository == repository and sub.digest is not None
+                     and sub.events & event_type.bit)
+
+    def update_subscription(
+        self,
+        channel: str,
+        repository: str,
+        events: int,
+        digest: Optional[str] = None,
+    ):
+        self.subscriptions = [
+            sub for sub in self.subscriptions
+            if (sub.channel, sub.repository) != (channel, repository)
+        ] + [Subscription(channel, repository, events, digest)]
+
+    def remove_subscription(self, channel: str, repository: str):
+        self.subscriptions = [
+            sub for sub in self.subscriptions
+            if (sub.channel, sub.repository) != (channel, repository)
+        ]
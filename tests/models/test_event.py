@@ -0,0 +1,44 @@
+import unittest
+from dataclasses import FrozenInstanceError
+
+from bot.models.github import Commit, EventType, Repository, User
+from bot.models.github.event import GitHubEvent
+
+
+class GitHubEventTest(unittest.TestCase):
+
+    def make_event(self) -> GitHubEvent:
+        return GitHubEvent(
+            type=EventType.PUSH,
+            repo=Repository(name="org/repo",
+                            link="https://github.com/org/repo"),
+            user=User(name="user"),
+            commits=(Commit(message="Message", sha="12345678", link="link"), ),
+            commit_count=1,
+        )
+
+    def test_equality(self):
+        event = self.make_event()
+        self.assertEqual(self.make_event(), event)
+        self.assertEqual(hash(self.make_event()), hash(event))
+        self.assertEqual(1, len({event, self.make_event()}))
+
+    def test_frozen(self):
+        event = self.make_event()
+        with self.assertRaises(FrozenInstanceError):
+            event.status = "approved"
+        self.assertFalse(hasattr(event, "__dict__"))
+
+    def test_defaults(self):
+        event = self.make_event()
+        self.assertIsNone(event.pull_request)
+        self.assertEqual("https://github.com/user", event.user.link)
+        self.assertEqual(
+            "(type=EventType.PUSH, repo=<https://github.com/org/repo|org/repo>, "
+            "user=<https://github.com/user|user>, commits=['<Message|link>'], commit_count=1)",
+            str(event),
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,28 @@
+import unittest
+
+from bot.models.github import (
+    EventType,
+    convert_bitmask_to_events,
+    convert_events_to_bitmask,
+)
+
+
+class EventTypeTest(unittest.TestCase):
+
+    def test_bits_unique(self):
+        bits = [event_type.bit for event_type in EventType]
+        self.assertEqual(len(bits), len(set(bits)))
+
+    def test_bitmask_round_trip(self):
+        events = [EventType.BRANCH_CREATED, EventType.PUSH, EventType.FORK]
+
+        bitmask = convert_events_to_bitmask(events)
+
+        self.assertEqual(
+            [EventType.BRANCH_CREATED, EventType.FORK, EventType.PUSH],
+            convert_bitmask_to_events(bitmask),
+        )
+
+    def test_bitmask_empty(self):
+        self.assertEqual(0, convert_events_to_bitmask([]))
+        self.assertEqual([], convert_bitmask_to_events(0))
@@ -0,0 +1,38 @@
+import unittest
+
+from bot.models.github import EventType, Repository
+from bot.models.github.event import GitHubEvent
+from bot.slack.digest import render_digest, summarize_event
+from bot.slack.renderers import MAX_DETAILS_LENGTH
+from bot.storage.digests import DigestEntry
+
+
+class DigestTest(unittest.TestCase):
+
+    def test_summarize_event(self):
+        event = GitHubEvent(
+            type=EventType.ISSUE_OPENED,
+            repo=Repository(name="org/repo",
+                            link="https://github.com/org/repo"),
+        )
+        self.assertEqual(
+            "`org/repo` Issue opened by user: <link|#3 Title>",
+            summarize_event(event, "Issue opened by user:\n><link|#3 Title>"),
+        )
+
+    def test_render_digest(self):
+        entries = [DigestEntry(summary="first"), DigestEntry(summary="second")]
+        self.assertEqual(
+            "*Hourly digest*: 2 events\n• first\n• second",
+            render_digest("hourly", entries),
+        )
+
+    def test_render_long_digest(self):
+        entries = [DigestEntry(summary="x" * 100) for _ in range(100)]
+        digest = render_digest("daily", entries)
+        self.assertLessEqual(len(digest), MAX_DETAILS_LENGTH)
+        self.assertTrue(digest.endswith("more"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+from unittest.mock import MagicMock
+
+from bot.slack.membership import MembershipCache
+
+
+class MembershipCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.client = MagicMock()
+        self.client.conversations_members.side_effect = [
+            {
+                "members": ["U1", "U2"],
+                "response_metadata": {
+                    "next_cursor": "page2"
+                },
+            },
+            {
+                "members": ["B0123456789"],
+                "response_metadata": {
+                    "next_cursor": ""
+                },
+            },
+        ]
+        self.cache = MembershipCache(self.client, "B0123456789")
+
+    def test_fetch_follows_cursor(self):
+        self.assertTrue(self.cache.is_member("C1"))
+        self.assertEqual(2, self.client.conversations_members.call_count)
+        self.client.conversations_members.assert_called_with(
+            channel="C1",
+            cursor="page2",
+            limit=MembershipCache.PAGE_SIZE,
+        )
+
+    def test_cached_lookup(self):
+        self.cache.is_member("C1")
+        self.assertTrue(self.cache.is_member("C1"))
+        self.assertEqual(1, self.cache.fetches)
+
+    def test_expired_entry_is_fetched(self):
+        self.cache = MembershipCache(self.client, "B0123456789", ttl=-1)
+        self.cache.set_member("C1", False)
+        self.assertTrue(self.cache.is_member("C1"))
+        self.assertEqual(1, self.cache.fetches)
+
+    def test_set_member_skips_fetch(self):
+        self.cache.set_member("C1", False)
+        self.assertFalse(self.cache.is_member("C1"))
+        self.client.conversations_members.assert_not_called()
+
+    def test_evicts_least_recently_used(self):
+        self.cache = MembershipCache(self.client,
+                                     "B0123456789",
+                                     max_channels=2)
+        self.cache.set_member("C1", True)
+        self.cache.set_member("C2", True)
+        self.cache.is_member("C1")
+        self.cache.set_member("C3", True)
+        self.assertEqual(["C1", "C3"], self.cache._channels.keys())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,201 @@
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from slack.errors import SlackApiError
+
+from bot.models.github import (
+    Commit,
+    EventType,
+    Ref,
+    Repository,
+    User,
+    convert_events_to_bitmask,
+)
+from bot.models.github.event import GitHubEvent
+from bot.slack.messenger import Messenger
+
+from ..mocks.slack.messenger import TestableMessenger
+from ..mocks.storage import MockSubscriptionStorage
+from ..mocks.storage.subscriptions import Subscription
+
+CHANNELS = ("T#C1", "T#C2", "T#C3", "T#C4", "T#C5")
+
+
+class MessengerTest(unittest.TestCase):
+
+    def setUp(self):
+        # Pushes come with details, posted as a reply to the main message
+        self.event = GitHubEvent(
+            type=EventType.PUSH,
+            repo=Repository(name="org/repo",
+                            link="https://github.com/org/repo"),
+            ref=Ref(name="main"),
+            user=User(name="user"),
+            commits=(Commit(message="Message", sha="abc1234", link="link"), ),
+            commit_count=1,
+        )
+
+    def create_messenger(self, fanout_workers: int) -> TestableMessenger:
+        messenger = TestableMessenger("token", fanout_workers=fanout_workers)
+        messenger.storage = MockSubscriptionStorage([
+            Subscription(channel, "org/repo",
+                         convert_events_to_bitmask({EventType.PUSH}))
+            for channel in CHANNELS
+        ])
+        if messenger.fanout_executor is not None:
+            self.addCleanup(messenger.fanout_executor.shutdown)
+        return messenger
+
+    def record_posts(self, messenger: TestableMessenger) -> list[tuple]:
+        """
+        Replaces the posting methods of `messenger` by ones that record their calls, taking a little time each.
+        :return: List of ("main", channel) and ("reply", channel, thread_ts) entries, in order of posting.
+        """
+        posts: list[tuple] = []
+        lock = threading.Lock()
+
+        def send_main_message(channel, blocks):
+            time.sleep(0.01)
+            with lock:
+                posts.append(("main", channel))
+            return f"ts-{channel}"
+
+        def send_thread_reply(channel, blocks, thread_ts):
+            with lock:
+                posts.append(("reply", channel, thread_ts))
+
+        messenger.send_main_message = send_main_message
+        messenger.send_thread_reply = send_thread_reply
+        return posts
+
+    def test_inform_fanout(self):
+        messenger = self.create_messenger(fanout_workers=8)
+        posts = self.record_posts(messenger)
+
+        messenger.inform(self.event)
+
+        self.assertEqual(2 * len(CHANNELS), len(posts))
+        for channel in CHANNELS:
+            main = posts.index(("main", channel))
+            reply = posts.index(("reply", channel, f"ts-{channel}"))
+            self.assertLess(main, reply)
+
+    def test_inform_worker_cap(self):
+        messenger = self.create_messenger(fanout_workers=2)
+        running = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def send_payload(channel, payload):
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.02)
+            with lock:
+                running -= 1
+
+        messenger.send_payload = send_payload
+        messenger.inform(self.event)
+
+        self.assertEqual(2, peak)
+
+    def test_inform_error_in_one_channel(self):
+        messenger = self.create_messenger(fanout_workers=8)
+        sent = []
+
+        def send_payload(channel, payload):
+            if channel == "T#C2":
+                raise SlackApiError("channel_not_found", MagicMock())
+            sent.append(channel)
+
+        messenger.send_payload = send_payload
+        with patch("bot.slack.messenger.sentry_sdk") as sentry:
+            messenger.inform(self.event)
+
+        self.assertEqual(set(CHANNELS) - {"T#C2"}, set(sent))
+        sentry.capture_exception.assert_called_once()
+
+    def test_inform_sequential(self):
+        messenger = self.create_messenger(fanout_workers=1)
+        self.assertIsNone(messenger.fanout_executor)
+        posts = self.record_posts(messenger)
+        threads = set()
+        send_main_message = messenger.send_main_message
+
+        def record_thread(channel, blocks):
+            threads.add(threading.current_thread())
+            return send_main_message(channel, blocks)
+
+        messenger.send_main_message = record_thread
+        messenger.inform(self.event)
+
+        self.assertEqual({threading.current_thread()}, threads)
+        self.assertEqual(
+            [
+                post for channel in CHANNELS
+                for post in (("main", channel),
+                             ("reply", channel, f"ts-{channel}"))
+            ],
+            posts,
+        )
+
+    def test_inform_after_executor_shutdown(self):
+        messenger = self.create_messenger(fanout_workers=8)
+        messenger.fanout_executor.shutdown()
+
+        with patch.object(messenger, "send_payload") as send_payload:
+            messenger.inform(self.event)
+
+        self.assertEqual(
+            set(CHANNELS),
+            {call.args[0]
+             for call in send_payload.call_args_list},
+        )
+
+    def test_post_message_retries_rate_limited(self):
+        messenger = self.create_messenger(fanout_workers=1)
+        messenger.rate_limiter = MagicMock()
+        rate_limited = MagicMock(status_code=429, headers={"Retry-After": "7"})
+        messenger.client = MagicMock()
+        messenger.client.chat_postMessage.side_effect = [
+            SlackApiError("ratelimited", rate_limited),
+            "posted",
+        ]
+
+        self.assertEqual("posted", messenger.post_message("C1", text="text"))
+
+        messenger.rate_limiter.pause.assert_called_once_with("C1", 7.0)
+        self.assertEqual(2, messenger.rate_limiter.wait.call_count)
+        self.assertEqual(2, messenger.client.chat_postMessage.call_count)
+
+    def test_post_message_gives_up(self):
+        messenger = self.create_messenger(fanout_workers=1)
+        messenger.rate_limiter = MagicMock()
+        rate_limited = MagicMock(status_code=429, headers={"Retry-After": "1"})
+        messenger.client = MagicMock()
+        messenger.client.chat_postMessage.side_effect = SlackApiError(
+            "ratelimited", rate_limited)
+
+        with self.assertRaises(SlackApiError):
+            messenger.post_message("C1", text="text")
+
+        self.assertEqual(Messenger.MAX_RATE_LIMITED_RETRIES + 1,
+                         messenger.client.chat_postMessage.call_count)
+        self.assertEqual(Messenger.MAX_RATE_LIMITED_RETRIES,
+                         messenger.rate_limiter.pause.call_count)
+
+    def test_post_message_other_errors(self):
+        messenger = self.create_messenger(fanout_workers=1)
+        messenger.rate_limiter = MagicMock()
+        messenger.client = MagicMock()
+        messenger.client.chat_postMessage.side_effect = SlackApiError(
+            "channel_not_found", MagicMock(status_code=404, headers={}))
+
+        with self.assertRaises(SlackApiError):
+            messenger.post_message("C1", text="text")
+
+        messenger.rate_limiter.pause.assert_not_called()
+        self.assertEqual(1, messenger.client.chat_postMessage.call_count)
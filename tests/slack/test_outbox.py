@@ -0,0 +1,94 @@
+import time
+from unittest.mock import MagicMock
+
+from bot.slack.outbox import Outbox
+from bot.slack.payload import serialize_blocks
+from bot.storage.outbox import Delivery
+
+from ..test_utils.storage import StorageTestCase
+
+
+class OutboxTest(StorageTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.send_message = MagicMock(return_value="1700000000.000100")
+        self.send_reply = MagicMock()
+        # No sender threads, deliveries are attempted by the tests
+        self.outbox = Outbox(
+            send_message=self.send_message,
+            send_reply=self.send_reply,
+            workers=0,
+            max_attempts=2,
+        )
+
+    def claim(self):
+        return self.outbox.storage.claim_deliveries(limit=10, lease=-1)
+
+    def test_attempt(self):
+        self.outbox.add([("T#C1", "message", "details")])
+        delivery, = self.claim()
+        self.outbox._attempt(delivery)
+
+        self.send_message.assert_called_once_with("T#C1",
+                                                  serialize_blocks("message"))
+        self.send_reply.assert_called_once_with("T#C1",
+                                                serialize_blocks("details"),
+                                                "1700000000.000100")
+        self.assertEqual((), self.claim())
+        self.assertEqual(1, self.outbox.stats()["sent"])
+        self.assertEqual(1, self.outbox.stats()["drain_rate_per_minute"])
+
+    def test_failed_reply_is_retried_alone(self):
+        self.outbox.add([("T#C1", "message", "details")])
+        self.send_reply.side_effect = [Exception("Slack is down"), None]
+
+        delivery, = self.claim()
+        self.outbox._attempt(delivery)
+        self.outbox.storage.reschedule_delivery(delivery.id, 1, time.time(),
+                                                "error")
+        delivery, = self.claim()
+        self.assertEqual("1700000000.000100", delivery.thread_ts)
+        self.outbox._attempt(delivery)
+
+        # The main message is only posted once
+        self.send_message.assert_called_once()
+        self.assertEqual(2, self.send_reply.call_count)
+        self.assertEqual("1700000000.000100",
+                         self.send_reply.call_args.args[2])
+        self.assertEqual((), self.claim())
+
+    def test_retry_backoff(self):
+        self.outbox.add([("T#C1", "message", None)])
+        self.send_message.side_effect = Exception("Slack is down")
+
+        delivery, = self.claim()
+        before = time.time()
+        self.outbox._attempt(delivery)
+
+        stored = Delivery.get_by_id(delivery.id)
+        self.assertEqual(1, stored.attempts)
+        self.assertGreaterEqual(stored.next_attempt_at,
+                                before + Outbox.RETRY_BASE)
+        self.assertEqual("Exception('Slack is down')", stored.last_error)
+
+        stats = self.outbox.stats()
+        self.assertEqual(1, stats["retried"])
+        self.assertEqual(1, stats["retrying"])
+
+    def test_gives_up_after_max_attempts(self):
+        self.outbox.add([("T#C1", "message", None)])
+        self.send_message.side_effect = Exception("Slack is down")
+
+        delivery, = self.claim()
+        self.outbox._attempt(delivery)
+        self.outbox.storage.reschedule_delivery(delivery.id, 1, time.time(),
+                                                "error")
+        delivery, = self.claim()
+        self.outbox._attempt(delivery)
+
+        self.assertEqual((), self.claim())
+        stats = self.outbox.stats()
+        self.assertEqual(1, stats["given_up"])
+        self.assertEqual(1, stats["dead"])
+        self.assertEqual(0, stats["pending"])
@@ -0,0 +1,33 @@
+import json
+import unittest
+
+from bot.slack.payload import SlackPayload
+
+
+class SlackPayloadTest(unittest.TestCase):
+
+    def test_render(self):
+        payload = SlackPayload.render("Message", "Details")
+        self.assertEqual(
+            [{
+                "type": "section",
+                "text": {
+                    "type": "mrkdwn",
+                    "text": "Message",
+                },
+            }],
+            json.loads(payload.message_blocks),
+        )
+        self.assertEqual(
+            "Details",
+            json.loads(payload.details_blocks)[0]["text"]["text"],
+        )
+
+    def test_render_without_details(self):
+        payload = SlackPayload.render("Message", None)
+        self.assertIsNone(payload.details)
+        self.assertIsNone(payload.details_blocks)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+
+from bot.slack.rate_limit import RateLimiter, TokenBucket
+
+
+class TokenBucketTest(unittest.TestCase):
+
+    def test_burst_then_wait(self):
+        bucket = TokenBucket(rate=1, capacity=2)
+        now = bucket.updated
+
+        self.assertEqual(0, bucket.reserve(now))
+        self.assertEqual(0, bucket.reserve(now))
+        self.assertAlmostEqual(1, bucket.reserve(now))
+        self.assertAlmostEqual(2, bucket.reserve(now))
+
+    def test_refill(self):
+        bucket = TokenBucket(rate=2, capacity=1)
+        now = bucket.updated
+
+        self.assertEqual(0, bucket.reserve(now))
+        self.assertAlmostEqual(0.5, bucket.reserve(now))
+        self.assertEqual(0, bucket.reserve(now + 1))
+
+    def test_pause(self):
+        bucket = TokenBucket(rate=1, capacity=1)
+        now = bucket.updated
+
+        bucket.pause(now, 30)
+
+        self.assertAlmostEqual(30, bucket.reserve(now))
+        self.assertAlmostEqual(31, bucket.reserve(now))
+        self.assertAlmostEqual(0, bucket.reserve(now + 32))
+
+
+class RateLimiterTest(unittest.TestCase):
+
+    def test_channels_are_independent(self):
+        limiter = RateLimiter(channel_rate=1,
+                              global_rate=100,
+                              global_burst=100)
+
+        self.assertEqual(0, limiter.delay("C1"))
+        self.assertEqual(0, limiter.delay("C2"))
+        self.assertGreater(limiter.delay("C1"), 0.9)
+
+    def test_global_budget(self):
+        limiter = RateLimiter(channel_rate=100, global_rate=1, global_burst=2)
+
+        self.assertEqual(0, limiter.delay("C1"))
+        self.assertEqual(0, limiter.delay("C2"))
+        self.assertGreater(limiter.delay("C3"), 0.9)
+
+    def test_pause(self):
+        limiter = RateLimiter(channel_rate=100,
+                              global_rate=100,
+                              global_burst=100)
+
+        limiter.pause("C1", retry_after=30)
+
+        self.assertGreater(limiter.delay("C1"), 29)
+        self.assertEqual(0, limiter.delay("C2"))
+
+    def test_pause_resumes_at_channel_rate(self):
+        limiter = RateLimiter(channel_rate=1,
+                              global_rate=100,
+                              global_burst=100)
+
+        limiter.pause("C1", retry_after=30)
+
+        delays = [limiter.delay("C1") for _ in range(8)]
+        for i, delay in enumerate(delays):
+            self.assertAlmostEqual(30 + i, delay, delta=0.1)
@@ -0,0 +1,92 @@
+import json
+import os
+import tempfile
+import unittest
+
+from bot.models.github import EventType, PullRequest, Repository, User
+from bot.models.github.event import GitHubEvent
+from bot.slack.renderers import RENDERERS, compile_template, load_templates, render
+
+
+class RenderersTest(unittest.TestCase):
+
+    def setUp(self):
+        self.defaults = dict(RENDERERS)
+        self.event = GitHubEvent(
+            type=EventType.PULL_OPENED,
+            repo=Repository(name="org/repo",
+                            link="https://github.com/org/repo"),
+            user=User(name="user"),
+            pull_request=PullRequest(title="Title", number=3, link="link"),
+        )
+
+    def tearDown(self):
+        RENDERERS.clear()
+        RENDERERS.update(self.defaults)
+
+    def write_templates(self, templates: dict) -> str:
+        file = tempfile.NamedTemporaryFile("w", suffix=".json", delete=False)
+        with file:
+            json.dump(templates, file)
+        self.addCleanup(os.remove, file.name)
+        return file.name
+
+    def test_every_event_type_has_renderer(self):
+        self.assertEqual(set(EventType), set(RENDERERS))
+
+    def test_default_renderer(self):
+        self.assertEqual(
+            ("PR opened by <https://github.com/user|user>:\n>"
+             "<link|#3 Title>", None),
+            render(self.event),
+        )
+
+    def test_compile_template(self):
+        render_template = compile_template("#{number:>4} {title} in {ref}")
+        self.assertEqual("#   3 Title in ", render_template(self.event))
+
+        # Format specs apply to the text of every value
+        render_template = compile_template("{repo_name:>10}|{title:.3}")
+        self.assertEqual("  org/repo|Tit", render_template(self.event))
+
+        with self.assertRaises(ValueError):
+            compile_template("{unknown}")
+        with self.assertRaises(ValueError):
+            compile_template("{user!r}")
+        with self.assertRaises(ValueError):
+            compile_template("{user")
+        with self.assertRaises(ValueError):
+            compile_template("{number:zz}")
+        with self.assertRaises(ValueError):
+            compile_template("{number:d}")
+
+    def test_load_templates(self):
+        load_templates(
+            self.write_templates({
+                "PULL_OPENED": {
+                    "message": "New PR: {title}",
+                    "details": "{link}",
+                },
+            }))
+        self.assertEqual(("New PR: Title", None), render(self.event))
+
+    def test_load_invalid_templates(self):
+        path = self.write_templates({
+            "PULL_CLOSED": {
+                "message": "Closed: {title}"
+            },
+            "PULL_OPENED": {
+                "message": "{unknown}"
+            },
+        })
+        with self.assertRaises(ValueError):
+            load_templates(path)
+        # Nothing is registered from an invalid file
+        self.assertEqual(self.defaults, RENDERERS)
+
+        with self.assertRaises(ValueError):
+            load_templates(self.write_templates({"NOT_AN_EVENT": {}}))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -10,6 +10,7 @@ from bot.utils.log import Logger
 
 from ..mocks.slack.runner import TestableRunner
 from ..mocks.storage import MockSubscriptionStorage
+from ..mocks.storage.subscriptions import Subscription
 from ..test_utils.comparators import Comparators
 from ..test_utils.deserializers import subscriptions_deserializer
 from ..test_utils.load import load_test_data
@@ -100,6 +101,173 @@ class RunnerTest(unittest.TestCase):
             self.assertIsNone(self.runner.run(raw_json))
         mock_logger.assert_not_called()
 
+    def test_run_deferred(self):
+        raw_json = ImmutableMultiDict({
+            "channel_id":
+            "selene",
+            "team_id":
+            "workspace",
+            "user_id":
+            "USER101",
+            "command":
+            "/sel-list",
+            "text":
+            "",
+            "response_url":
+            "https://hooks.slack.com/commands/T0/1/abc",
+        })
+
+        with patch("bot.slack.runner.requests.post") as post:
+            self.runner.run_deferred(raw_json)
+
+        post.assert_called_once()
+        self.assertEqual("https://hooks.slack.com/commands/T0/1/abc",
+                         post.call_args.args[0])
+        self.assertEqual("in_channel",
+                         post.call_args.kwargs["json"]["response_type"])
+        self.assertFalse(post.call_args.kwargs["json"]["replace_original"])
+        self.assertGreaterEqual(
+            self.runner.command_stats()["/sel-list"]["runs"], 1)
+
+    def test_run_deferred_unexpected_url(self):
+        raw_json = ImmutableMultiDict({
+            "channel_id": "selene",
+            "team_id": "workspace",
+            "user_id": "USER101",
+            "command": "/sel-list",
+            "text": "",
+            "response_url": "https://example.com/",
+        })
+
+        with patch("bot.slack.runner.requests.post") as post:
+            self.runner.run_deferred(raw_json)
+
+        post.assert_not_called()
+
+    def test_run_deferred_error(self):
+        raw_json = ImmutableMultiDict({
+            "channel_id":
+            "selene",
+            "team_id":
+            "workspace",
+            "user_id":
+            "USER101",
+            "command":
+            "/sel-list",
+            "text":
+            "",
+            "response_url":
+            "https://hooks.slack.com/commands/T0/1/abc",
+        })
+
+        with patch("bot.slack.runner.requests.post") as post:
+            with patch.object(self.runner,
+                              "run",
+                              side_effect=RuntimeError("Storage is down")):
+                with patch("bot.slack.runner.capture_exception") as capture:
+                    self.runner.run_deferred(raw_json)
+
+        capture.assert_called_once()
+        post.assert_called_once()
+        self.assertEqual("https://hooks.slack.com/commands/T0/1/abc",
+                         post.call_args.args[0])
+        self.assertEqual("ephemeral",
+                         post.call_args.kwargs["json"]["response_type"])
+        self.assertTrue(post.call_args.kwargs["json"]["replace_original"])
+        self.assertIn("attachments", post.call_args.kwargs["json"])
+
+    def test_subscribe_digest(self):
+        self.runner.run_subscribe_command(
+            current_channel="workspace#selene",
+            user_id="USER101",
+            args=["BURG3R5/github-slack-bot", "p", "--digest", "hourly"],
+        )
+        subscription, = self.runner.storage.get_subscriptions(
+            channel="workspace#selene")
+        self.assertEqual("hourly", subscription.digest)
+
+        # The delivery mode is kept, unless it is changed explicitly
+        self.runner.run_subscribe_command(
+            current_channel="workspace#selene",
+            user_id="USER101",
+            args=["BURG3R5/github-slack-bot", "isc"],
+        )
+        subscription, = self.runner.storage.get_subscriptions(
+            channel="workspace#selene")
+        self.assertEqual("hourly", subscription.digest)
+
+        self.runner.run_subscribe_command(
+            current_channel="workspace#selene",
+            user_id="USER101",
+            args=["BURG3R5/github-slack-bot", "--digest", "off"],
+        )
+        subscription, = self.runner.storage.get_subscriptions(
+            channel="workspace#selene")
+        self.assertIsNone(subscription.digest)
+
+    def test_subscribe_digest_off_discards_buffer(self):
+        self.runner.storage = MockSubscriptionStorage([
+            Subscription("workspace#selene", "BURG3R5/github-slack-bot", 1,
+                         "hourly"),
+        ])
+        self.runner.discarded_digests = []
+
+        self.runner.run_subscribe_command(
+            current_channel="workspace#selene",
+            user_id="USER101",
+            args=["BURG3R5/github-slack-bot", "--digest", "off"],
+        )
+
+        self.assertEqual(
+            [("workspace#selene", "BURG3R5/github-slack-bot")],
+            self.runner.discarded_digests,
+        )
+
+    def test_unsubscribe_keeps_digest(self):
+        self.runner.storage = MockSubscriptionStorage([
+            Subscription("workspace#selene", "BURG3R5/github-slack-bot", 3,
+                         "daily"),
+        ])
+        self.runner.discarded_digests = []
+
+        self.runner.run_unsubscribe_command(
+            current_channel="workspace#selene",
+            args=["BURG3R5/github-slack-bot", "bc"],
+        )
+
+        subscription, = self.runner.storage.get_subscriptions(
+            channel="workspace#selene")
+        self.assertEqual(2, subscription.events)
+        self.assertEqual("daily", subscription.digest)
+        self.assertEqual([], self.runner.discarded_digests)
+
+    def test_unsubscribe_all_discards_buffer(self):
+        self.runner.storage = MockSubscriptionStorage([
+            Subscription("workspace#selene", "BURG3R5/github-slack-bot", 1,
+                         "daily"),
+        ])
+        self.runner.discarded_digests = []
+
+        self.runner.run_unsubscribe_command(
+            current_channel="workspace#selene",
+            args=["BURG3R5/github-slack-bot", "bc"],
+        )
+
+        self.assertEqual((), self.runner.storage.get_subscriptions())
+        self.assertEqual(
+            [("workspace#selene", "BURG3R5/github-slack-bot")],
+            self.runner.discarded_digests,
+        )
+
+    def test_subscribe_unknown_digest(self):
+        response = self.runner.run_subscribe_command(
+            current_channel="workspace#selene",
+            user_id="USER101",
+            args=["BURG3R5/github-slack-bot", "--digest", "weekly"],
+        )
+        self.assertEqual("ephemeral", response["response_type"])
+        self.assertIsNone(self.runner.storage.subscriptions[0].digest)
+
     @skip('This test is being skipped for the current PR')
     def test_unsubscribe_single_event(self):
         response = self.runner.run_unsubscribe_command(
@@ -285,6 +453,29 @@ class RunnerTest(unittest.TestCase):
         response = self.runner.run_help_command([])
         self.assertEqual(self.data["run_help_command"][1], response)
 
+    def test_handle_event_updates_membership(self):
+        self.runner.handle_event({
+            "type": "event_callback",
+            "event": {
+                "type": "member_joined_channel",
+                "user": "B0123456789",
+                "channel": "C0123456789",
+            },
+        })
+        self.assertTrue(
+            self.runner.check_bot_in_channel("workspace#C0123456789"))
+
+        self.runner.handle_event({
+            "type": "event_callback",
+            "event": {
+                "type": "member_left_channel",
+                "user": "B0123456789",
+                "channel": "C0123456789",
+            },
+        })
+        self.assertFalse(
+            self.runner.check_bot_in_channel("workspace#C0123456789"))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,54 @@
+from unittest.mock import patch
+
+from bot.storage.deliveries import DeliveryStorage
+
+from ..test_utils.storage import StorageTestCase
+
+
+class DeliveryStorageTest(StorageTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.storage = DeliveryStorage(ttl=60)
+
+    def test_first_seen(self):
+        self.assertTrue(self.storage.record_delivery("delivery-1"))
+        self.assertTrue(self.storage.record_delivery("delivery-2"))
+
+    def test_duplicate(self):
+        self.storage.record_delivery("delivery-1")
+        self.assertFalse(self.storage.record_delivery("delivery-1"))
+
+    def test_duplicate_after_cache_cleared(self):
+        self.storage.record_delivery("delivery-1")
+        # e.g. after a restart, or an eviction
+        self.storage._seen.clear()
+        self.assertFalse(self.storage.record_delivery("delivery-1"))
+
+    def test_expired(self):
+        with patch("time.time", return_value=1000):
+            self.storage.record_delivery("delivery-1")
+        self.storage._seen.clear()
+
+        with patch("time.time", return_value=1061):
+            self.assertTrue(self.storage.record_delivery("delivery-1"))
+            self.assertFalse(self.storage.record_delivery("delivery-1"))
+
+    def test_expired_in_cache(self):
+        with patch("time.time", return_value=1000), \
+                patch("time.monotonic", return_value=1000):
+            self.storage.record_delivery("delivery-1")
+        with patch("time.time", return_value=1061), \
+                patch("time.monotonic", return_value=1061):
+            self.assertTrue(self.storage.record_delivery("delivery-1"))
+
+    def test_forget_delivery(self):
+        self.storage.record_delivery("delivery-1")
+        self.storage.forget_delivery("delivery-1")
+        self.assertTrue(self.storage.record_delivery("delivery-1"))
+
+    def test_cache_is_bounded(self):
+        storage = DeliveryStorage(ttl=60, max_cached=2)
+        for delivery_id in ("delivery-1", "delivery-2", "delivery-3"):
+            storage.record_delivery(delivery_id)
+        self.assertEqual(["delivery-2", "delivery-3"], storage._seen.keys())
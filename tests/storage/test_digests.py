@@ -0,0 +1,39 @@
+import time
+
+from bot.storage.digests import DigestStorage
+
+from ..test_utils.storage import StorageTestCase
+
+
+class DigestStorageTest(StorageTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.storage = DigestStorage()
+
+    def test_get_due_entries(self):
+        self.storage.add_entries([
+            ("T#C1", "hourly", "org/a", "first"),
+            ("T#C2", "hourly", "org/a", "second"),
+            ("T#C1", "daily", "org/a", "third"),
+        ])
+
+        due = self.storage.get_due_entries("hourly", time.time() + 1)
+        self.assertEqual(["first"], [entry.summary for entry in due["T#C1"]])
+        self.assertEqual(["second"], [entry.summary for entry in due["T#C2"]])
+        self.assertEqual({}, self.storage.get_due_entries("hourly", 0))
+
+    def test_remove_pending_entries(self):
+        self.storage.add_entries([
+            ("T#C1", "hourly", "org/a", "removed"),
+            ("T#C1", "hourly", "org/b", "other repository"),
+            ("T#C2", "hourly", "org/a", "other channel"),
+        ])
+
+        self.storage.remove_pending_entries("T#C1", "org/a")
+
+        due = self.storage.get_due_entries("hourly", time.time() + 1)
+        self.assertEqual(["other repository"],
+                         [entry.summary for entry in due["T#C1"]])
+        self.assertEqual(["other channel"],
+                         [entry.summary for entry in due["T#C2"]])
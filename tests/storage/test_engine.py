@@ -0,0 +1,69 @@
+import os
+import tempfile
+import threading
+import unittest
+
+from bot.storage.engine import (
+    PRAGMAS,
+    create_database,
+    open_database,
+    release_connections,
+)
+
+
+class EngineTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.db = create_database()
+        open_database(self.db, os.path.join(self.directory.name, "test.db"))
+
+    def tearDown(self):
+        self.db.close_all()
+        self.directory.cleanup()
+
+    def pragma(self, name: str):
+        return self.db.execute_sql(f"PRAGMA {name}").fetchone()[0]
+
+    def test_pragmas(self):
+        self.assertEqual("wal", self.pragma("journal_mode"))
+        self.assertEqual(1, self.pragma("synchronous"))  # NORMAL
+        self.assertEqual(PRAGMAS["mmap_size"], self.pragma("mmap_size"))
+        self.assertEqual(PRAGMAS["busy_timeout"], self.pragma("busy_timeout"))
+
+    def test_pragmas_on_new_thread(self):
+        values = []
+
+        def query():
+            values.append(self.pragma("busy_timeout"))
+            release_connections()
+
+        thread = threading.Thread(target=query)
+        thread.start()
+        thread.join()
+        self.assertEqual([PRAGMAS["busy_timeout"]], values)
+
+    def test_release_returns_connection_to_pool(self):
+        release_connections()
+        self.assertTrue(self.db.is_closed())
+        self.assertEqual(1, len(self.db._connections))
+        self.assertEqual(0, len(self.db._in_use))
+
+        # The pooled connection is reused by another thread
+        pooled = self.db._connections[0][1]
+        connections = []
+
+        def query():
+            self.db.execute_sql("SELECT 1")
+            connections.append(self.db.connection())
+            release_connections()
+
+        thread = threading.Thread(target=query)
+        thread.start()
+        thread.join()
+        self.assertIs(pooled, connections[0])
+        self.assertEqual(1, len(self.db._connections))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+from unittest.mock import patch
+
+from bot.storage.github import GitHubSecret, GitHubStorage
+
+from ..test_utils.storage import StorageTestCase
+
+
+class GitHubStorageTest(StorageTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.storage = GitHubStorage(secret_ttl=60, max_cached_secrets=2)
+
+    def test_cache_hit(self):
+        self.storage.add_secret("org/repo", "secret")
+        self.assertEqual("secret", self.storage.get_secret("org/repo"))
+
+        with patch.object(GitHubSecret, "get_or_none") as get_or_none:
+            self.assertEqual("secret", self.storage.get_secret("org/repo"))
+        get_or_none.assert_not_called()
+
+    def test_negative_cache(self):
+        self.assertIsNone(self.storage.get_secret("org/repo"))
+
+        with patch.object(GitHubSecret, "get_or_none") as get_or_none:
+            self.assertIsNone(self.storage.get_secret("org/repo"))
+        get_or_none.assert_not_called()
+
+    def test_add_secret_invalidates(self):
+        self.assertIsNone(self.storage.get_secret("org/repo"))
+        self.storage.add_secret("org/repo", "secret")
+        self.assertEqual("secret", self.storage.get_secret("org/repo"))
+
+        self.storage.add_secret("org/repo", "new secret", force_replace=True)
+        self.assertEqual("new secret", self.storage.get_secret("org/repo"))
+
+    def test_expired_entry(self):
+        storage = GitHubStorage(secret_ttl=-1)
+        self.assertIsNone(storage.get_secret("org/repo"))
+        # Added without invalidating the cache
+        GitHubSecret.insert(repository="org/repo", secret="secret").execute()
+        self.assertEqual("secret", storage.get_secret("org/repo"))
+
+    def test_lru_eviction(self):
+        for repository in ("org/a", "org/b"):
+            self.storage.get_secret(repository)
+        # A hit makes "org/a" the most recently used
+        self.storage.get_secret("org/a")
+        self.storage.get_secret("org/c")
+        self.assertEqual(["org/a", "org/c"], self.storage._secrets.keys())
+
+    def test_lookup_racing_with_invalidation(self):
+        get_or_none = GitHubSecret.get_or_none
+
+        def stale_read(*args):
+            # The secret is added after this lookup read the database
+            result = get_or_none(*args)
+            self.storage.add_secret("org/repo", "secret")
+            return result
+
+        with patch.object(GitHubSecret, "get_or_none", side_effect=stale_read):
+            self.assertIsNone(self.storage.get_secret("org/repo"))
+
+        # The stale result wasn't cached
+        self.assertEqual("secret", self.storage.get_secret("org/repo"))
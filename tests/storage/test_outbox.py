@@ -0,0 +1,82 @@
+import time
+
+from bot.storage.outbox import OutboxStorage
+
+from ..test_utils.storage import StorageTestCase
+
+
+class OutboxStorageTest(StorageTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.storage = OutboxStorage()
+        self.storage.add_deliveries([
+            ("T#C1", "first", None),
+            ("T#C2", "second", "details"),
+        ])
+
+    def test_claim_in_order(self):
+        deliveries = self.storage.claim_deliveries(limit=10, lease=60)
+        self.assertEqual(["first", "second"],
+                         [delivery.message for delivery in deliveries])
+        self.assertEqual("details", deliveries[1].details)
+
+    def test_claim_limit(self):
+        first, = self.storage.claim_deliveries(limit=1, lease=60)
+        second, = self.storage.claim_deliveries(limit=1, lease=60)
+        self.assertEqual("first", first.message)
+        self.assertEqual("second", second.message)
+
+    def test_claimed_deliveries_are_leased(self):
+        self.storage.claim_deliveries(limit=10, lease=60)
+        self.assertEqual((), self.storage.claim_deliveries(limit=10, lease=60))
+
+    def test_expired_lease(self):
+        self.storage.claim_deliveries(limit=10, lease=-1)
+        self.assertEqual(
+            2, len(self.storage.claim_deliveries(limit=10, lease=60)))
+
+    def test_remove_delivery(self):
+        first, _ = self.storage.claim_deliveries(limit=10, lease=-1)
+        self.storage.remove_delivery(first.id)
+        remaining = self.storage.claim_deliveries(limit=10, lease=60)
+        self.assertEqual(["second"],
+                         [delivery.message for delivery in remaining])
+
+    def test_reschedule_delivery(self):
+        first, second = self.storage.claim_deliveries(limit=10, lease=60)
+        self.storage.reschedule_delivery(first.id, 1, time.time() - 1, "error")
+        self.storage.reschedule_delivery(second.id, 1,
+                                         time.time() + 60, "error")
+
+        retried, = self.storage.claim_deliveries(limit=10, lease=60)
+        self.assertEqual("first", retried.message)
+        self.assertEqual(1, retried.attempts)
+        self.assertEqual("error", retried.last_error)
+
+    def test_dead_delivery(self):
+        first, _ = self.storage.claim_deliveries(limit=10, lease=-1)
+        self.storage.reschedule_delivery(first.id, 10, None, "error")
+
+        remaining = self.storage.claim_deliveries(limit=10, lease=60)
+        self.assertEqual(["second"],
+                         [delivery.message for delivery in remaining])
+
+    def test_set_thread_ts(self):
+        _, second = self.storage.claim_deliveries(limit=10, lease=-1)
+        self.assertIsNone(second.thread_ts)
+        self.storage.set_thread_ts(second.id, "1700000000.000100")
+
+        _, second = self.storage.claim_deliveries(limit=10, lease=60)
+        self.assertEqual("1700000000.000100", second.thread_ts)
+
+    def test_get_stats(self):
+        first, second = self.storage.claim_deliveries(limit=10, lease=60)
+        self.storage.reschedule_delivery(first.id, 1, time.time(), "error")
+        self.storage.reschedule_delivery(second.id, 10, None, "error")
+
+        stats = self.storage.get_stats()
+        self.assertEqual(1, stats["pending"])
+        self.assertEqual(1, stats["retrying"])
+        self.assertEqual(1, stats["dead"])
+        self.assertGreaterEqual(stats["oldest_pending_age"], 0)
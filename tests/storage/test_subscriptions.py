@@ -0,0 +1,153 @@
+import pickle
+import sqlite3
+
+from bot.models.github import EventType, convert_events_to_bitmask
+from bot.storage.subscriptions import Subscription, SubscriptionStorage
+
+from ..test_utils.storage import StorageTestCase
+
+
+class SubscriptionStorageTest(StorageTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.storage = SubscriptionStorage()
+
+    def test_get_channels(self):
+        self.storage.update_subscription(
+            "T#C1",
+            "org/repo",
+            convert_events_to_bitmask({EventType.PUSH, EventType.FORK}),
+        )
+        self.assertEqual(("T#C1", ),
+                         self.storage.get_channels("org/repo", EventType.PUSH))
+        self.assertEqual(("T#C1", ),
+                         self.storage.get_channels("org/repo", EventType.FORK))
+        self.assertEqual((),
+                         self.storage.get_channels("org/repo",
+                                                   EventType.RELEASE))
+        self.assertEqual((),
+                         self.storage.get_channels("org/other",
+                                                   EventType.PUSH))
+
+        self.storage.update_subscription(
+            "T#C2",
+            "org/repo",
+            convert_events_to_bitmask({EventType.PUSH}),
+        )
+        self.assertEqual({"T#C1", "T#C2"},
+                         set(
+                             self.storage.get_channels("org/repo",
+                                                       EventType.PUSH)))
+
+        # Updating replaces the channel's events
+        self.storage.update_subscription(
+            "T#C1",
+            "org/repo",
+            convert_events_to_bitmask({EventType.RELEASE}),
+        )
+        self.assertEqual(("T#C2", ),
+                         self.storage.get_channels("org/repo", EventType.PUSH))
+        self.assertEqual((),
+                         self.storage.get_channels("org/repo", EventType.FORK))
+        self.assertEqual(("T#C1", ),
+                         self.storage.get_channels("org/repo",
+                                                   EventType.RELEASE))
+
+        self.storage.remove_subscription("T#C2", "org/repo")
+        self.assertEqual((),
+                         self.storage.get_channels("org/repo", EventType.PUSH))
+        self.assertEqual(("T#C1", ),
+                         self.storage.get_channels("org/repo",
+                                                   EventType.RELEASE))
+
+        self.storage.remove_subscription("T#C1", "org/repo")
+        self.assertEqual((),
+                         self.storage.get_channels("org/repo",
+                                                   EventType.RELEASE))
+        self.assertNotIn("org/repo", self.storage.routes)
+
+    def test_get_channels_digest(self):
+        self.storage.update_subscription(
+            "T#C1",
+            "org/repo",
+            convert_events_to_bitmask({EventType.PUSH}),
+            digest="daily",
+        )
+        self.assertEqual((),
+                         self.storage.get_channels("org/repo", EventType.PUSH))
+        self.assertEqual(
+            (("T#C1", "daily"), ),
+            self.storage.get_digest_channels("org/repo", EventType.PUSH))
+
+        self.storage.update_subscription(
+            "T#C1",
+            "org/repo",
+            convert_events_to_bitmask({EventType.PUSH}),
+        )
+        self.assertEqual(("T#C1", ),
+                         self.storage.get_channels("org/repo", EventType.PUSH))
+        self.assertEqual(
+            (), self.storage.get_digest_channels("org/repo", EventType.PUSH))
+
+    def test_index_is_rebuilt_from_database(self):
+        self.storage.update_subscription(
+            "T#C1",
+            "org/repo",
+            convert_events_to_bitmask({EventType.PUSH}),
+        )
+
+        reopened = SubscriptionStorage()
+        self.assertEqual(("T#C1", ),
+                         reopened.get_channels("org/repo", EventType.PUSH))
+
+
+class SubscriptionMigrationTest(StorageTestCase):
+
+    def test_migrate_pickled_events(self):
+        # Schema of databases created while events were a `PickleField`
+        connection = sqlite3.connect("data/subscriptions.db")
+        connection.execute('CREATE TABLE "subscription" ('
+                           '"id" INTEGER NOT NULL PRIMARY KEY, '
+                           '"channel" VARCHAR(255) NOT NULL, '
+                           '"repository" VARCHAR(255) NOT NULL, '
+                           '"events" BLOB NOT NULL)')
+        connection.executemany(
+            'INSERT INTO "subscription" ("channel", "repository", "events") '
+            'VALUES (?, ?, ?)',
+            [
+                ("T#C1", "org/repo", pickle.dumps(["bc", "p"])),
+                ("T#C2", "org/repo", pickle.dumps(["p"])),
+            ],
+        )
+        connection.commit()
+        connection.close()
+
+        storage = SubscriptionStorage()
+
+        events = {
+            subscription.channel: subscription.events
+            for subscription in Subscription.select()
+        }
+        self.assertEqual(
+            {
+                "T#C1":
+                convert_events_to_bitmask(
+                    {EventType.BRANCH_CREATED, EventType.PUSH}),
+                "T#C2":
+                convert_events_to_bitmask({EventType.PUSH}),
+            },
+            events,
+        )
+        self.assertEqual(
+            {"T#C1", "T#C2"},
+            set(storage.get_channels("org/repo", EventType.PUSH)),
+        )
+        self.assertEqual(
+            ("T#C1", ),
+            storage.get_channels("org/repo", EventType.BRANCH_CREATED),
+        )
+        self.assertEqual(
+            (),
+            storage.get_channels("org/repo", EventType.RELEASE),
+        )
@@ -1,3 +1,4 @@
+from dataclasses import fields
 from typing import Any
 
 from bot.models.github.event import GitHubEvent
@@ -5,9 +6,12 @@ from bot.models.github.event import GitHubEvent
 
 def github_event_serializer(github_event: GitHubEvent) -> dict[str, Any]:
     serialized = {}
-    for var, value in vars(github_event).items():
+    for field in fields(github_event):
+        value = getattr(github_event, field.name)
+        if value is None:
+            continue
         if isinstance(value, (list, tuple, set)):
-            serialized[var] = [str(v) for v in value]
+            serialized[field.name] = [str(v) for v in value]
         else:
-            serialized[var] = str(value)
+            serialized[field.name] = str(value)
     return serialized
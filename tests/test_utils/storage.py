@@ -0,0 +1,24 @@
+import os
+import tempfile
+import unittest
+
+from bot.storage import engine
+
+
+class StorageTestCase(unittest.TestCase):
+    """
+    Runs every test from an empty temporary directory, so that storages create their databases in its `data` folder.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        os.mkdir(os.path.join(self.directory.name, "data"))
+        self.cwd = os.getcwd()
+        os.chdir(self.directory.name)
+
+    def tearDown(self):
+        for db in engine._databases:
+            if not db.deferred:
+                db.close_all()
+        os.chdir(self.cwd)
+        self.directory.cleanup()
@@ -2,7 +2,7 @@ import unittest
 
 from werkzeug.datastructures import ImmutableMultiDict
 
-from bot.utils.json import JSON
+from bot.utils.json import JSON, decode, path, select_decoder
 
 
 class JSONTest(unittest.TestCase):
@@ -43,3 +43,58 @@ class JSONTest(unittest.TestCase):
             "name": "exampleuser",
             "login": "example_user"
         }, json.data)
+
+
+class PathTest(unittest.TestCase):
+
+    def test_nested_found(self):
+        accessor = path("repository.full_name")
+        self.assertEqual(
+            "org/repo",
+            accessor({"repository": {
+                "full_name": "org/repo"
+            }}),
+        )
+
+    def test_nested_not_found(self):
+        self.assertEqual("FULL_NAME",
+                         path("repository.full_name")({
+                             "repository": {}
+                         }))
+        self.assertEqual("REPOSITORY", path("repository.full_name")({}))
+
+    def test_alternatives(self):
+        accessor = path("pusher|sender.name|login")
+        self.assertEqual("a", accessor({"pusher": {"name": "a"}}))
+        self.assertEqual("b", accessor({"sender": {"login": "b"}}))
+        self.assertEqual("NAME", accessor({"sender": {}}))
+        self.assertEqual("PUSHER", accessor({}))
+
+    def test_not_a_dict(self):
+        self.assertEqual("NAME", path("sender.name")({"sender": "someone"}))
+
+    def test_falsy_values(self):
+        self.assertEqual(
+            False,
+            path("pull_request.merged")({
+                "pull_request": {
+                    "merged": False
+                }
+            }))
+
+    def test_compiled_once(self):
+        self.assertIs(path("sender.login"), path("sender.login"))
+
+
+class DecoderTest(unittest.TestCase):
+
+    def tearDown(self):
+        select_decoder("json")
+
+    def test_fallback(self):
+        self.assertEqual("json", select_decoder("not-a-json-library"))
+        self.assertEqual({"a": [1, 2]}, decode(b'{"a": [1, 2]}'))
+
+    def test_stdlib(self):
+        self.assertEqual("json", select_decoder("json"))
+        self.assertEqual({"a": "b"}, decode('{"a": "b"}'))
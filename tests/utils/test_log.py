@@ -0,0 +1,66 @@
+import os
+import tempfile
+import unittest
+
+from bot.utils.log import Logger
+
+
+class LoggerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "command_log")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_keeps_latest_in_order(self):
+        logger = Logger(3, self.path)
+        for i in range(5):
+            logger.log_command(f"command {i}")
+
+        self.assertEqual(
+            ["command 2", "command 3", "command 4"],
+            logger.latest_commands(),
+        )
+        self.assertEqual(["command 3", "command 4"], logger.latest_commands(2))
+
+    def test_file_size_is_fixed(self):
+        logger = Logger(3, self.path)
+        size = os.path.getsize(self.path)
+        for i in range(10):
+            logger.log_command(f"command {i}")
+        self.assertEqual(size, os.path.getsize(self.path))
+
+    def test_truncates_long_commands(self):
+        logger = Logger(2, self.path)
+        logger.log_command("é" * Logger.RECORD_SIZE)
+        self.assertEqual(
+            "é" * ((Logger.RECORD_SIZE - 2) // 2),
+            logger.latest_commands()[0],
+        )
+
+    def test_resized_log_keeps_latest(self):
+        logger = Logger(4, self.path)
+        for i in range(4):
+            logger.log_command(f"command {i}")
+
+        self.assertEqual(
+            ["command 2", "command 3"],
+            Logger(2, self.path).latest_commands(),
+        )
+        # Growing the log again keeps what's left
+        self.assertEqual(
+            ["command 2", "command 3"],
+            Logger(4, self.path).latest_commands(),
+        )
+
+    def test_disabled(self):
+        logger = Logger(0, self.path)
+        logger.log_command("command")
+        self.assertFalse(os.path.exists(self.path))
+        self.assertEqual([], logger.latest_commands())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import logging
+import unittest
+from unittest.mock import patch
+
+from bot.utils.structured_log import (
+    LOGGER,
+    JSONFormatter,
+    configure_logging,
+    log_event,
+    parse_sample_rates,
+)
+
+
+class StructuredLogTest(unittest.TestCase):
+
+    def tearDown(self):
+        configure_logging(level="OFF")
+
+    def test_format_caps_fields(self):
+        record = logging.LogRecord("selene", logging.INFO, __file__, 0,
+                                   "sending_message", None, None)
+        record.fields = {"message": "x" * 10, "channels": 3, "details": None}
+        self.assertEqual(
+            '"event": "sending_message", "message": "xxxx…", "channels": 3, "details": null}',
+            JSONFormatter(4).format(record).split(", ", 2)[2],
+        )
+
+    def test_parse_sample_rates(self):
+        self.assertEqual(
+            {
+                "PUSH": 0.1,
+                "STAR_ADDED": 0.0
+            },
+            parse_sample_rates("PUSH=0.1, STAR_ADDED=0"),
+        )
+        self.assertEqual({}, parse_sample_rates(""))
+
+    def test_sampling(self):
+        configure_logging(level="INFO", sample_rates={"PUSH": 0})
+        with patch.object(LOGGER, "log") as log:
+            log_event(logging.INFO, "event_received", sample_key="PUSH")
+            log_event(logging.INFO, "event_received", sample_key="FORK")
+        log.assert_called_once()
+
+    def test_level(self):
+        configure_logging(level="INFO")
+        with patch.object(LOGGER, "log") as log:
+            log_event(logging.DEBUG, "sending_message")
+        log.assert_not_called()
+
+    def test_silent(self):
+        configure_logging(level="OFF")
+        with patch.object(LOGGER, "log") as log:
+            log_event(logging.ERROR, "sending_message")
+        log.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
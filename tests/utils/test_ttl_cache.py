@@ -0,0 +1,50 @@
+import unittest
+from unittest.mock import patch
+
+from bot.utils.ttl_cache import MISSING, TTLCache
+
+
+class TTLCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = TTLCache(ttl=60, max_size=2)
+
+    def test_get(self):
+        self.assertIs(MISSING, self.cache.get("a"))
+        self.cache.set("a", None)
+        self.assertIsNone(self.cache.get("a"))
+
+    def test_expiry(self):
+        with patch("time.monotonic", return_value=1000):
+            self.cache.set("a", 1)
+        with patch("time.monotonic", return_value=1059):
+            self.assertEqual(1, self.cache.get("a"))
+        with patch("time.monotonic", return_value=1060):
+            self.assertIs(MISSING, self.cache.get("a"))
+        self.assertEqual([], self.cache.keys())
+
+    def test_lru_eviction(self):
+        self.cache.set("a", 1)
+        self.cache.set("b", 2)
+        self.cache.get("a")
+        self.cache.set("c", 3)
+        self.assertEqual(["a", "c"], self.cache.keys())
+
+    def test_pop(self):
+        self.cache.set("a", 1)
+        self.cache.pop("a")
+        self.cache.pop("missing")
+        self.assertIs(MISSING, self.cache.get("a"))
+
+    def test_set_after_removal(self):
+        generation = self.cache.generation
+        self.cache.pop("a")
+        self.assertFalse(self.cache.set("a", "stale", generation))
+        self.assertIs(MISSING, self.cache.get("a"))
+
+        self.assertTrue(self.cache.set("a", "fresh", self.cache.generation))
+        self.assertEqual("fresh", self.cache.get("a"))
+
+
+if __name__ == '__main__':
+    unittest.main()
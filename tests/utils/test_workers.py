@@ -0,0 +1,50 @@
+import threading
+import unittest
+
+from bot.utils.workers import WorkerPool
+
+
+class WorkerPoolTest(unittest.TestCase):
+
+    def test_submit_handled(self):
+        handled = []
+        pool = WorkerPool(handled.append, workers=2, max_size=10)
+
+        for i in range(5):
+            self.assertTrue(pool.submit(i))
+        pool.join()
+
+        self.assertEqual([0, 1, 2, 3, 4], sorted(handled))
+        self.assertEqual(5, pool.stats()["processed"])
+
+    def test_submit_rejected_when_full(self):
+        started, release = threading.Event(), threading.Event()
+
+        def handler(_):
+            started.set()
+            release.wait()
+
+        pool = WorkerPool(handler, workers=1, max_size=1)
+
+        pool.submit("busy")
+        started.wait()
+        self.assertTrue(pool.submit("queued"))
+        self.assertFalse(pool.submit("rejected"))
+
+        stats = pool.stats()
+        self.assertEqual(1, stats["depth"])
+        self.assertEqual(1, stats["rejected"])
+
+        release.set()
+        pool.join()
+
+    def test_failures_counted(self):
+
+        def handler(_):
+            raise ValueError
+
+        pool = WorkerPool(handler, workers=1, max_size=1)
+        pool.submit("item")
+        pool.join()
+
+        self.assertEqual(1, pool.stats()["failed"])